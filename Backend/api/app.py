@@ -1,47 +1,102 @@
-from flask import Flask, jsonify, g, send_from_directory
+import os
+import time
+from flask import Flask
 from flask_cors import CORS
 from injector import Injector
 
-from api.routes import cafe_routes, employee_routes
-from infrastructure.dependency.container import InfrastructureModule
-from infrastructure.database.postgres import create_db_and_tables, wait_for_db
+from api.routes import admin_routes, batch_routes, cafe_routes, employee_routes
+from api.compression import init_compression
+from api.health import init_health
+from api.instrumentation import init_instrumentation, time_views
+from api.read_routing import init_read_routing
+from api.json_provider import FastJSONProvider
+from api.logo_response import logo_response
+from application.interfaces.logo_store import ILogoStore
+from infrastructure.dependency.container import InfrastructureModule, REPOSITORY_BACKEND, SEARCH_BACKEND
+from infrastructure.database.postgres import has_extension, migrate_database, prewarm_pool, replica_engine, wait_for_db, db_session
+from infrastructure.observability.startup import STARTUP
 
-DB_INITIALIZED = False
+def initialize_database():
+    if REPOSITORY_BACKEND == 'memory':
+        return
+    with STARTUP.phase('database'):
+        wait_for_db()
+    # A failed migration stops startup: serving (and reporting ready) on an unmigrated schema is worse.
+    with STARTUP.phase('migrations'):
+        migrate_database()
+    # Postgres search ranks with similarity() from pg_trgm (migration 0005); without it every search is a 500.
+    if SEARCH_BACKEND == 'postgres' and not has_extension('pg_trgm'):
+        raise RuntimeError("SEARCH_BACKEND=postgres needs the pg_trgm extension, which this database does not have. Install postgresql-contrib and restart to apply the migrations, or set SEARCH_BACKEND=memory.")
 
-def create_app():
+def warm_up():
+    """Opens DB_POOL_MIN_SIZE connections ahead of the first request and marks the process ready."""
+    if REPOSITORY_BACKEND != 'memory':
+        with STARTUP.phase('prewarm'):
+            prewarm_pool()
+            if replica_engine is not None:
+                prewarm_pool(target=replica_engine)
+    STARTUP.mark_ready()
+
+def create_app(init_db: bool = True, prewarm: bool = True):
+    STARTUP.mark('imports')
+    # Under gunicorn the master process initializes the database once before
+    # forking workers (see gunicorn.conf.py), so workers skip this step.
+    if init_db:
+        initialize_database()
+
+    started = time.perf_counter()
     app = Flask(__name__)
     app.url_map.strict_slashes = False
+    app.json = FastJSONProvider(app)
     CORS(app)
     app_injector = Injector([InfrastructureModule()])
+    app.extensions['injector'] = app_injector
+
+    init_instrumentation(app, app_injector)
+    init_compression(app)
+    init_health(app)
+    init_read_routing(app)
+
+    @app.after_request
+    def commit_db_session(response):
+        # Streamed bodies are still reading from an open server-side cursor;
+        # their session is closed on teardown once the stream is exhausted.
+        if response.is_streamed:
+            return response
+        if db_session.registry.has():
+            if response.status_code < 400:
+                db_session.commit()
+            else:
+                db_session.rollback()
+        return response
 
-    wait_for_db()
+    @app.teardown_request
+    def remove_db_session(exception=None):
+        db_session.remove()
 
-    global DB_INITIALIZED
-    if not DB_INITIALIZED:
-        try:
-            create_db_and_tables()
-            DB_INITIALIZED = True
-        except Exception as e:
-            print(f"Error initializing database: {e}")
+    logo_store = app_injector.get(ILogoStore)
 
     def serve_uploaded_file(filename):
-        return send_from_directory(
-            directory = '/usr/src/app/public/logos',
-            path = filename,
-            mimetype = 'image/png' or 'image/jpeg'
-        )
+        return logo_response(logo_store, filename)
 
     app.register_blueprint(cafe_routes.init_app(app_injector), url_prefix='/cafes')
     app.register_blueprint(employee_routes.init_app(app_injector), url_prefix='/employees')
+    app.register_blueprint(admin_routes.init_app(app_injector), url_prefix='/admin')
+    app.register_blueprint(batch_routes.init_app(app_injector), url_prefix='/batch')
     
     app.add_url_rule(
         '/logos/<path:filename>',
         endpoint = 'uploaded_logos',
         view_func = serve_uploaded_file,
     )
+    time_views(app)
+    STARTUP.record('create_app', time.perf_counter() - started)
 
+    if prewarm:
+        warm_up()
     return app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(host='0.0.0.0', debug=True, port=5000)
\ No newline at end of file
+    debug = os.getenv('FLASK_DEBUG', '1') == '1'
+    app.run(host='0.0.0.0', debug=debug, port=5000, threaded=True)
\ No newline at end of file
@@ -0,0 +1,192 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from pydantic import ValidationError
+
+from api.compression import COMPRESSION_ENABLED, compress_payload
+from api.instrumentation import record_request
+from api.read_routing import pinned_until, read_primary_cookie
+from api.conditional import employee_list_validators, is_not_modified, validator_headers, version_etag
+from api.streaming import NDJSON_MIMETYPE
+from application.mediator import Mediator
+from application.queries.get_cafe_query import GetCafeQuery
+from application.queries.get_employees_query import GetEmployeesQuery
+from application.interfaces.version_repository import IVersionRepository, CAFES_RESOURCE, EMPLOYEES_RESOURCE
+from infrastructure.database.behaviors import SnapshotReads
+from infrastructure.database.postgres import DB_POOL_MIN_SIZE
+from infrastructure.database.routing import pin_to_primary
+from infrastructure.dependency.container import REPOSITORY_BACKEND
+from infrastructure.observability.startup import STARTUP
+from infrastructure.observability.timing import INSTRUMENTATION_ENABLED, SERVER_TIMING_ENABLED, end_request, span, start_request
+from infrastructure.settings import env_int
+
+class AsyncReadApp:
+    """
+    ASGI application serving GET /cafes and GET /employees on the event loop
+    through the async repositories. Every other request is handed to the Flask
+    app, which runs on a thread pool.
+    """
+
+    def __init__(self, flask_app: Flask):
+        self.flask_app = flask_app
+        self.wsgi_app = WSGIMiddleware(flask_app, workers=env_int("GUNICORN_THREADS", 4))
+
+        app_injector = flask_app.extensions['injector']
+        self.mediator = app_injector.get(Mediator)
+        self.version_repository = app_injector.get(IVersionRepository)
+        self.snapshot_reads = app_injector.get(SnapshotReads)
+
+        self.routes: Dict[str, Callable[[dict, dict], Awaitable[tuple]]] = {
+            '/cafes': self.get_cafes,
+            '/employees': self.get_employees,
+        }
+        # Same route labels as the Flask rules, so both servers feed the same metric series.
+        self.route_labels = {'/cafes': '/cafes/', '/employees': '/employees/'}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            route = self.routes.get(scope['path'].rstrip('/'))
+            args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+            headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+            # Streaming responses are served by the Flask routes off a server-side cursor.
+            if route and not self.wants_stream(headers, args):
+                # Each request runs in its own task, so the pin ends with it.
+                pin_to_primary(pinned_until(read_primary_cookie(headers.get('cookie'))))
+                if not INSTRUMENTATION_ENABLED:
+                    body, status, response_headers = await route(args, headers)
+                    payload, response_headers = self.compress(self.encode(body), status, headers, response_headers)
+                    return await self.send_json(send, payload, status, response_headers)
+
+                timings = start_request()
+                try:
+                    with span('route'):
+                        body, status, response_headers = await route(args, headers)
+                    with span('serialize'):
+                        payload = self.encode(body)
+                    payload, response_headers = self.compress(payload, status, headers, response_headers)
+                    total = record_request('GET', self.route_labels[scope['path'].rstrip('/')], status, timings)
+                    if SERVER_TIMING_ENABLED:
+                        response_headers = {**response_headers, 'Server-Timing': timings.server_timing(total)}
+                    return await self.send_json(send, payload, status, response_headers)
+                finally:
+                    end_request()
+
+        await self.wsgi_app(scope, receive, send)
+
+    async def get_cafes(self, args: dict, headers: dict) -> tuple:
+        try:
+            with span('validate'):
+                query = GetCafeQuery(
+                    location = args.get('location'),
+                    limit = args.get('limit'),
+                    cursor = args.get('cursor'),
+                    fields = args.get('fields')
+                )
+
+            async def read_listing():
+                version, last_modified = await self.version_repository.get_version_async(CAFES_RESOURCE)
+                etag = version_etag(CAFES_RESOURCE, version)
+                response_headers = validator_headers(etag, last_modified)
+                if is_not_modified(headers.get('if-none-match'), headers.get('if-modified-since'), etag, last_modified):
+                    return None, 304, response_headers
+
+                cafe_page = await self.mediator.send_async(query)
+                return (cafe_page if query.is_paginated else cafe_page['items']), 200, response_headers
+
+            return await self.snapshot_reads.run_async(query, read_listing)
+
+        except ValidationError as e:
+            return {'error': e.errors(include_url=False, include_context=False)}, 400, {}
+        except ValueError as e:
+            return {'error': str(e)}, 400, {}
+        except Exception as e:
+            return {'error': f"Failed to retrieve cafes: {str(e)}"}, 500, {}
+
+    async def get_employees(self, args: dict, headers: dict) -> tuple:
+        try:
+            with span('validate'):
+                query = GetEmployeesQuery(
+                    cafe_name = args.get('cafe'),
+                    limit = args.get('limit'),
+                    cursor = args.get('cursor'),
+                    fields = args.get('fields')
+                )
+
+            async def read_listing():
+                version, last_modified = await self.version_repository.get_version_async(EMPLOYEES_RESOURCE)
+                etag, last_modified = employee_list_validators(version, last_modified)
+                response_headers = validator_headers(etag, last_modified)
+                if is_not_modified(headers.get('if-none-match'), headers.get('if-modified-since'), etag, last_modified):
+                    return None, 304, response_headers
+
+                employee_page = await self.mediator.send_async(query)
+                return (employee_page if query.is_paginated else employee_page['items']), 200, response_headers
+
+            return await self.snapshot_reads.run_async(query, read_listing)
+
+        except ValidationError as e:
+            return {'error': e.errors(include_url=False, include_context=False)}, 400, {}
+        except ValueError as e:
+            return {'error': str(e)}, 400, {}
+        except Exception as e:
+            return {'error': f'Failed to retrieve employees: {str(e)}'}, 500, {}
+
+    def wants_stream(self, headers: dict, args: dict) -> bool:
+        return NDJSON_MIMETYPE in headers.get('accept', '') or args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+    def encode(self, body) -> bytes:
+        return b'' if body is None else self.flask_app.json.dumps_bytes(body, separators=(',', ':')) + b'\n'
+
+    def compress(self, payload: bytes, status: int, headers: dict, response_headers: dict) -> Tuple[bytes, dict]:
+        if not COMPRESSION_ENABLED or status == 304:
+            return payload, response_headers
+        vary = response_headers.get('Vary')
+        response_headers = {**response_headers, 'Vary': f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'}
+        payload, encoding = compress_payload(payload, headers.get('accept-encoding'))
+        if encoding:
+            response_headers['Content-Encoding'] = encoding
+        return payload, response_headers
+
+    async def send_json(self, send, payload: bytes, status: int, extra_headers: Optional[dict] = None):
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode('latin-1')),
+            (b'access-control-allow-origin', b'*'),
+        ]
+        headers.extend((name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in (extra_headers or {}).items())
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def prewarm(self, async_engine) -> None:
+        """Opens DB_POOL_MIN_SIZE asyncpg connections concurrently so the first async reads find them pooled."""
+        connections = await asyncio.gather(*(async_engine.connect() for _ in range(DB_POOL_MIN_SIZE)), return_exceptions=True)
+        for connection in connections:
+            if isinstance(connection, BaseException):
+                print(f"Async pool prewarm failed: {connection}")
+            else:
+                await connection.close()
+
+    async def lifespan(self, receive, send):
+        from infrastructure.database.async_postgres import async_engine
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if REPOSITORY_BACKEND != 'memory':
+                    with STARTUP.phase('async_prewarm'):
+                        await self.prewarm(async_engine)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
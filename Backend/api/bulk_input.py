@@ -0,0 +1,37 @@
+import csv
+import io
+from typing import Any, Dict, List
+
+from flask import Request
+
+def read_bulk_rows(request: Request) -> List[Dict[str, Any]]:
+    """
+    Reads import rows from a CSV upload (multipart field 'file'), a text/csv
+    body, or a JSON array. Empty CSV cells are dropped so optional fields
+    fall back to their defaults.
+    """
+    upload = request.files.get('file')
+    if upload:
+        return _read_csv(io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+
+    if request.mimetype == 'text/csv':
+        return _read_csv(io.StringIO(request.get_data(as_text=True), newline=''))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('rows')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of rows, a text/csv body or a CSV file upload.")
+    return data
+
+def _read_csv(stream) -> List[Dict[str, Any]]:
+    reader = csv.DictReader(stream)
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value is not None and value.strip() != ''}
+        for row in reader
+    ]
+
+def bulk_status(summary: Dict[str, Any]) -> int:
+    if not summary['errors']:
+        return 201
+    return 207 if summary['created'] else 400
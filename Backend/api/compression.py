@@ -0,0 +1,118 @@
+import gzip
+import zlib
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from flask import Flask, Response, request
+from werkzeug.http import parse_accept_header
+
+from api.streaming import NDJSON_MIMETYPE
+from infrastructure.observability.timing import span
+from infrastructure.settings import env_bool, env_int
+
+COMPRESSION_ENABLED = env_bool("COMPRESSION_ENABLED", True)
+# Below this size the header overhead and CPU time outweigh the saved bytes.
+COMPRESSION_MIN_BYTES = env_int("COMPRESSION_MIN_BYTES", 1024)
+# Level 1 keeps most of the size reduction at a fraction of the CPU cost of the default 6.
+GZIP_LEVEL = env_int("GZIP_LEVEL", 1)
+BROTLI_QUALITY = env_int("BROTLI_QUALITY", 4)
+
+# Images, parquet exports and other binary files are already compressed.
+COMPRESSIBLE_MIMETYPES = {'application/json', NDJSON_MIMETYPE, 'text/csv', 'text/plain', 'text/html'}
+
+def _import_brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def supported_encodings() -> Tuple[str, ...]:
+    """In order of preference when the client weighs them equally; br needs the optional brotli package."""
+    return ('br', 'gzip') if _import_brotli() else ('gzip',)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    return parse_accept_header(accept_encoding).best_match(supported_encodings())
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return _import_brotli().compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output deterministic for identical bodies.
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def compress_payload(payload: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """The payload compressed with the client's preferred encoding, or unchanged (and None) when small or not accepted."""
+    encoding = choose_encoding(accept_encoding) if len(payload) >= COMPRESSION_MIN_BYTES else None
+    if encoding is None:
+        return payload, None
+    with span('compress'):
+        return compress(payload, encoding), encoding
+
+class CompressedStream:
+    """
+    Compresses a streamed body chunk by chunk. Each chunk is flushed so rows
+    reach the client as they are produced rather than when the stream ends.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str, close: Optional[Callable[[], None]] = None):
+        self.chunks = chunks
+        self.encoding = encoding
+        self._close = close
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.encoding == 'br':
+            compressor = _import_brotli().Compressor(quality=BROTLI_QUALITY)
+            process, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+        for chunk in self.chunks:
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+
+    def close(self) -> None:
+        # Closes the wrapped stream, which ends its request context and database session.
+        if self._close is not None:
+            self._close()
+
+def compress_response(response: Response, accept_encoding: Optional[str]) -> Response:
+    if (
+        response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    if response.is_streamed:
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            return response
+        original = response.response
+        response.response = CompressedStream(response.iter_encoded(), encoding, getattr(original, 'close', None))
+        response.headers.pop('Content-Length', None)
+    else:
+        data, encoding = compress_payload(response.get_data(), accept_encoding)
+        if encoding is None:
+            return response
+        response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def init_compression(app: Flask) -> None:
+    """
+    Compresses JSON, NDJSON, CSV and text responses with gzip, or brotli when
+    installed, as negotiated by Accept-Encoding. Register after the
+    instrumentation hooks so the time spent shows up in Server-Timing.
+    """
+    if not COMPRESSION_ENABLED:
+        return
+
+    @app.after_request
+    def compress_body(response):
+        return compress_response(response, request.headers.get('Accept-Encoding'))
@@ -0,0 +1,31 @@
+from datetime import datetime, time, timezone
+from typing import Dict, Optional, Tuple
+
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+
+def version_etag(resource: str, version: int) -> str:
+    return f"{resource}-{version}"
+
+def employee_list_validators(version: int, last_modified: datetime) -> Tuple[str, datetime]:
+    # days_worked changes every day without any write, so the representation
+    # is also versioned by the current UTC date, the one the listing counts from.
+    today = datetime.now(timezone.utc).date()
+    start_of_today = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    return f"employees-{version}-{today.isoformat()}", max(last_modified, start_of_today)
+
+def is_not_modified(if_none_match: Optional[str], if_modified_since: Optional[str], etag: str, last_modified: datetime) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    if if_none_match:
+        return parse_etags(if_none_match).contains_weak(etag)
+    if if_modified_since:
+        since = parse_date(if_modified_since)
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+def validator_headers(etag: str, last_modified: datetime) -> Dict[str, str]:
+    return {
+        'ETag': quote_etag(etag, weak=True),
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept',
+    }
@@ -0,0 +1,31 @@
+import tempfile
+
+from flask import Response, send_file, stream_with_context
+
+from infrastructure.export.exporter import ExportQuery, iter_csv, write_parquet
+
+# Parquet needs its footer written last, so it is spooled to a temporary file
+# (in memory up to this size, on disk beyond it) and then streamed.
+PARQUET_SPOOL_SIZE = 8 * 1024 * 1024
+
+def export_response(query: ExportQuery, export_format: str, basename: str) -> Response:
+    if export_format == 'parquet':
+        spool = tempfile.SpooledTemporaryFile(max_size=PARQUET_SPOOL_SIZE)
+        write_parquet(query, spool)
+        spool.seek(0)
+        return send_file(spool, mimetype='application/vnd.apache.parquet', as_attachment=True, download_name=f'{basename}.parquet')
+
+    if export_format != 'csv':
+        raise ValueError(f"Unsupported export format '{export_format}'. Use csv or parquet.")
+
+    chunks = iter_csv(query)
+    # Run the query before the response starts so failures return an error status.
+    first = next(chunks)
+
+    def generate():
+        yield first
+        yield from chunks
+
+    response = Response(stream_with_context(generate()), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={basename}.csv'
+    return response
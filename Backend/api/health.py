@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+from flask import Flask, jsonify, request
+
+from infrastructure.dependency.container import REPOSITORY_BACKEND
+from infrastructure.database.postgres import DB_MAX_OVERFLOW, check_database, pool_status, replica_status
+from infrastructure.observability.startup import STARTUP
+from infrastructure.settings import env_float
+
+# Probes from several kubelets and load balancers share one database round trip per window.
+READINESS_CACHE_SECONDS = env_float("READINESS_CACHE_SECONDS", 1.0)
+
+PROBE_ENDPOINTS = {'healthz', 'readyz'}
+
+class ReadinessProbe:
+    """
+    Ready once startup finished and the database answers. When every pooled
+    connection is checked out the database is not pinged, since that would
+    wait for DB_POOL_TIMEOUT behind real requests; the last result is reported
+    instead, so a busy worker is not taken out of rotation.
+    """
+
+    def __init__(self, cache_seconds: float = READINESS_CACHE_SECONDS):
+        self.cache_seconds = cache_seconds
+        self._result: Optional[Tuple[bool, dict]] = None
+        self._checked_at = 0.0
+        self._database = {'ok': False, 'error': 'not checked yet'}
+        self._lock = threading.Lock()
+
+    def check(self) -> Tuple[bool, dict]:
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+        with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.cache_seconds:
+                self._result = self._evaluate()
+                self._checked_at = time.monotonic()
+            return self._result
+
+    def _evaluate(self) -> Tuple[bool, dict]:
+        pool = pool_status()
+        exhausted = pool['checked_out'] >= pool['size'] + DB_MAX_OVERFLOW
+        if REPOSITORY_BACKEND == 'memory':
+            database = {'ok': True, 'skipped': 'memory repositories'}
+        elif exhausted:
+            database = {**self._database, 'skipped': 'connection pool exhausted'}
+        else:
+            try:
+                database = {'ok': True, 'latency_ms': round(check_database(), 2)}
+            except Exception as e:
+                database = {'ok': False, 'error': str(e).splitlines()[0]}
+            self._database = database
+
+        ready = STARTUP.ready and database['ok']
+        checks = {'startup': {'ok': STARTUP.ready}, 'database': database}
+        replica = replica_status()
+        if replica is not None:
+            # Informational only: reads fall back to the primary while the replica is unavailable.
+            checks['replica'] = replica
+        return ready, {
+            'status': 'ready' if ready else 'not ready',
+            'checks': checks,
+            'pool': {key: pool[key] for key in ('size', 'checked_out', 'checked_in', 'overflow', 'max_overflow')},
+            'startup': STARTUP.snapshot(),
+        }
+
+def init_health(app: Flask) -> None:
+    """
+    Serves GET /healthz (liveness: the process answers, no dependencies are
+    touched) and GET /readyz (readiness: 503 until the worker can serve), and
+    records when the first request other than a probe was answered.
+    """
+    probe = ReadinessProbe()
+
+    def healthz():
+        return jsonify({'status': 'ok', 'uptime_s': STARTUP.snapshot()['uptime_s']})
+
+    def readyz():
+        ready, body = probe.check()
+        return jsonify(body), 200 if ready else 503
+
+    app.add_url_rule('/healthz', endpoint='healthz', view_func=healthz)
+    app.add_url_rule('/readyz', endpoint='readyz', view_func=readyz)
+
+    @app.after_request
+    def record_first_request(response):
+        if STARTUP.first_request_at is None and request.endpoint not in PROBE_ENDPOINTS and response.status_code < 500:
+            STARTUP.mark_first_request()
+        return response
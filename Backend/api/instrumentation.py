@@ -0,0 +1,132 @@
+import functools
+from typing import Optional
+
+from flask import Flask, Response, request
+from injector import Injector
+
+from api.json_provider import FastJSONProvider
+from application.services.cafe_list_cache import CafeListCache
+from infrastructure.database.postgres import pool_status, replica_status
+from infrastructure.observability.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE, HTTP_REQUESTS, HTTP_ERRORS, HTTP_LATENCY, HTTP_STAGE_LATENCY, HTTP_DB_STATEMENTS
+from infrastructure.observability.startup import STARTUP
+from infrastructure.observability.timing import INSTRUMENTATION_ENABLED, SERVER_TIMING_ENABLED, RequestTimings, current_timings, end_request, span, start_request
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+POOL_METRICS = (
+    ('db_pool_size', 'size', 'gauge', 'Connections kept open by the pool.', 1),
+    ('db_pool_checked_out', 'checked_out', 'gauge', 'Connections currently in use.', 1),
+    ('db_pool_overflow', 'overflow', 'gauge', 'Connections open beyond the pool size (negative while the pool is not full).', 1),
+    ('db_pool_checkouts_total', 'checkouts', 'counter', 'Connections handed out by the pool.', 1),
+    ('db_pool_wait_seconds_total', 'total_wait_ms', 'counter', 'Time spent waiting for a free connection.', 0.001),
+    ('db_pool_max_wait_seconds', 'max_wait_ms', 'gauge', 'Longest wait for a free connection.', 0.001),
+)
+
+CACHE_METRICS = (
+    ('cache_hits_total', 'hits', 'counter', 'Cafe listing cache hits.'),
+    ('cache_misses_total', 'misses', 'counter', 'Cafe listing cache misses.'),
+    ('cache_evictions_total', 'evictions', 'counter', 'Cafe listing cache entries evicted to stay within bounds.'),
+    ('cache_errors_total', 'errors', 'counter', 'Cafe listing cache backend errors.'),
+    ('cache_entries', 'entries', 'gauge', 'Cafe listing cache entries held in process.'),
+    ('cache_bytes', 'bytes', 'gauge', 'Cafe listing cache payload bytes held in process.'),
+)
+
+class TimedJSONProvider(FastJSONProvider):
+    """Counts the time jsonify spends encoding as the serialize stage."""
+
+    def response(self, *args, **kwargs) -> Response:
+        with span('serialize'):
+            return super().response(*args, **kwargs)
+
+def route_label() -> str:
+    return request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+
+def record_request(method: str, route: str, status: int, timings: RequestTimings, total: Optional[float] = None) -> float:
+    """Feeds one finished request into the HTTP metrics and returns its total duration."""
+    total = timings.elapsed() if total is None else total
+    HTTP_REQUESTS.inc(method=method, route=route, status=status)
+    if status >= 500:
+        HTTP_ERRORS.inc(method=method, route=route, status=status)
+    HTTP_LATENCY.observe(total, method=method, route=route)
+    HTTP_DB_STATEMENTS.observe(timings.statements, route=route)
+    for stage, seconds in timings.stages.items():
+        HTTP_STAGE_LATENCY.observe(seconds, route=route, stage=stage)
+    return total
+
+def timed_view(view):
+    @functools.wraps(view)
+    def route(*args, **kwargs):
+        with span('route'):
+            return view(*args, **kwargs)
+    return route
+
+def register_process_metrics(app_injector: Injector) -> None:
+    def pool_reader(key, scale):
+        return lambda: [({}, pool_status()[key] * scale)]
+
+    for name, key, kind, documentation, scale in POOL_METRICS:
+        REGISTRY.gauge(name, documentation, pool_reader(key, scale), kind)
+
+    def cache_reader(key):
+        def read():
+            stats = app_injector.get(CafeListCache).stats()
+            return [({'backend': stats['backend']}, stats[key])] if key in stats else []
+        return read
+
+    for name, key, kind, documentation in CACHE_METRICS:
+        REGISTRY.gauge(name, documentation, cache_reader(key), kind)
+
+    def startup_reader(key):
+        return lambda: [] if STARTUP.snapshot()[key] is None else [({}, STARTUP.snapshot()[key])]
+
+    REGISTRY.gauge('process_startup_phase_seconds', 'Duration of each startup phase of this worker.', lambda: [({'phase': name}, seconds) for name, seconds in STARTUP.phases.items()])
+    REGISTRY.gauge('process_ready_seconds', 'Time from process start until the worker was ready to serve.', startup_reader('ready_after_s'))
+    REGISTRY.gauge('process_first_request_seconds', 'Time from process start until the first request was answered.', startup_reader('first_request_after_s'))
+
+    def replica_reader(read):
+        return lambda: [] if replica_status() is None else [({}, read(replica_status()))]
+
+    REGISTRY.gauge('db_replica_available', 'Whether query handlers may read from the replica (1) or were sent to the primary (0).', replica_reader(lambda status: 1 if status['healthy'] else 0))
+    REGISTRY.gauge('db_replica_lag_seconds', 'Replica replay lag at the last check.', lambda: [] if (replica_status() or {}).get('lag_seconds') is None else [({}, replica_status()['lag_seconds'])])
+
+def init_instrumentation(app: Flask, app_injector: Injector) -> None:
+    """
+    Times every request through its stages, adds a Server-Timing header and
+    serves the metrics at GET /metrics. Call before the other after_request
+    hooks are registered so the commit is included in the timings.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return
+
+    app.json = TimedJSONProvider(app)
+    register_process_metrics(app_injector)
+
+    @app.before_request
+    def start_request_timing():
+        start_request()
+
+    @app.after_request
+    def finish_request_timing(response):
+        timings = current_timings()
+        if timings is None:
+            return response
+        total = record_request(request.method, route_label(), response.status_code, timings)
+        if SERVER_TIMING_ENABLED:
+            response.headers['Server-Timing'] = timings.server_timing(total)
+        return response
+
+    @app.teardown_request
+    def clear_request_timing(exception=None):
+        end_request()
+
+    def metrics():
+        return Response(REGISTRY.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', endpoint='metrics', view_func=metrics)
+
+def time_views(app: Flask) -> None:
+    """Wraps every registered view in the route span. Call after all routes are added."""
+    if not INSTRUMENTATION_ENABLED:
+        return
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = timed_view(view)
@@ -0,0 +1,71 @@
+from typing import Any, Optional
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+from infrastructure.settings import env_str
+
+# auto (orjson when installed), orjson (required) or stdlib.
+JSON_ENCODER = env_str("JSON_ENCODER", "auto")
+COMPACT_SEPARATORS = (',', ':')
+
+def load_orjson(encoder: str = JSON_ENCODER):
+    if encoder == 'stdlib':
+        return None
+    try:
+        import orjson
+    except ImportError:
+        if encoder == 'orjson':
+            raise ValueError("JSON_ENCODER=orjson needs the optional orjson package")
+        return None
+    return orjson
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Encodes with orjson when it is installed, which handles the UUIDs the
+    repositories return natively and writes UTF-8 bytes directly. Dates and
+    dataclasses still go through Flask's default hook so both encoders
+    produce the same values; anything orjson rejects (e.g. integers wider
+    than 64 bits) falls back to the standard library encoder.
+    """
+
+    def __init__(self, app: Flask, encoder: str = JSON_ENCODER):
+        super().__init__(app)
+        self.orjson = load_orjson(encoder)
+        self.name = 'orjson' if self.orjson else 'stdlib'
+        if self.orjson:
+            self._options = self.orjson.OPT_PASSTHROUGH_DATETIME | self.orjson.OPT_PASSTHROUGH_DATACLASS | self.orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        data = self._orjson_dumps(obj, kwargs)
+        return super().dumps(obj, **kwargs) if data is None else data.decode('utf-8')
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        data = self._orjson_dumps(obj, kwargs)
+        return super().dumps(obj, **kwargs).encode('utf-8') if data is None else data
+
+    def _orjson_dumps(self, obj: Any, kwargs: dict) -> Optional[bytes]:
+        # orjson only writes compact or two-space indented output; other layouts use the stdlib encoder.
+        if self.orjson is None or set(kwargs) - {'separators', 'indent', 'sort_keys', 'default'}:
+            return None
+        indent = kwargs.get('indent')
+        if indent not in (None, 2) or (indent is None and tuple(kwargs.get('separators') or ()) != COMPACT_SEPARATORS):
+            return None
+
+        options = self._options
+        if indent == 2:
+            options |= self.orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            options |= self.orjson.OPT_SORT_KEYS
+        try:
+            return self.orjson.dumps(obj, default=kwargs.get('default', self.default), option=options)
+        except TypeError:
+            return None
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            body = self.dumps_bytes(obj, indent=2)
+        else:
+            body = self.dumps_bytes(obj, separators=COMPACT_SEPARATORS)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
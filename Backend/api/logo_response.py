@@ -0,0 +1,97 @@
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from contextlib import closing
+
+from flask import Response, abort, request, send_file
+
+from infrastructure.settings import env_int, env_str
+from infrastructure.storage.backends import IMMUTABLE_CACHE_CONTROL, LocalLogoBackend
+from infrastructure.storage.logo_store import CONTENT_ADDRESSED_KEY, ContentAddressedLogoStore
+
+# Older Python builds and slim images without /etc/mime.types miss these.
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+
+# Logos that are not content addressed (e.g. the seed data) can be replaced in place.
+LOGO_LEGACY_MAX_AGE = env_int("LOGO_LEGACY_MAX_AGE", 3600)
+# With nginx in front, e.g. "/internal-logos/": the file is sent by nginx through X-Accel-Redirect.
+LOGO_ACCEL_REDIRECT_PREFIX = env_str("LOGO_ACCEL_REDIRECT_PREFIX")
+
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+def file_etag(path: str) -> str:
+    """SHA-256 of the file, cached by path, size and modification time."""
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime_ns)
+    etag = _file_hashes.get(cache_key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(64 * 1024), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()
+        with _file_hashes_lock:
+            if len(_file_hashes) >= 4096:
+                _file_hashes.clear()
+            _file_hashes[cache_key] = etag
+    return etag
+
+def accepts(mimetype: str) -> bool:
+    # Only an explicit mention counts: browsers also send */*, which says nothing about WebP support.
+    return any(value == mimetype and quality > 0 for value, quality in request.accept_mimetypes)
+
+def logo_response(store: ContentAddressedLogoStore, filename: str) -> Response:
+    """
+    Serves a stored logo, picking the rendition for ?w= and the Accept header.
+    Content-addressed files are immutable, so they get a year-long Cache-Control
+    and an ETag derived from the key, which answers revalidations without any I/O.
+    """
+    key = store.choose_rendition(filename, request.args.get('w', type=int), accepts)
+    content_addressed = CONTENT_ADDRESSED_KEY.match(key) is not None
+    mimetype = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+    backend = store.backend
+    path = None
+
+    if isinstance(backend, LocalLogoBackend):
+        try:
+            path = backend.local_path(key)
+        except ValueError:
+            abort(404)
+        if not os.path.isfile(path):
+            abort(404)
+
+    if content_addressed:
+        etag = os.path.basename(key)
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = file_etag(path) if path else key
+        cache_control = f'public, max-age={LOGO_LEGACY_MAX_AGE}'
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif path and LOGO_ACCEL_REDIRECT_PREFIX:
+        response = Response(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = LOGO_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + key
+        response.set_etag(etag)
+    elif path:
+        # A path (not an open file) lets the WSGI server use its file wrapper, i.e. sendfile under gunicorn.
+        response = send_file(path, mimetype=mimetype, etag=etag, conditional=True)
+    else:
+        try:
+            stream = backend.open(key)
+        except FileNotFoundError:
+            abort(404)
+        with closing(stream):
+            data = stream.read()
+        response = send_file(io.BytesIO(data), mimetype=mimetype, etag=etag, conditional=True)
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    if content_addressed and store.alternate_formats:
+        response.vary.add('Accept')
+    return response
@@ -0,0 +1,54 @@
+import math
+import time
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional
+
+from flask import Flask, request
+
+from infrastructure.database.postgres import replica_monitor
+from infrastructure.database.routing import READ_YOUR_WRITES_SECONDS, pin_to_primary
+
+READ_PRIMARY_COOKIE = 'read_primary_until'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+def read_primary_cookie(cookie_header: Optional[str]) -> Optional[str]:
+    if not cookie_header:
+        return None
+    cookies = SimpleCookie()
+    try:
+        cookies.load(cookie_header)
+    except CookieError:
+        return None
+    morsel = cookies.get(READ_PRIMARY_COOKIE)
+    return morsel.value if morsel else None
+
+def pinned_until(value: Optional[str]) -> bool:
+    try:
+        return float(value) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+def init_read_routing(app: Flask) -> None:
+    """
+    Read-your-writes across requests when query handlers read from a replica:
+    a successful write sets a short-lived cookie, and while it is valid that
+    client's reads stay on the primary. Cross-origin clients keep the cookie
+    only when they send credentials.
+    """
+    if replica_monitor is None:
+        return
+
+    @app.before_request
+    def pin_recent_writers():
+        pin_to_primary(pinned_until(request.cookies.get(READ_PRIMARY_COOKIE)))
+
+    @app.after_request
+    def remember_writes(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            until = time.time() + READ_YOUR_WRITES_SECONDS
+            response.set_cookie(READ_PRIMARY_COOKIE, f'{until:.3f}', max_age=math.ceil(READ_YOUR_WRITES_SECONDS), httponly=True, samesite='Lax')
+        return response
+
+    @app.teardown_request
+    def unpin(exception=None):
+        pin_to_primary(False)
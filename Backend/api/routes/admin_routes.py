@@ -0,0 +1,57 @@
+import hmac
+from flask import Blueprint, request, jsonify
+from injector import inject, Injector
+
+from infrastructure.observability.slow_queries import SlowQueryLog
+from infrastructure.settings import env_str
+
+admin_blueprint = Blueprint('admin', __name__)
+ADMIN_TOKEN = env_str("ADMIN_TOKEN")
+
+def is_authorized() -> bool:
+    # The admin routes expose SQL text, so they stay closed unless ADMIN_TOKEN is configured.
+    if not ADMIN_TOKEN:
+        return False
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    return hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+class AdminController:
+    @inject
+    def __init__(self, slow_query_log: SlowQueryLog):
+        self.slow_query_log = slow_query_log
+
+    def register_routes(self, app_injector: Injector):
+
+        def get_controller():
+            return app_injector.get(AdminController)
+
+        @admin_blueprint.before_request
+        def require_admin_token():
+            if not is_authorized():
+                return jsonify({"error": "Admin token required"}), 403
+
+        @admin_blueprint.route('/slow-queries', methods=['GET'])
+        def get_slow_queries():
+            controller = get_controller()
+            try:
+                limit = min(max(int(request.args.get('limit', 20)), 1), controller.slow_query_log.max_fingerprints)
+                sort = request.args.get('sort', 'total_ms')
+                return jsonify({
+                    "threshold_ms": controller.slow_query_log.threshold_ms,
+                    "statements": controller.slow_query_log.top(limit, sort),
+                }), 200
+
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": f"Failed to read slow queries: {str(e)}"}), 500
+
+        @admin_blueprint.route('/slow-queries', methods=['DELETE'])
+        def reset_slow_queries():
+            get_controller().slow_query_log.reset()
+            return '', 204
+
+def init_app(app_injector: Injector):
+    controller = app_injector.get(AdminController)
+    controller.register_routes(app_injector)
+    return admin_blueprint
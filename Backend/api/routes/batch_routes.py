@@ -0,0 +1,50 @@
+from flask import Blueprint, request, jsonify
+from injector import inject, Injector
+from pydantic import ValidationError
+
+from application.mediator import Mediator
+from application.commands.batch_command import BatchCommand
+from domain.exceptions import BatchAbortedException, DomainException
+from infrastructure.observability.timing import span
+
+batch_blueprint = Blueprint('batch', __name__)
+
+def batch_status(summary: dict) -> int:
+    if not summary['failed']:
+        return 200
+    if summary['succeeded']:
+        return 207
+    return 500 if any(result['status'] >= 500 for result in summary['results']) else 400
+
+class BatchController:
+
+    @inject
+    def __init__(self, mediator: Mediator):
+        self.mediator = mediator
+
+    def register_routes(self, app_injector: Injector):
+
+        @batch_blueprint.route('/', methods=['POST'])
+        def run_batch():
+            try:
+                command_data = request.get_json(silent=True)
+                if not isinstance(command_data, dict):
+                    return jsonify({"error": "Expected a JSON object with an operations list."}), 400
+                with span('validate'):
+                    command = BatchCommand(**command_data)
+                summary = self.mediator.send(command)
+                return jsonify(summary), batch_status(summary)
+
+            except ValidationError as e:
+                return jsonify({"error": e.errors(include_url=False, include_context=False)}), 400
+            except BatchAbortedException as e:
+                return jsonify({**e.summary, "error": str(e)}), e.status
+            except DomainException as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": f"Failed to run batch: {str(e)}"}), 500
+
+def init_app(app_injector: Injector):
+    controller = app_injector.get(BatchController)
+    controller.register_routes(app_injector)
+    return batch_blueprint
@@ -1,43 +1,49 @@
-import os
 from flask import Blueprint, request, jsonify
 from injector import inject, Injector
 from pydantic import ValidationError
 from sqlalchemy.orm.exc import NoResultFound
-from werkzeug.utils import secure_filename
 
 from application.mediator import Mediator
 from application.commands.create_cafe_command import CreateCafeCommand
 from application.commands.update_cafe_command import UpdateCafeCommand
 from application.commands.delete_cafe_command import DeleteCafeCommand
-from application.handlers.command_handlers import CreateCafeCommandHandler, UpdateCafeCommandHandler, DeleteCafeCommandHandler
-from application.handlers.query_handlers import GetCafesQueryHandler
+from application.commands.bulk_import_command import BulkCreateCafesCommand
+from application.commands.upload_logo_command import UploadLogoCommand
+from application.queries.pagination import DEFAULT_PAGE_SIZE
+from application.queries.search_query import SearchCafesQuery
 from application.queries.get_cafe_query import GetCafeQuery
-from domain.exceptions import DomainException
+from domain.exceptions import DomainException, LogoTooLargeException, UnsupportedLogoException
+from application.interfaces.version_repository import IVersionRepository, CAFES_RESOURCE
+from api.streaming import stream_json, wants_ndjson, wants_stream
+from api.bulk_input import read_bulk_rows, bulk_status
+from api.conditional import is_not_modified, validator_headers, version_etag
+from api.export_response import export_response
+from infrastructure.database.behaviors import SnapshotReads
+from infrastructure.observability.timing import span
 
 cafe_blueprint = Blueprint('cafe', __name__)
-UPLOAD_FOLDER = '/usr/src/app/public/logos'
+MULTIPART_ALLOWANCE = 64 * 1024
 
 class CafeController:
     @inject
-    def __init__(self, mediator: Mediator, create_cafe_handler: CreateCafeCommandHandler, update_cafe_handler: UpdateCafeCommandHandler, delete_cafe_handler: DeleteCafeCommandHandler, get_cafes_handler: GetCafesQueryHandler):
+    def __init__(self, mediator: Mediator, version_repository: IVersionRepository, snapshot_reads: SnapshotReads):
         self.mediator = mediator
-        self.create_cafe_handler = create_cafe_handler
-        self.update_cafe_handler = update_cafe_handler
-        self.delete_cafe_handler = delete_cafe_handler
-        self.get_cafes_handler = get_cafes_handler
+        self.version_repository = version_repository
+        self.snapshot_reads = snapshot_reads
+        # Streaming and the upload size check call the handlers directly, outside the pipeline.
+        self.get_cafes_handler = mediator.handler_for(GetCafeQuery)
+        self.upload_logo_handler = mediator.handler_for(UploadLogoCommand)
 
     def register_routes(self, app_injector: Injector):
 
-        def get_controller():
-            return app_injector.get(CafeController)
         
         @cafe_blueprint.route('/', methods=['POST'])
         def create_cafe():
-            controller = get_controller()
             try:
                 command_data = request.json
-                command = CreateCafeCommand(**command_data)
-                cafe_id = controller.create_cafe_handler.handle(command)
+                with span('validate'):
+                    command = CreateCafeCommand(**command_data)
+                cafe_id = self.mediator.send(command)
                 return jsonify({"id": str(cafe_id), "message": "Cafe created successfully"}), 201
         
             except ValidationError as e:
@@ -45,13 +51,28 @@ class CafeController:
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
             
+        @cafe_blueprint.route('/bulk', methods=['POST'])
+        def bulk_create_cafes():
+            try:
+                with span('validate'):
+                    command = BulkCreateCafesCommand(rows=read_bulk_rows(request))
+                summary = self.mediator.send(command)
+                return jsonify(summary), bulk_status(summary)
+
+            except ValidationError as e:
+                return jsonify({"error": e.errors(include_url=False, include_context=False)}), 400
+            except (ValueError, DomainException) as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": f"Failed to import cafes: {str(e)}"}), 500
+            
         @cafe_blueprint.route('/<uuid:cafe_id>', methods=['PUT'])
         def update_cafe(cafe_id):
-            controller = get_controller()
             try:
                 command_data = request.json
-                command = UpdateCafeCommand(id=cafe_id, **command_data)
-                controller.update_cafe_handler.handle(command)
+                with span('validate'):
+                    command = UpdateCafeCommand(id=cafe_id, **command_data)
+                self.mediator.send(command)
                 return jsonify({"id": str(cafe_id), "message": "Cafe update successfully"}), 201
             
             except ValidationError as e:
@@ -66,10 +87,10 @@ class CafeController:
             
         @cafe_blueprint.route('/<uuid:cafe_id>', methods=['DELETE'])
         def delete_cafe(cafe_id):
-            controller = get_controller()
             try:
-                command = DeleteCafeCommand(id=cafe_id)
-                controller.delete_cafe_handler.handle(command)
+                with span('validate'):
+                    command = DeleteCafeCommand(id=cafe_id)
+                self.mediator.send(command)
                 return jsonify({"message": f"Cafe {cafe_id} deleted successfully"}), 204
             except Exception as e:
                 return jsonify({"error": f"Failed to delete cafe: {str(e)}"}), 500
@@ -77,36 +98,108 @@ class CafeController:
             
         @cafe_blueprint.route('/', methods=['GET'])
         def get_cafes():
-            controller = get_controller()
             try:
-                location = request.args.get('location')
-                query = GetCafeQuery(location = location)
-                cafe_list = controller.get_cafes_handler.handle(query)
-                return jsonify(cafe_list), 200
-            
+                with span('validate'):
+                    query = GetCafeQuery(
+                        location = request.args.get('location'),
+                        limit = request.args.get('limit'),
+                        cursor = request.args.get('cursor'),
+                        fields = request.args.get('fields')
+                    )
+
+                def read_listing():
+                    version, last_modified = self.version_repository.get_version(CAFES_RESOURCE)
+                    etag = version_etag(CAFES_RESOURCE, version)
+                    headers = validator_headers(etag, last_modified)
+                    if is_not_modified(request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since'), etag, last_modified):
+                        return '', 304, headers
+
+                    if wants_stream(request):
+                        return stream_json(self.get_cafes_handler.stream(query), ndjson=wants_ndjson(request)), 200, headers
+
+                    cafe_page = self.mediator.send(query)
+                    return jsonify(cafe_page if query.is_paginated else cafe_page['items']), 200, headers
+
+                # A stream keeps its cursor open after the route returns, so it reads outside a snapshot, from the primary.
+                if wants_stream(request):
+                    return read_listing()
+                return self.snapshot_reads.run(query, read_listing)
+
+            except ValidationError as e:
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             except Exception as e:
                 return jsonify({'error': f"Failed to retrieve cafes: {str(e)}"}), 500
+
+        @cafe_blueprint.route('/search', methods=['GET'])
+        def search_cafes():
+            try:
+                with span('validate'):
+                    query = SearchCafesQuery(
+                        q = request.args.get('q', ''),
+                        limit = request.args.get('limit', DEFAULT_PAGE_SIZE),
+                        cursor = request.args.get('cursor')
+                    )
+                return jsonify(self.mediator.send(query)), 200
+
+            except ValidationError as e:
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f"Failed to search cafes: {str(e)}"}), 500
+
+        @cafe_blueprint.route('/export', methods=['GET'])
+        def export_cafes():
+            try:
+                with span('validate'):
+                    query = GetCafeQuery(
+                        location = request.args.get('location'),
+                        fields = request.args.get('fields')
+                    )
+                return export_response(query, request.args.get('format', 'csv'), 'cafes')
+
+            except ValidationError as e:
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f"Failed to export cafes: {str(e)}"}), 500
             
 
         @cafe_blueprint.route('/upload-logo/<string:cafe_id>', methods=['POST'])
         def upload_logo(cafe_id):
-            if 'file' not in request.files:
-                return jsonify({"error": "No file part in request"}), 400    
-                   
-            file = request.files['file']
-            if file.filename == '':
-                return jsonify({"error": "No file selected"}), 400
-            
-            if file:
-                filename = secure_filename(file.filename)
-                storage_folder = os.path.join(UPLOAD_FOLDER, cafe_id)
-                os.makedirs(storage_folder, exist_ok=True)
-                filepath = os.path.join(storage_folder, filename)
-                file.save(filepath)
-                new_filename = cafe_id + '/' + filename
-                public_url = f'/logos/{new_filename}'
-                
-                return jsonify({"logoUrl": public_url}), 200
+            # Refuse oversized uploads before the body is read; multipart framing gets some slack.
+            max_bytes = self.upload_logo_handler.max_bytes
+            if request.content_length and request.content_length > max_bytes + MULTIPART_ALLOWANCE:
+                return jsonify({"error": f"Logo is larger than {max_bytes} bytes"}), 413
+
+            # A raw image body is streamed straight from the socket; multipart uploads from the form parser's spool.
+            if request.mimetype.startswith('image/'):
+                stream, content_length = request.stream, request.content_length
+            else:
+                if 'file' not in request.files:
+                    return jsonify({"error": "No file part in request"}), 400
+                file = request.files['file']
+                if file.filename == '':
+                    return jsonify({"error": "No file selected"}), 400
+                stream, content_length = file.stream, None
+
+            try:
+                with span('validate'):
+                    command = UploadLogoCommand(cafe_id=cafe_id, stream=stream, content_length=content_length)
+                logo = self.mediator.send(command)
+                return jsonify({"logoUrl": logo["url"], **logo}), 200
+
+            except ValidationError as e:
+                return jsonify({"error": e.errors(include_url=False, include_context=False)}), 400
+            except LogoTooLargeException as e:
+                return jsonify({"error": str(e)}), 413
+            except UnsupportedLogoException as e:
+                return jsonify({"error": str(e)}), 415
+            except Exception as e:
+                return jsonify({"error": f"Failed to upload logo: {str(e)}"}), 500
 
 def init_app(app_injector: Injector):
     controller = app_injector.get(CafeController)
@@ -7,60 +7,88 @@ from application.mediator import Mediator
 from application.commands.create_employee_command import CreateEmployeeCommand
 from application.commands.update_employee_command import UpdateEmployeeCommand
 from application.commands.delete_employee_command import DeleteEmployeeCommand
+from application.commands.bulk_import_command import BulkCreateEmployeesCommand
 from application.queries.get_employees_query import GetEmployeesQuery
-from application.handlers.command_handlers import CreateEmployeeCommandHandler, UpdateEmployeeCommandHandler, DeleteEmployeeCommandHandler
-from application.handlers.query_handlers import GetEmployeesQueryHandler
+from application.queries.pagination import DEFAULT_PAGE_SIZE
+from application.queries.search_query import SearchEmployeesQuery
+from application.interfaces.version_repository import IVersionRepository, EMPLOYEES_RESOURCE
+from api.streaming import stream_json, wants_ndjson, wants_stream
+from api.bulk_input import read_bulk_rows, bulk_status
+from domain.exceptions import DomainException
+from api.conditional import employee_list_validators, is_not_modified, validator_headers
+from api.export_response import export_response
+from infrastructure.database.behaviors import SnapshotReads
+from infrastructure.observability.timing import span
 
 employee_blueprint = Blueprint('employee', __name__)
 
 class EmployeeController:
 
     @inject
-    def __init__(self, mediator: Mediator, create_employee_handler: CreateEmployeeCommandHandler, update_employee_handler: UpdateEmployeeCommandHandler, delete_employee_handler: DeleteEmployeeCommandHandler, get_employee_handler: GetEmployeesQueryHandler):
+    def __init__(self, mediator: Mediator, version_repository: IVersionRepository, snapshot_reads: SnapshotReads):
         self.mediator = mediator
-        self.create_employee_handler = create_employee_handler
-        self.update_employee_handler = update_employee_handler
-        self.delete_employee_handler = delete_employee_handler
-        self.get_employee_handler = get_employee_handler
+        self.version_repository = version_repository
+        self.snapshot_reads = snapshot_reads
+        # Streaming calls the handler directly, outside the pipeline.
+        self.get_employee_handler = mediator.handler_for(GetEmployeesQuery)
 
     def register_routes(self, app_injector: Injector):
-        def get_controller():
-            return app_injector.get(EmployeeController)
         
         @employee_blueprint.route('/', methods=['POST'])
         def create_employee():
-            controller = get_controller()
             try:
                 command_data = request.json
-                command = CreateEmployeeCommand(**command_data)
-                employee_id = controller.create_employee_handler.handle(command)
+                with span('validate'):
+                    command = CreateEmployeeCommand(**command_data)
+                employee_id = self.mediator.send(command)
                 return jsonify({"id": employee_id, "message" : "Employee created and assigned successfully"}), 201
             
             except ValidationError as e:
                 return jsonify({"error": e.errors()}), 400
+            except DomainException as e:
+                return jsonify({"error": str(e)}), 400
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
             
+        @employee_blueprint.route('/bulk', methods=['POST'])
+        def bulk_create_employees():
+            try:
+                with span('validate'):
+                    command = BulkCreateEmployeesCommand(rows=read_bulk_rows(request))
+                summary = self.mediator.send(command)
+                return jsonify(summary), bulk_status(summary)
+
+            except ValidationError as e:
+                return jsonify({"error": e.errors(include_url=False, include_context=False)}), 400
+            except (ValueError, DomainException) as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": f"Failed to import employees: {str(e)}"}), 500
+            
         @employee_blueprint.route('/<string:employee_id>', methods=['PUT'])
         def update_employee(employee_id):
-            controller = get_controller()
             try:
                 command_data = request.json
-                command = UpdateEmployeeCommand(id = employee_id, **command_data)
-                controller.update_employee_handler.handle(command)
+                with span('validate'):
+                    command = UpdateEmployeeCommand(id = employee_id, **command_data)
+                self.mediator.send(command)
                 return jsonify({"message": f"Employee {employee_id} updated successfully"}), 200
             
             except ValidationError as e:
                 return jsonify({"error": e.errors()}), 400
+            except NoResultFound as e:
+                return jsonify({"error": str(e)}), 404
+            except DomainException as e:
+                return jsonify({"error": str(e)}), 400
             except Exception as e:
                 return jsonify({"error": f"Failed to update employee: {str(e)}"}), 500
         
         @employee_blueprint.route('/<string:employee_id>', methods=['DELETE'])
         def delete_employee(employee_id):
-            controller = get_controller()
             try:
-                command = DeleteEmployeeCommand(id = employee_id)
-                controller.delete_employee_handler.handle(command)
+                with span('validate'):
+                    command = DeleteEmployeeCommand(id = employee_id)
+                self.mediator.send(command)
                 return jsonify({"message": f"Employee {employee_id} deleted successfully"}), 204
             
             except Exception as e:
@@ -68,17 +96,74 @@ class EmployeeController:
 
         @employee_blueprint.route('/', methods=['GET'])
         def get_employee():
-            controller = get_controller()
             try:
-                cafe_name = request.args.get('cafe')
-                query = GetEmployeesQuery(cafe_name=cafe_name)
-                employee_list = controller.get_employee_handler.handle(query)
-                return jsonify(employee_list), 200
-            
+                with span('validate'):
+                    query = GetEmployeesQuery(
+                        cafe_name = request.args.get('cafe'),
+                        limit = request.args.get('limit'),
+                        cursor = request.args.get('cursor'),
+                        fields = request.args.get('fields')
+                    )
+
+                def read_listing():
+                    version, last_modified = self.version_repository.get_version(EMPLOYEES_RESOURCE)
+                    etag, last_modified = employee_list_validators(version, last_modified)
+                    headers = validator_headers(etag, last_modified)
+                    if is_not_modified(request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since'), etag, last_modified):
+                        return '', 304, headers
+
+                    if wants_stream(request):
+                        return stream_json(self.get_employee_handler.stream(query), ndjson=wants_ndjson(request)), 200, headers
+
+                    employee_page = self.mediator.send(query)
+                    return jsonify(employee_page if query.is_paginated else employee_page['items']), 200, headers
+
+                # A stream keeps its cursor open after the route returns, so it reads outside a snapshot, from the primary.
+                if wants_stream(request):
+                    return read_listing()
+                return self.snapshot_reads.run(query, read_listing)
+
             except ValidationError as e:
-                return jsonify({'error': e.errors()}), 400
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             except Exception as e:
                 return jsonify({'error': f'Failed to retrieve employees: {str(e)}'}), 500
+
+        @employee_blueprint.route('/search', methods=['GET'])
+        def search_employees():
+            try:
+                with span('validate'):
+                    query = SearchEmployeesQuery(
+                        q = request.args.get('q', ''),
+                        limit = request.args.get('limit', DEFAULT_PAGE_SIZE),
+                        cursor = request.args.get('cursor')
+                    )
+                return jsonify(self.mediator.send(query)), 200
+
+            except ValidationError as e:
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Failed to search employees: {str(e)}'}), 500
+
+        @employee_blueprint.route('/export', methods=['GET'])
+        def export_employees():
+            try:
+                with span('validate'):
+                    query = GetEmployeesQuery(
+                        cafe_name = request.args.get('cafe'),
+                        fields = request.args.get('fields')
+                    )
+                return export_response(query, request.args.get('format', 'csv'), 'employees')
+
+            except ValidationError as e:
+                return jsonify({'error': e.errors(include_url=False, include_context=False)}), 400
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Failed to export employees: {str(e)}'}), 500
             
 def init_app(app_injector: Injector):
     controller = app_injector.get(EmployeeController)
@@ -0,0 +1,53 @@
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import Request, Response, current_app, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def wants_ndjson(request: Request) -> bool:
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def wants_stream(request: Request) -> bool:
+    return wants_ndjson(request) or request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def stream_json(rows: Iterable[Dict[str, Any]], ndjson: bool = False) -> Response:
+    """
+    Streams rows as a JSON array (or NDJSON) while they are read from the
+    database, buffering output into chunks of roughly STREAM_CHUNK_SIZE bytes.
+    """
+    dumps = partial(current_app.json.dumps, separators=(',', ':'))
+    rows = iter(rows)
+
+    # Pull the first row before the response starts so query errors still
+    # surface as a normal error response instead of a truncated body.
+    first = next(rows, None)
+
+    def generate() -> Iterator[str]:
+        buffer = [] if ndjson else ['[']
+        size = 0
+        separator = '\n' if ndjson else ','
+
+        if first is not None:
+            for index, row in enumerate(_prepend(first, rows)):
+                chunk = dumps(row) if (ndjson or index == 0) else separator + dumps(row)
+                if ndjson:
+                    chunk += separator
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+
+        if not ndjson:
+            buffer.append(']\n')
+        if buffer:
+            yield ''.join(buffer)
+
+    mimetype = NDJSON_MIMETYPE if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+def _prepend(first: Dict[str, Any], rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    yield first
+    yield from rows
@@ -0,0 +1,63 @@
+from typing import Any, Callable, Dict, Iterable, Sequence
+
+from application.mediator import AsyncHandler, Handler, PipelineBehavior
+
+class ValidationBehavior(PipelineBehavior):
+    """Runs the validators registered for a request type before its handler."""
+
+    def __init__(self, validators: Dict[type, Sequence[Callable[[Any], None]]]):
+        self.validators = validators
+
+    def applies_to(self, request_type: type) -> bool:
+        return bool(self.validators.get(request_type))
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        for validator in self.validators[type(request)]:
+            validator(request)
+        return next_handler(request)
+
+    async def handle_async(self, request: Any, next_handler: AsyncHandler) -> Any:
+        for validator in self.validators[type(request)]:
+            validator(request)
+        return await next_handler(request)
+
+class CachingBehavior(PipelineBehavior):
+    """
+    Read-through caching for queries with a cache policy: an object with
+    get_or_load(query, load) and get_or_load_async(query, load), such as
+    CafeListCache, which also owns invalidation.
+    """
+
+    def __init__(self, policies: Dict[type, Any]):
+        self.policies = policies
+
+    def applies_to(self, request_type: type) -> bool:
+        return request_type in self.policies
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        return self.policies[type(request)].get_or_load(request, lambda: next_handler(request))
+
+    async def handle_async(self, request: Any, next_handler: AsyncHandler) -> Any:
+        return await self.policies[type(request)].get_or_load_async(request, lambda: next_handler(request))
+
+class TransactionBehavior(PipelineBehavior):
+    """
+    Commits the session once a command's handler returns and rolls it back
+    when it raises, so commit failures reach the route's error handling.
+    """
+
+    def __init__(self, session, request_types: Iterable[type]):
+        self.session = session
+        self.request_types = set(request_types)
+
+    def applies_to(self, request_type: type) -> bool:
+        return request_type in self.request_types
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        try:
+            result = next_handler(request)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal
+
+from application.commands.create_cafe_command import CreateCafeCommand
+from application.commands.update_cafe_command import UpdateCafeCommand
+from application.commands.delete_cafe_command import DeleteCafeCommand
+from application.commands.create_employee_command import CreateEmployeeCommand
+from application.commands.update_employee_command import UpdateEmployeeCommand
+from application.commands.delete_employee_command import DeleteEmployeeCommand
+
+MAX_BATCH_OPERATIONS = 1000
+
+# (resource, op) -> the command each batch operation is validated into.
+BATCH_COMMANDS = {
+    ('cafe', 'create'): CreateCafeCommand,
+    ('cafe', 'update'): UpdateCafeCommand,
+    ('cafe', 'delete'): DeleteCafeCommand,
+    ('employee', 'create'): CreateEmployeeCommand,
+    ('employee', 'update'): UpdateEmployeeCommand,
+    ('employee', 'delete'): DeleteEmployeeCommand,
+}
+
+class BatchCommand(BaseModel):
+    # Operations stay raw, like bulk import rows, so each one can fail on its own:
+    # {"op": "update", "resource": "employee", "id": "UI1234567", "data": {...}}
+    operations: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    # all_or_nothing commits only if every operation succeeds; best_effort
+    # runs each in a savepoint and commits those that succeeded.
+    mode: Literal['all_or_nothing', 'best_effort'] = 'all_or_nothing'
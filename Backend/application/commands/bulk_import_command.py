@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+MAX_BULK_ROWS = 10000
+
+class BulkCreateCafesCommand(BaseModel):
+    # Rows stay raw so each one can be validated with CreateCafeCommand and fail on its own.
+    rows: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BULK_ROWS)
+
+class BulkCreateEmployeesCommand(BaseModel):
+    rows: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BULK_ROWS)
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional
+
+class UploadLogoCommand(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # A cafe UUID, or a placeholder id for a cafe that has not been created yet.
+    cafe_id: str = Field(min_length=1, max_length=64)
+    stream: Any
+    content_length: Optional[int] = Field(default=None, ge=0)
@@ -1,36 +1,53 @@
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, Type
 from uuid import UUID
-from sqlalchemy.exc import IntegrityError, NoResultFound
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
 
 from application.commands.create_cafe_command import CreateCafeCommand
 from application.commands.update_cafe_command import UpdateCafeCommand
 from application.commands.delete_cafe_command import DeleteCafeCommand
+from application.commands.upload_logo_command import UploadLogoCommand
 
 from application.commands.create_employee_command import CreateEmployeeCommand
 from application.commands.update_employee_command import UpdateEmployeeCommand
 from application.commands.delete_employee_command import DeleteEmployeeCommand
+from application.commands.bulk_import_command import BulkCreateCafesCommand, BulkCreateEmployeesCommand
+from application.commands.batch_command import BATCH_COMMANDS, BatchCommand
 
 from application.interfaces.cafe_repository import ICafeRepository
 from application.interfaces.employee_repository import IEmployeeRepository
+from application.interfaces.logo_store import ILogoStore
+from application.interfaces.version_repository import IVersionRepository, CAFES_RESOURCE, EMPLOYEES_RESOURCE
 
 from application.services.employee_id_generator import EmployeeIDGenerator
+from application.services.cafe_list_cache import CafeListCache
 
-from domain.exceptions import DomainException
+from domain.exceptions import BatchAbortedException, DomainException
 
 class CreateCafeCommandHandler:
-    def __init__(self, cafe_repository: ICafeRepository):
+    def __init__(self, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
         self.cafe_repository = cafe_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
 
     def handle(self, command: CreateCafeCommand) -> UUID:
         cafe_data = command.model_dump(exclude_none = True)
         try:
             cafe_id = self.cafe_repository.add_cafe(cafe_data)
+            if self.version_repository:
+                self.version_repository.bump(CAFES_RESOURCE)
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_location(command.location)
             return cafe_id
         except Exception as e:
             raise DomainException(f"Failed to create cafe: {str(e)}")
         
 class UpdateCafeCommandHandler:
-    def __init__(self, cafe_repository: ICafeRepository):
+    def __init__(self, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
         self.cafe_repository = cafe_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
 
     def handle(self, command: UpdateCafeCommand):
         update = command.model_dump(exclude_none=True, exclude={'id'})
@@ -39,7 +56,12 @@ class UpdateCafeCommandHandler:
             return
         
         try:
-            self.cafe_repository.update_cafe(command.id, update)
+            cafe = self.cafe_repository.update_cafe(command.id, update)
+            if self.version_repository:
+                self.version_repository.bump(CAFES_RESOURCE, EMPLOYEES_RESOURCE)
+            # The cafe may have moved, so the old location's listing is stale too.
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_locations([cafe['previous_location'], cafe['location']])
         except NoResultFound:
             raise DomainException(f"Cafe with ID {command.id} not found.")
         except Exception as e:
@@ -47,68 +69,112 @@ class UpdateCafeCommandHandler:
         
 
 class DeleteCafeCommandHandler:
-    def __init__(self, cafe_repository: ICafeRepository):
+    def __init__(self, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
         self.cafe_repository =  cafe_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
 
     def handle(self, command: DeleteCafeCommand):
         try:
-            self.cafe_repository.delete_cafe(command.id)
+            cafe = self.cafe_repository.delete_cafe(command.id)
+            if self.version_repository:
+                self.version_repository.bump(CAFES_RESOURCE, EMPLOYEES_RESOURCE)
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_locations([cafe['location']])
         except NoResultFound:
             raise DomainException(f"Cafe with ID {command.id} not found.")
         except Exception as e:
             raise DomainException("Failed to delete the cafe")
         
 
+class UploadLogoCommandHandler:
+    def __init__(self, logo_store: ILogoStore, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
+        self.logo_store = logo_store
+        self.cafe_repository = cafe_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
+
+    @property
+    def max_bytes(self) -> int:
+        return self.logo_store.max_bytes
+
+    def handle(self, command: UploadLogoCommand) -> dict:
+        logo = self.logo_store.store(command.stream, command.content_length)
+
+        # New cafes upload under a placeholder id and send the url with the create
+        # request; an existing cafe points at its new logo straight away.
+        try:
+            cafe_id = UUID(command.cafe_id)
+        except ValueError:
+            return {**logo, "cafe_updated": False}
+        try:
+            cafe = self.cafe_repository.update_cafe(cafe_id, {"logo": logo["url"]})
+        except NoResultFound:
+            return {**logo, "cafe_updated": False}
+
+        if self.version_repository:
+            self.version_repository.bump(CAFES_RESOURCE)
+        if self.cafe_cache:
+            self.cafe_cache.invalidate_locations([cafe['location']])
+        return {**logo, "cafe_updated": True}
+
 class CreateEmployeeCommandHandler:
-    def __init__(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator):
+    def __init__(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
         self.employee_repository = employee_repository
         self.cafe_repository = cafe_repository
         self.employee_id_generator = employee_id_generator
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
 
     def handle(self, command: CreateEmployeeCommand) -> str:
-        if command.assigned_cafe_id:
-            cafe = self.cafe_repository.get_cafe_by_id(command.assigned_cafe_id)
-            if not cafe:
-                raise DomainException(f"Assigned Cafe ID {command.assigned_cafe_id} does not exist")
-        
         employee_id = self.employee_id_generator.generate_employee_id()
         employee_data = command.model_dump(exclude_none=True, exclude={'assigned_cafe_id'})
 
         try:
-            self.employee_repository.add_employee(
+            # An unknown cafe is reported by the insert's foreign key rather than a lookup beforehand.
+            employee = self.employee_repository.add_employee(
                 employee_id = employee_id,
                 employee_data = employee_data,
                 cafe_id = command.assigned_cafe_id
             )
+            if self.version_repository:
+                self.version_repository.bump(EMPLOYEES_RESOURCE, CAFES_RESOURCE)
+            if self.cafe_cache and employee['cafe_location']:
+                self.cafe_cache.invalidate_location(employee['cafe_location'])
             return employee_id
+        except DomainException:
+            raise
         except IntegrityError as e:
             raise DomainException(f"Failed to create employee due to integrity error {e}")
         except Exception as e:
-            print("Error creating employee: {e}")
+            print(f"Error creating employee: {e}")
             raise DomainException("Failed to create employee due to server error")
 
 class UpdateEmployeeCommandHandler:
-        def __init__(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository):
+        def __init__(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
             self.employee_repository = employee_repository
             self.cafe_repository = cafe_repository
+            self.cafe_cache = cafe_cache
+            self.version_repository = version_repository
 
         def handle(self, command: UpdateEmployeeCommand):
-            if not self.employee_repository.get_employee_by_id(command.id):
-                raise NoResultFound(f"Employee with ID {command.id} does not exist")
-            
-            if command.assigned_cafe_id:
-                cafe = self.cafe_repository.get_cafe_by_id(command.assigned_cafe_id)
-                if not cafe:
-                    raise DomainException(f"Assigned Cafe ID {command.assigned_cafe_id} does not exist")
-                
             employee_data = command.model_dump(exclude_none=True, exclude={'id', 'assigned_cafe_id'})
 
             try:
-                self.employee_repository.update_employee(
+                # Unknown employees surface as NoResultFound and unknown cafes as DomainException,
+                # both from the single update statement.
+                employee = self.employee_repository.update_employee(
                     employee_id = command.id,
                     employee_data = employee_data,
                     cafe_id = command.assigned_cafe_id
                 )
+                if self.version_repository:
+                    self.version_repository.bump(EMPLOYEES_RESOURCE, CAFES_RESOURCE)
+                # Cafe listings only show headcounts, which change at the previous and the new cafe on a move.
+                if self.cafe_cache and employee['reassigned']:
+                    self.cafe_cache.invalidate_locations([employee['previous_location'], employee['cafe_location']])
+            except (NoResultFound, DomainException):
+                raise
             except IntegrityError as e: 
                 raise DomainException("Failed to update employee due to data conflict (e.g., duplicate email/phone).")        
             except Exception as e:
@@ -116,14 +182,240 @@ class UpdateEmployeeCommandHandler:
                 raise DomainException("Failed to update the employee due to an unexpected internal error.")
             
 class DeleteEmployeeCommandHandler:
-    def __init__(self, employee_repository: IEmployeeRepository):
+    def __init__(self, employee_repository: IEmployeeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
         self.employee_repository =  employee_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
 
     def handle(self, command: DeleteEmployeeCommand):
         try:
-            self.employee_repository.delete_employee(command.id)
+            employee = self.employee_repository.delete_employee(command.id)
+            if self.version_repository:
+                self.version_repository.bump(EMPLOYEES_RESOURCE, CAFES_RESOURCE)
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_locations([employee['cafe_location']])
         except NoResultFound:
             raise NoResultFound(f"Employee with ID {command.id} not found.")
         except Exception as e:
             print(f"Error deleting employee: {e}")
-            raise DomainException("Failed to delete the employee.")
\ No newline at end of file
+            raise DomainException("Failed to delete the employee.")
+
+
+def validate_rows(rows: List[Dict[str, Any]], model: Type[BaseModel]) -> Tuple[List[Tuple[int, BaseModel]], List[Dict[str, Any]]]:
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, model(**row)))
+        except ValidationError as e:
+            messages = [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            errors.append({"row": index, "errors": messages})
+        except TypeError:
+            errors.append({"row": index, "errors": ["Row must be an object"]})
+    return valid, errors
+
+def import_summary(total: int, created: list, errors: list, started: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    return {
+        "total": total,
+        "created": created,
+        "errors": sorted(errors, key=lambda error: error["row"]),
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_second": round(len(created) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+class BulkCreateCafesCommandHandler:
+    def __init__(self, cafe_repository: ICafeRepository, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
+        self.cafe_repository = cafe_repository
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
+
+    def handle(self, command: BulkCreateCafesCommand) -> Dict[str, Any]:
+        started = time.perf_counter()
+        valid, errors = validate_rows(command.rows, CreateCafeCommand)
+
+        created = []
+        if valid:
+            try:
+                cafe_ids = self.cafe_repository.add_cafes([cafe.model_dump(exclude_none=True) for _, cafe in valid])
+            except IntegrityError as e:
+                raise DomainException(f"Failed to import cafes due to integrity error {e.orig}")
+            created = [{"row": index, "id": cafe_id} for (index, _), cafe_id in zip(valid, cafe_ids)]
+
+            if self.version_repository:
+                self.version_repository.bump(CAFES_RESOURCE)
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_all()
+
+        return import_summary(len(command.rows), created, errors, started)
+
+class BulkCreateEmployeesCommandHandler:
+    def __init__(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator, cafe_cache: Optional[CafeListCache] = None, version_repository: Optional[IVersionRepository] = None):
+        self.employee_repository = employee_repository
+        self.cafe_repository = cafe_repository
+        self.employee_id_generator = employee_id_generator
+        self.cafe_cache = cafe_cache
+        self.version_repository = version_repository
+
+    def handle(self, command: BulkCreateEmployeesCommand) -> Dict[str, Any]:
+        started = time.perf_counter()
+        valid, errors = validate_rows(command.rows, CreateEmployeeCommand)
+
+        # Resolve every referenced cafe with a single query.
+        cafe_ids = {employee.assigned_cafe_id for _, employee in valid if employee.assigned_cafe_id}
+        existing_cafe_ids = self.cafe_repository.get_existing_cafe_ids(cafe_ids) if cafe_ids else set()
+        accepted = []
+        for index, employee in valid:
+            if employee.assigned_cafe_id and employee.assigned_cafe_id not in existing_cafe_ids:
+                errors.append({"row": index, "errors": [f"Assigned Cafe ID {employee.assigned_cafe_id} does not exist"]})
+            else:
+                accepted.append((index, employee))
+
+        created = []
+        if accepted:
+            employee_ids = self.employee_id_generator.generate_employee_ids(len(accepted))
+            employees = [
+                (employee_id, employee.model_dump(exclude_none=True, exclude={'assigned_cafe_id'}), employee.assigned_cafe_id)
+                for employee_id, (_, employee) in zip(employee_ids, accepted)
+            ]
+            try:
+                self.employee_repository.add_employees(employees)
+            except IntegrityError as e:
+                raise DomainException(f"Failed to import employees due to integrity error {e.orig}")
+            created = [{"row": index, "id": employee_id} for employee_id, (index, _) in zip(employee_ids, accepted)]
+
+            if self.version_repository:
+                self.version_repository.bump(EMPLOYEES_RESOURCE, CAFES_RESOURCE)
+            if self.cafe_cache:
+                self.cafe_cache.invalidate_all()
+
+        return import_summary(len(command.rows), created, errors, started)
+
+# Status reported per batch operation, as the single-resource routes would answer.
+BATCH_SUCCESS_STATUS = {'create': 201, 'update': 200, 'delete': 204}
+# Reported for the other operations of an all-or-nothing batch that failed.
+NOT_APPLIED_STATUS = 424
+
+def parse_batch_operation(operation: Any) -> BaseModel:
+    if not isinstance(operation, dict):
+        raise ValueError("Operation must be an object")
+    command_type = BATCH_COMMANDS.get((operation.get('resource'), operation.get('op')))
+    if command_type is None:
+        raise ValueError(f"Unknown operation {operation.get('op')!r} on {operation.get('resource')!r}; expected create, update or delete on cafe or employee")
+    data = operation.get('data') or {}
+    if not isinstance(data, dict):
+        raise ValueError("data must be an object")
+    if operation['op'] == 'create':
+        return command_type(**data)
+    return command_type(**{**data, 'id': operation.get('id')})
+
+def batch_error(e: Exception) -> Tuple[int, str]:
+    if isinstance(e, ValidationError):
+        return 400, "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+    if isinstance(e, NoResultFound):
+        return 404, str(e)
+    if isinstance(e, IntegrityError):
+        return 400, f"Integrity error: {e.orig}"
+    return 400, str(e)
+
+class BatchCommandHandler:
+    """
+    Runs a list of create, update and delete operations through the regular
+    command handlers in the caller's transaction (TransactionBehavior commits
+    it once at the end). Every cafe the batch refers to is looked up with one
+    query beforehand, so unknown ids fail without touching the handlers.
+    """
+
+    def __init__(self, handlers: Dict[type, Any], cafe_repository: ICafeRepository, savepoint: Callable[[], ContextManager]):
+        self.handlers = handlers
+        self.cafe_repository = cafe_repository
+        self.savepoint = savepoint
+
+    def handle(self, command: BatchCommand) -> Dict[str, Any]:
+        started = time.perf_counter()
+        operations = command.operations
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+
+        commands = []
+        for index, operation in enumerate(operations):
+            try:
+                commands.append((index, parse_batch_operation(operation)))
+            except (ValidationError, TypeError, ValueError) as e:
+                results[index] = self._failure(index, operation, *batch_error(e))
+        commands = self._check_cafes(commands, operations, results)
+
+        all_or_nothing = command.mode == 'all_or_nothing'
+        if all_or_nothing and any(results):
+            self._abort(command, results, started)
+
+        for index, request in commands:
+            operation = operations[index]
+            handler = self.handlers[type(request)]
+            try:
+                if all_or_nothing:
+                    outcome = handler.handle(request)
+                else:
+                    # A failed operation only rolls back to its own savepoint.
+                    with self.savepoint():
+                        outcome = handler.handle(request)
+            except (DomainException, NoResultFound, IntegrityError) as e:
+                results[index] = self._failure(index, operation, *batch_error(e))
+                if all_or_nothing:
+                    self._abort(command, results, started)
+                continue
+            except SQLAlchemyError as e:
+                if all_or_nothing:
+                    raise
+                # The savepoint has been rolled back, so the operations before and after this one still stand.
+                print(f"Batch operation {index} failed: {e}")
+                results[index] = self._failure(index, operation, 500, f"Database error: {str(getattr(e, 'orig', None) or e).strip()}")
+                continue
+            result_id = outcome if operation['op'] == 'create' else request.id
+            results[index] = {"index": index, "op": operation['op'], "resource": operation['resource'], "status": BATCH_SUCCESS_STATUS[operation['op']], "id": result_id}
+
+        return self._summary(command, results, started)
+
+    def _check_cafes(self, commands: List[Tuple[int, BaseModel]], operations: List[Any], results: List[Optional[Dict[str, Any]]]) -> List[Tuple[int, BaseModel]]:
+        def referenced_cafe(request: BaseModel) -> Optional[UUID]:
+            if isinstance(request, (UpdateCafeCommand, DeleteCafeCommand)):
+                return request.id
+            return getattr(request, 'assigned_cafe_id', None)
+
+        cafe_ids = {referenced_cafe(request) for _, request in commands} - {None}
+        existing_cafe_ids = self.cafe_repository.get_existing_cafe_ids(cafe_ids) if cafe_ids else set()
+
+        accepted = []
+        for index, request in commands:
+            cafe_id = referenced_cafe(request)
+            if cafe_id is None or cafe_id in existing_cafe_ids:
+                accepted.append((index, request))
+            elif isinstance(request, (UpdateCafeCommand, DeleteCafeCommand)):
+                results[index] = self._failure(index, operations[index], 404, f"Cafe with ID {cafe_id} not found.")
+            else:
+                results[index] = self._failure(index, operations[index], 400, f"Assigned Cafe ID {cafe_id} does not exist")
+        return accepted
+
+    @staticmethod
+    def _failure(index: int, operation: Any, status: int, error: str) -> Dict[str, Any]:
+        op, resource = (operation.get('op'), operation.get('resource')) if isinstance(operation, dict) else (None, None)
+        return {"index": index, "op": op, "resource": resource, "status": status, "error": error}
+
+    def _abort(self, command: BatchCommand, results: List[Optional[Dict[str, Any]]], started: float) -> None:
+        failed = next(result for result in results if result and 'error' in result)
+        for index, result in enumerate(results):
+            if result is None or 'error' not in result:
+                op, resource = (result['op'], result['resource']) if result else (command.operations[index].get('op'), command.operations[index].get('resource'))
+                results[index] = {"index": index, "op": op, "resource": resource, "status": NOT_APPLIED_STATUS, "error": f"Not applied: operation {failed['index']} failed"}
+        summary = self._summary(command, results, started)
+        raise BatchAbortedException(f"Batch rolled back: operation {failed['index']} failed: {failed['error']}", summary, failed['status'])
+
+    @staticmethod
+    def _summary(command: BatchCommand, results: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+        succeeded = sum(1 for result in results if 'error' not in result)
+        return {
+            "mode": command.mode,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
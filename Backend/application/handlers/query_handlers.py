@@ -1,24 +1,151 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from uuid import UUID
+from datetime import date
 
 from application.queries.get_cafe_query import GetCafeQuery
-from application.queries.get_employees_query import GetEmployeesQuery
+from application.queries.get_employees_query import EMPLOYEE_FIELDS, GetEmployeesQuery
+from application.queries.search_query import SearchCafesQuery, SearchEmployeesQuery
+from application.queries.pagination import build_page, decode_cursor, project
 
 from application.interfaces.cafe_repository import ICafeRepository
 from application.interfaces.employee_repository import IEmployeeRepository
+from application.interfaces.search_repository import ISearchRepository
+
+def cafe_cursor_key(row: Dict[str, Any]) -> List[Any]:
+    return [row['employees'], str(row['id'])]
+
+def employee_cursor_key(row: Dict[str, Any]) -> List[Any]:
+    start_date = row['start_date']
+    return [start_date.isoformat() if start_date else None, row['id']]
+
+def decode_cafe_cursor(cursor: Optional[str]) -> Optional[Tuple[int, UUID]]:
+    if not cursor:
+        return None
+    try:
+        employees, cafe_id = decode_cursor(cursor)
+        return int(employees), UUID(cafe_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+
+def decode_employee_cursor(cursor: Optional[str]) -> Optional[Tuple[Optional[date], str]]:
+    if not cursor:
+        return None
+    try:
+        start_date, employee_id = decode_cursor(cursor)
+        return (date.fromisoformat(start_date) if start_date is not None else None), str(employee_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+
+def search_cursor_key(row: Dict[str, Any]) -> List[Any]:
+    return [row['score'], str(row['id'])]
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    if not cursor:
+        return None
+    try:
+        score, row_id = decode_cursor(cursor)
+        return float(score), str(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+
+def employee_fields(query: GetEmployeesQuery) -> Optional[List[str]]:
+    # Keyset pages also select start_date for the next cursor; it is not part of the representation.
+    return query.fields or (EMPLOYEE_FIELDS if query.is_paginated else None)
+
+def fetch_size(page_size: Optional[int]) -> Optional[int]:
+    # One extra row tells us whether there is a next page.
+    return page_size + 1 if page_size else None
 
 class GetCafesQueryHandler:
+    # Listings are cached by the mediator's CachingBehavior, which uses CafeListCache.
     def __init__(self, cafe_repository: ICafeRepository):
         self.cafe_repository = cafe_repository
 
-    def handle(self, query: GetCafeQuery) -> List[Dict[str, Any]]:
-        cafes_data = self.cafe_repository.get_all_cafes(location = query.location)
-        return cafes_data
+    def handle(self, query: GetCafeQuery) -> Dict[str, Any]:
+        cafes_data = self.cafe_repository.get_all_cafes(
+            location = query.location,
+            limit = fetch_size(query.page_size),
+            after = decode_cafe_cursor(query.cursor),
+            fields = query.fields
+        )
+        return build_page(cafes_data, query.page_size, cafe_cursor_key, query.fields)
+
+    def stream(self, query: GetCafeQuery) -> Iterator[Dict[str, Any]]:
+        cafes_data = self.cafe_repository.iter_all_cafes(
+            location = query.location,
+            limit = query.limit,
+            after = decode_cafe_cursor(query.cursor),
+            fields = query.fields
+        )
+        return project(cafes_data, query.fields)
+
+    async def handle_async(self, query: GetCafeQuery) -> Dict[str, Any]:
+        cafes_data = await self.cafe_repository.get_all_cafes_async(
+            location = query.location,
+            limit = fetch_size(query.page_size),
+            after = decode_cafe_cursor(query.cursor),
+            fields = query.fields
+        )
+        return build_page(cafes_data, query.page_size, cafe_cursor_key, query.fields)
         
 
 class GetEmployeesQueryHandler:
     def __init__(self, employee_repository: IEmployeeRepository):
         self.employee_repository = employee_repository
 
-    def handle(self, query: GetEmployeesQuery) -> List[Dict[str, Any]]:
-        employees_data = self.employee_repository.get_all_employees(cafe_name = query.cafe_name)
-        return employees_data
\ No newline at end of file
+    def handle(self, query: GetEmployeesQuery) -> Dict[str, Any]:
+        employees_data = self.employee_repository.get_all_employees(
+            cafe_name = query.cafe_name,
+            limit = fetch_size(query.page_size),
+            after = decode_employee_cursor(query.cursor),
+            fields = query.fields
+        )
+        return build_page(employees_data, query.page_size, employee_cursor_key, employee_fields(query))
+
+    def stream(self, query: GetEmployeesQuery) -> Iterator[Dict[str, Any]]:
+        employees_data = self.employee_repository.iter_all_employees(
+            cafe_name = query.cafe_name,
+            limit = query.limit,
+            after = decode_employee_cursor(query.cursor),
+            fields = query.fields
+        )
+        return project(employees_data, employee_fields(query))
+
+    async def handle_async(self, query: GetEmployeesQuery) -> Dict[str, Any]:
+        employees_data = await self.employee_repository.get_all_employees_async(
+            cafe_name = query.cafe_name,
+            limit = fetch_size(query.page_size),
+            after = decode_employee_cursor(query.cursor),
+            fields = query.fields
+        )
+        return build_page(employees_data, query.page_size, employee_cursor_key, employee_fields(query))
+
+class SearchEmployeesQueryHandler:
+    def __init__(self, search_repository: ISearchRepository):
+        self.search_repository = search_repository
+
+    def handle(self, query: SearchEmployeesQuery) -> Dict[str, Any]:
+        employees_data = self.search_repository.search_employees(
+            term = query.q,
+            limit = fetch_size(query.limit),
+            after = decode_search_cursor(query.cursor)
+        )
+        return build_page(employees_data, query.limit, search_cursor_key)
+
+class SearchCafesQueryHandler:
+    def __init__(self, search_repository: ISearchRepository):
+        self.search_repository = search_repository
+
+    def handle(self, query: SearchCafesQuery) -> Dict[str, Any]:
+        after = decode_search_cursor(query.cursor)
+        if after:
+            try:
+                after = (after[0], UUID(after[1]))
+            except ValueError:
+                raise ValueError("Invalid pagination cursor.")
+        cafes_data = self.search_repository.search_cafes(
+            term = query.q,
+            limit = fetch_size(query.limit),
+            after = after
+        )
+        return build_page(cafes_data, query.limit, search_cursor_key)
@@ -0,0 +1,47 @@
+from typing import Any, Callable, Dict, List
+
+from application.commands.create_cafe_command import CreateCafeCommand
+from application.commands.update_cafe_command import UpdateCafeCommand
+from application.commands.delete_cafe_command import DeleteCafeCommand
+from application.commands.upload_logo_command import UploadLogoCommand
+from application.commands.create_employee_command import CreateEmployeeCommand
+from application.commands.update_employee_command import UpdateEmployeeCommand
+from application.commands.delete_employee_command import DeleteEmployeeCommand
+from application.commands.bulk_import_command import BulkCreateCafesCommand, BulkCreateEmployeesCommand
+from application.commands.batch_command import BatchCommand
+from application.queries.get_cafe_query import GetCafeQuery
+from application.queries.get_employees_query import GetEmployeesQuery
+from application.queries.search_query import SearchCafesQuery, SearchEmployeesQuery
+
+from application.handlers.command_handlers import CreateCafeCommandHandler, UpdateCafeCommandHandler, DeleteCafeCommandHandler, UploadLogoCommandHandler, CreateEmployeeCommandHandler, UpdateEmployeeCommandHandler, DeleteEmployeeCommandHandler, BulkCreateCafesCommandHandler, BulkCreateEmployeesCommandHandler, BatchCommandHandler
+from application.handlers.query_handlers import GetCafesQueryHandler, GetEmployeesQueryHandler, SearchCafesQueryHandler, SearchEmployeesQueryHandler, decode_cafe_cursor, decode_employee_cursor, decode_search_cursor
+
+# Request type -> handler type. The mediator resolves each handler once at startup.
+COMMAND_HANDLERS: Dict[type, type] = {
+    CreateCafeCommand: CreateCafeCommandHandler,
+    UpdateCafeCommand: UpdateCafeCommandHandler,
+    DeleteCafeCommand: DeleteCafeCommandHandler,
+    UploadLogoCommand: UploadLogoCommandHandler,
+    BulkCreateCafesCommand: BulkCreateCafesCommandHandler,
+    CreateEmployeeCommand: CreateEmployeeCommandHandler,
+    UpdateEmployeeCommand: UpdateEmployeeCommandHandler,
+    DeleteEmployeeCommand: DeleteEmployeeCommandHandler,
+    BulkCreateEmployeesCommand: BulkCreateEmployeesCommandHandler,
+    BatchCommand: BatchCommandHandler,
+}
+
+QUERY_HANDLERS: Dict[type, type] = {
+    GetCafeQuery: GetCafesQueryHandler,
+    GetEmployeesQuery: GetEmployeesQueryHandler,
+    SearchCafesQuery: SearchCafesQueryHandler,
+    SearchEmployeesQuery: SearchEmployeesQueryHandler,
+}
+
+# Checks that need more than the request model's own fields, run before the
+# handler (and before any cached result is returned). They raise ValueError.
+REQUEST_VALIDATORS: Dict[type, List[Callable[[Any], None]]] = {
+    GetCafeQuery: [lambda query: decode_cafe_cursor(query.cursor)],
+    GetEmployeesQuery: [lambda query: decode_employee_cursor(query.cursor)],
+    SearchCafesQuery: [lambda query: decode_search_cursor(query.cursor)],
+    SearchEmployeesQuery: [lambda query: decode_search_cursor(query.cursor)],
+}
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+class ICache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
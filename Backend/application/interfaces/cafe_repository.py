@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
 
 class ICafeRepository(ABC):
     @abstractmethod
-    def get_all_cafes(self, location: Optional[str] = None) -> List[dict]:
+    def get_all_cafes(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def iter_all_cafes(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    async def get_all_cafes_async(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> List[dict]:
         pass
 
     @abstractmethod
@@ -15,11 +23,21 @@ class ICafeRepository(ABC):
     def add_cafe(self, cafe_data: dict) -> dict:
         pass
 
+    @abstractmethod
+    def add_cafes(self, cafes_data: List[dict]) -> List[UUID]:
+        pass
+
+    @abstractmethod
+    def get_existing_cafe_ids(self, cafe_ids: Iterable[UUID]) -> Set[UUID]:
+        pass
+
     @abstractmethod
     def update_cafe(self, cafe_id: UUID, cafe_data: dict) -> dict:
+        """Returns the cafe's previous_location and location."""
         pass
 
     @abstractmethod
-    def delete_cafe(self, cafe_id: UUID) -> None:
+    def delete_cafe(self, cafe_id: UUID) -> dict:
+        """Returns the deleted cafe's location."""
         pass
 
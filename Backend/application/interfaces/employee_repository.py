@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import date
+from uuid import UUID
 
 class IEmployeeRepository(ABC):
     @abstractmethod
-    def get_all_employees(self, cafe_name: str) -> List[dict]:
+    def get_all_employees(self, cafe_name: str, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def iter_all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    async def get_all_employees_async(self, cafe_name: str, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
         pass
 
     @abstractmethod
@@ -12,15 +21,21 @@ class IEmployeeRepository(ABC):
         pass
 
     @abstractmethod
-    def add_employee(self, employee_data: dict) -> dict:
+    def add_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
         pass
 
     @abstractmethod
-    def update_employee(self, employee_id: str, employee_data: dict) -> dict:
+    def add_employees(self, employees: List[Tuple[str, dict, Optional[UUID]]]) -> List[str]:
         pass
 
     @abstractmethod
-    def delete_employee(self, employee_id: str) -> None:
+    def update_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
+        """Returns whether the employee was reassigned, with the previous_location and cafe_location (None when unassigned)."""
+        pass
+
+    @abstractmethod
+    def delete_employee(self, employee_id: str) -> dict:
+        """Returns the location of the cafe the employee was assigned to (None when unassigned)."""
         pass
 
     @abstractmethod
@@ -29,4 +44,8 @@ class IEmployeeRepository(ABC):
 
     @abstractmethod
     def get_last_employee_id(self) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def allocate_employee_numbers(self, count: int = 1) -> List[int]:
         pass
\ No newline at end of file
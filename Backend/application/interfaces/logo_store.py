@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+
+class ILogoStore(ABC):
+    """Content-addressed storage for uploaded cafe logos."""
+
+    max_bytes: int
+
+    @abstractmethod
+    def store(self, stream: BinaryIO, declared_length: Optional[int] = None) -> dict:
+        """
+        Stores the image read from stream and returns its key, url, sha256,
+        size, content_type, variants (key, url, width and content_type of each
+        resized or converted copy) and whether the content already existed.
+        Variants are written in the background, so their urls can 404 briefly.
+        """
+        pass
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+class ISearchRepository(ABC):
+    """
+    Ranked type-ahead search. Results carry a 'score' (higher is better) and
+    are ordered by (score, id) descending; after is the last (score, id) seen.
+    """
+    @abstractmethod
+    def search_employees(self, term: str, limit: int, after: Optional[Tuple[float, str]] = None) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def search_cafes(self, term: str, limit: int, after: Optional[Tuple[float, UUID]] = None) -> List[dict]:
+        pass
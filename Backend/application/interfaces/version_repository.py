@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Tuple
+
+CAFES_RESOURCE = 'cafes'
+EMPLOYEES_RESOURCE = 'employees'
+
+class IVersionRepository(ABC):
+    """Monotonic change counters for list resources, bumped in the same transaction as each write."""
+
+    @abstractmethod
+    def get_version(self, resource: str) -> Tuple[int, datetime]:
+        pass
+
+    @abstractmethod
+    async def get_version_async(self, resource: str) -> Tuple[int, datetime]:
+        pass
+
+    @abstractmethod
+    def bump(self, *resources: str) -> None:
+        pass
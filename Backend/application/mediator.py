@@ -1,16 +1,81 @@
-from injector import Injector
-from typing import Any, Type
+from typing import Any, Awaitable, Callable, Dict, Iterable, Sequence
+
+Handler = Callable[[Any], Any]
+AsyncHandler = Callable[[Any], Awaitable[Any]]
+
+class PipelineBehavior:
+    """
+    Runs around the handlers of the request types it applies to. Call
+    next_handler(request) to continue down the pipeline, or return early
+    to short-circuit it.
+    """
+
+    def applies_to(self, request_type: type) -> bool:
+        return True
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        return next_handler(request)
+
+    async def handle_async(self, request: Any, next_handler: AsyncHandler) -> Any:
+        return await next_handler(request)
+
+def _wrap(behavior: PipelineBehavior, next_handler: Handler) -> Handler:
+    def step(request: Any) -> Any:
+        return behavior.handle(request, next_handler)
+    return step
+
+def _wrap_async(behavior: PipelineBehavior, next_handler: AsyncHandler) -> AsyncHandler:
+    async def step(request: Any) -> Any:
+        return await behavior.handle_async(request, next_handler)
+    return step
 
 class Mediator:
-    def __init__(self, injector: Injector):
-        self.injector = injector
-    
-    def send(self, command: Any) -> Any:
-        command_name = command.__class__.__name__
-        handler_name = command_name.replace("Command", "CommandHandler").replace("Query", "QueryHandler")
-        return self._get_handler_type(command_name, handler_name)
-    
-    def _get_handler_type(self, command_name: Any, handler_name: Any) -> Type[Any]:
-        
-        handler = self.injector.get(handler_name)
-        return handler.handle(command_name)
\ No newline at end of file
+    """
+    Dispatches commands and queries to their handlers by exact type. The
+    pipeline for each request type (its handler wrapped in the behaviors that
+    apply to it, first behavior outermost) is composed once when the mediator
+    is built, so send is a dict lookup and a call.
+    """
+
+    def __init__(self, handlers: Dict[type, Any], behaviors: Sequence[PipelineBehavior] = ()):
+        self.handlers = dict(handlers)
+        self.behaviors = list(behaviors)
+        self._pipelines: Dict[type, Handler] = {}
+        self._async_pipelines: Dict[type, AsyncHandler] = {}
+        for request_type, handler in self.handlers.items():
+            self._compile(request_type, handler)
+
+    def _compile(self, request_type: type, handler: Any) -> None:
+        behaviors = [behavior for behavior in self.behaviors if behavior.applies_to(request_type)]
+
+        pipeline = handler.handle
+        for behavior in reversed(behaviors):
+            pipeline = _wrap(behavior, pipeline)
+        self._pipelines[request_type] = pipeline
+
+        if hasattr(handler, 'handle_async'):
+            async_pipeline = handler.handle_async
+            for behavior in reversed(behaviors):
+                async_pipeline = _wrap_async(behavior, async_pipeline)
+            self._async_pipelines[request_type] = async_pipeline
+
+    def send(self, request: Any) -> Any:
+        try:
+            pipeline = self._pipelines[type(request)]
+        except KeyError:
+            raise LookupError(f"No handler registered for {type(request).__name__}")
+        return pipeline(request)
+
+    async def send_async(self, request: Any) -> Any:
+        try:
+            pipeline = self._async_pipelines[type(request)]
+        except KeyError:
+            raise LookupError(f"No async handler registered for {type(request).__name__}")
+        return await pipeline(request)
+
+    def handler_for(self, request_type: type) -> Any:
+        """The registered handler itself, for calls outside the pipeline (e.g. streaming)."""
+        return self.handlers[request_type]
+
+    def request_types(self) -> Iterable[type]:
+        return self.handlers.keys()
@@ -1,5 +1,27 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+
+from application.queries.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields
+
+EMPLOYEE_FIELDS = ['id', 'name', 'email_address', 'phone_number', 'gender', 'days_worked', 'cafe_id', 'cafe_name']
+EMPLOYEE_SORT_KEYS = ['start_date', 'id']
 
 class GetEmployeesQuery(BaseModel):
-    cafe_name: Optional[str] = Field(default=None)
\ No newline at end of file
+    cafe_name: Optional[str] = Field(default=None)
+    limit: Optional[int] = Field(default=None, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = Field(default=None)
+    fields: Optional[List[str]] = Field(default=None)
+
+    @field_validator('fields', mode='before')
+    def validate_fields(cls, v):
+        return parse_fields(v, EMPLOYEE_FIELDS)
+
+    @property
+    def is_paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+    @property
+    def page_size(self) -> Optional[int]:
+        if not self.is_paginated:
+            return None
+        return self.limit or DEFAULT_PAGE_SIZE
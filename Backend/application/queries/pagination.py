@@ -0,0 +1,52 @@
+import base64
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid pagination cursor.")
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor.")
+    return values
+
+def parse_fields(value: Any, allowed: List[str]) -> Optional[List[str]]:
+    if value is None or value == '':
+        return None
+    fields = [field.strip() for field in value.split(',')] if isinstance(value, str) else list(value)
+    fields = [field for field in fields if field]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}")
+    return fields or None
+
+def build_page(rows: List[Dict[str, Any]], limit: Optional[int], cursor_key: Callable[[Dict[str, Any]], List[Any]], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Trims a list fetched with limit + 1 rows to a page and derives the cursor
+    for the next page from the last row's sort key.
+    """
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(cursor_key(rows[-1]))
+
+    if fields:
+        rows = [{field: row[field] for field in fields} for row in rows]
+
+    return {"items": rows, "next_cursor": next_cursor}
+
+def project(rows: Iterable[Dict[str, Any]], fields: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+    if not fields:
+        yield from rows
+        return
+    for row in rows:
+        yield {field: row[field] for field in fields}
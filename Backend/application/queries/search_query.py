@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+
+from application.queries.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+MAX_SEARCH_TERM_LENGTH = 100
+
+class SearchQuery(BaseModel):
+    q: str = Field(min_length=1, max_length=MAX_SEARCH_TERM_LENGTH)
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = Field(default=None)
+
+    @field_validator('q', mode='before')
+    def validate_q(cls, v):
+        return ' '.join(v.split()) if isinstance(v, str) else v
+
+class SearchEmployeesQuery(SearchQuery):
+    pass
+
+class SearchCafesQuery(SearchQuery):
+    pass
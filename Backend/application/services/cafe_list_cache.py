@@ -0,0 +1,99 @@
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from application.interfaces.cache import ICache
+from application.queries.get_cafe_query import GetCafeQuery
+
+ALL_LOCATIONS = '*'
+
+class CafeListCache:
+    """
+    Read-through cache for cafe listings keyed by location and page.
+
+    Entries are never deleted one by one. Every key embeds a global generation
+    and a per-location generation, and invalidation bumps a generation so the
+    old entries are simply never read again and age out via TTL/LRU. Bumps are
+    deferred until the writing transaction commits. When listings are read from
+    a replica, each bump is repeated replica_lag seconds later: a page loaded
+    from a replica that had not replayed the write yet was stored under the
+    new generation, and the second bump retires it.
+    """
+
+    def __init__(self, cache: ICache, ttl: Optional[float] = None, after_commit: Optional[Callable[[Callable[[], None]], None]] = None, replica_lag: Optional[float] = None):
+        self.cache = cache
+        self.ttl = ttl
+        self.after_commit = after_commit
+        self.replica_lag = replica_lag
+
+    def get_or_load(self, query: GetCafeQuery, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        # The key (and so the generations) is read before the database: a page
+        # loaded while a write commits is stored under the generation that
+        # write retires, never under the new one.
+        key = self._key(query)
+        page = self.cache.get(key)
+        if page is None:
+            page = load()
+            self.cache.set(key, page, ttl=self.ttl)
+        return page
+
+    async def get_or_load_async(self, query: GetCafeQuery, load: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        key = self._key(query)
+        page = self.cache.get(key)
+        if page is None:
+            page = await load()
+            self.cache.set(key, page, ttl=self.ttl)
+        return page
+
+    def invalidate_location(self, location: Optional[str]) -> None:
+        if not location:
+            return self.invalidate_all()
+        self.invalidate_locations([location])
+
+    def invalidate_locations(self, locations: Iterable[Optional[str]]) -> None:
+        """Retires the listings of each location and the unfiltered listing; None (no cafe) is skipped."""
+        locations = {location for location in locations if location}
+        if not locations:
+            return
+
+        def bump():
+            for location in locations:
+                self.cache.incr(self._generation_key(location))
+            self.cache.incr(self._generation_key(ALL_LOCATIONS))
+        self._defer(bump)
+
+    def invalidate_all(self) -> None:
+        self._defer(lambda: self.cache.incr(self._generation_key(None)))
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    def _defer(self, bump: Callable[[], None]) -> None:
+        # Runs after the write has committed, so a cache outage must not turn it into an error.
+        def safe_bump():
+            try:
+                bump()
+            except Exception as e:
+                print(f"Cafe cache invalidation failed; cached listings may be stale until their TTL: {e}")
+
+        def bump_now_and_after_replica_lag():
+            safe_bump()
+            if self.replica_lag:
+                timer = threading.Timer(self.replica_lag, safe_bump)
+                timer.daemon = True
+                timer.start()
+
+        if self.after_commit:
+            self.after_commit(bump_now_and_after_replica_lag)
+        else:
+            bump_now_and_after_replica_lag()
+
+    def _generation_key(self, location: Optional[str]) -> str:
+        return f"cafes:generation:{location}" if location else "cafes:generation"
+
+    def _key(self, query: GetCafeQuery) -> str:
+        location = query.location or ALL_LOCATIONS
+        global_generation = self.cache.get_counter(self._generation_key(None))
+        location_generation = self.cache.get_counter(self._generation_key(location))
+        page = json.dumps([query.page_size, query.cursor, query.fields], separators=(',', ':'))
+        return f"cafes:{global_generation}:{location}:{location_generation}:{page}"
@@ -1,5 +1,4 @@
-from typing import Optional, List
-from sqlalchemy import Integer
+from typing import List
 from application.interfaces.employee_repository import IEmployeeRepository
 
 class EmployeeIDGenerator:
@@ -10,10 +9,14 @@ class EmployeeIDGenerator:
         self.employee_repository = employee_repository
 
     def generate_employee_id(self) -> str:
-        last_id = self.employee_repository.get_last_employee_id()
+        return self.generate_employee_ids(1)[0]
 
-        next_id = last_id + 1
-        id_num = str(next_id).zfill(self.PADDING)
+    def generate_employee_ids(self, count: int) -> List[str]:
+        numbers = self.employee_repository.allocate_employee_numbers(count)
+        return [self.format_employee_id(number) for number in numbers]
+
+    def format_employee_id(self, number: int) -> str:
+        id_num = str(number).zfill(self.PADDING)
         if (len(id_num)) > self.PADDING:
             raise OverflowError("Employee ID limit reached.")
     
@@ -0,0 +1,7 @@
+from api.app import create_app
+from api.async_routes import AsyncReadApp
+
+# ASGI entry point: GET /cafes and GET /employees run on the event loop, writes
+# go through the Flask app. Serve with
+# `GUNICORN_APP=asgi:app GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c gunicorn.conf.py`.
+app = AsyncReadApp(create_app(init_db=False))
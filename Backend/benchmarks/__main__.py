@@ -0,0 +1,126 @@
+"""
+Performance suite for the backend. Run from the Backend directory:
+
+    python -m benchmarks seed --cafes 500 --employees 20000
+    python -m benchmarks repositories --iterations 50 --output repos.json
+    python -m benchmarks http --requests 200 --concurrency 8 --output http.json --baseline http-main.json
+    python -m benchmarks search --p95-ms 50
+    python -m benchmarks serialization --employees 10000
+    python -m benchmarks dispatch --iterations 20000
+    python -m benchmarks coldstart --runs 5
+    python -m benchmarks compare http-main.json http.json --max-regression 0.2
+
+Targets DATABASE_URL (e.g. the docker-compose Postgres), or an embedded
+Postgres with --embedded DIR (needs the optional pgserver package). Seeding
+and the HTTP write routes change data, so use a scratch database.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.environment import prepare_database
+
+def add_result_options(parser):
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Fail if results regress against this JSON file")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 / throughput regression as a fraction")
+
+def finish(kind: str, results: dict, args, meta: dict) -> int:
+    from benchmarks.compare import find_regressions
+    from benchmarks.stats import print_table, save_results
+
+    print_table(results)
+    meta = {**meta, "python": platform.python_version(), "started_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if args.output:
+        save_results(args.output, kind, results, meta)
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if getattr(args, "only", None):
+        baseline["results"] = {name: summary for name, summary in baseline["results"].items() if name in results}
+    regressions = find_regressions(baseline, {"results": results}, args.max_regression)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embedded", metavar="DIR", help="Run against an embedded Postgres kept in DIR instead of DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Insert synthetic cafes and employees")
+    seed_parser.add_argument("--cafes", type=int, default=500)
+    seed_parser.add_argument("--employees", type=int, default=20000)
+    seed_parser.add_argument("--random-seed", type=int, default=42)
+
+    repositories_parser = commands.add_parser("repositories", help="Time each repository method")
+    repositories_parser.add_argument("--iterations", type=int, default=50)
+    repositories_parser.add_argument("--warmup", type=int, default=5)
+    add_result_options(repositories_parser)
+
+    http_parser = commands.add_parser("http", help="Load every HTTP route")
+    http_parser.add_argument("--url", help="Base URL of a running server; by default the app is served in-process")
+    http_parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    http_parser.add_argument("--concurrency", type=int, default=8)
+    http_parser.add_argument("--only", action="append", help="Only routes whose name contains this (repeatable)")
+    add_result_options(http_parser)
+
+    commands.add_parser("search", help="Search latency against a p95 target (see benchmarks.search_benchmark)", add_help=False)
+    commands.add_parser("dispatch", help="Per-request handler dispatch overhead (see benchmarks.dispatch_benchmark)", add_help=False)
+    commands.add_parser("coldstart", help="Server spawn to ready and first request (see benchmarks.coldstart_benchmark)", add_help=False)
+    commands.add_parser("serialization", help="JSON encoding and compression of a large employee list (see benchmarks.serialization_benchmark)", add_help=False)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--max-regression", type=float, default=0.2)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "compare":
+        from benchmarks import compare
+        return compare.main([args.baseline, args.current, "--max-regression", str(args.max_regression)])
+    if rest and args.command not in ("search", "serialization", "dispatch", "coldstart"):
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    if args.command == "serialization":
+        # Synthetic rows only, so no database is prepared.
+        from benchmarks import serialization_benchmark
+        return serialization_benchmark.main(rest)
+
+    # DATABASE_URL has to be settled before any application module is imported.
+    prepare_database(args.embedded)
+
+    if args.command == "seed":
+        from benchmarks.seed import seed
+        started = time.perf_counter()
+        seed(cafes=args.cafes, employees=args.employees, random_seed=args.random_seed)
+        print(f"Seeded {args.cafes} cafes and {args.employees} employees in {time.perf_counter() - started:.1f}s")
+        return 0
+
+    if args.command == "search":
+        from benchmarks import search_benchmark
+        return search_benchmark.main(rest)
+
+    if args.command == "dispatch":
+        from benchmarks import dispatch_benchmark
+        return dispatch_benchmark.main(rest)
+
+    if args.command == "coldstart":
+        from benchmarks import coldstart_benchmark
+        return coldstart_benchmark.main(rest)
+
+    if args.command == "repositories":
+        from benchmarks import repository_benchmark
+        results = repository_benchmark.run(iterations=args.iterations, warmup=args.warmup)
+        return finish("repositories", results, args, {"iterations": args.iterations})
+
+    from benchmarks import http_load
+    results = http_load.run(base_url=args.url, requests=args.requests, concurrency=args.concurrency, only=args.only)
+    return finish("http", results, args, {"requests": args.requests, "concurrency": args.concurrency, "url": args.url or "in-process"})
+
+if __name__ == "__main__":
+    sys.exit(main())
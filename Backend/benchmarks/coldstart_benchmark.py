@@ -0,0 +1,98 @@
+"""
+Cold start of a single gunicorn worker: time from spawning the server until
+/healthz answers, until /readyz reports ready, and until the first GET
+/cafes/ succeeds, plus the startup phases the worker reports itself.
+
+    python -m benchmarks coldstart --runs 5
+    python -m benchmarks coldstart --app asgi:app --worker-class uvicorn.workers.UvicornWorker
+
+Each run starts a fresh server on a free local port against DATABASE_URL,
+using gunicorn.conf.py, so the master's database wait and migrations count.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+from benchmarks.stats import print_table, save_results, summarize
+
+POLL_INTERVAL_S = 0.005
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+def get(url: str) -> Optional[tuple]:
+    """Status and body, or None while nothing is listening yet."""
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+def wait_for(url: str, started: float, deadline: float, status: int = 200) -> tuple:
+    """Milliseconds from started until url answers with status, and the body."""
+    while time.perf_counter() < deadline:
+        result = get(url)
+        if result is not None and result[0] == status:
+            return (time.perf_counter() - started) * 1000, result[1]
+        time.sleep(POLL_INTERVAL_S)
+    raise TimeoutError(f"{url} did not answer {status} in time")
+
+def cold_start(app: str, worker_class: str, timeout_s: float) -> Dict[str, float]:
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = {**os.environ, 'GUNICORN_APP': app, 'GUNICORN_WORKER_CLASS': worker_class, 'GUNICORN_BIND': f'127.0.0.1:{port}', 'WEB_CONCURRENCY': '1'}
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = started + timeout_s
+    try:
+        healthz_ms, _ = wait_for(f'{base_url}/healthz', started, deadline)
+        readyz_ms, body = wait_for(f'{base_url}/readyz', started, deadline)
+        first_request_ms, _ = wait_for(f'{base_url}/cafes/', started, deadline)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    sample = {'healthz': healthz_ms, 'readyz': readyz_ms, 'first request': first_request_ms}
+    for phase, seconds in json.loads(body)['startup']['phases_s'].items():
+        sample[f'worker {phase}'] = seconds * 1000
+    return sample
+
+def run(runs: int, app: str, worker_class: str, timeout_s: float) -> Dict[str, Dict[str, float]]:
+    samples: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        for name, value in cold_start(app, worker_class, timeout_s).items():
+            samples.setdefault(name, []).append(value)
+    return {name: summarize(values) for name, values in samples.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app", default="wsgi:app")
+    parser.add_argument("--worker-class", default="gthread")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for each server")
+    parser.add_argument("--output", help="Write results as JSON (see benchmarks.compare)")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.app, args.worker_class, args.timeout)
+    print_table(results)
+    if args.output:
+        save_results(args.output, "coldstart", results, {"runs": args.runs, "app": args.app, "worker_class": args.worker_class})
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
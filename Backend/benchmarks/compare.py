@@ -0,0 +1,50 @@
+"""
+Compare two benchmark result files and fail on regressions.
+
+    python -m benchmarks.compare baseline.json current.json --max-regression 0.2
+
+A result regresses when its p95 grows, or its throughput drops, by more
+than --max-regression (a fraction), or when it starts returning errors.
+Latencies under --noise-floor-ms are ignored as timer noise.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+def find_regressions(baseline: Dict, current: Dict, max_regression: float = 0.2, noise_floor_ms: float = 1.0) -> List[str]:
+    regressions = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            regressions.append(f"{name}: missing from current run")
+            continue
+        if after.get("errors", 0) > before.get("errors", 0):
+            regressions.append(f"{name}: errors {before.get('errors', 0)} -> {after['errors']}")
+        if "p95_ms" in before and "p95_ms" in after and after["p95_ms"] > noise_floor_ms:
+            if after["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+                regressions.append(f"{name}: p95 {before['p95_ms']:.2f}ms -> {after['p95_ms']:.2f}ms")
+        if "throughput_rps" in before and "throughput_rps" in after:
+            if after["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+                regressions.append(f"{name}: throughput {before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f} rps")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--noise-floor-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as baseline_file, open(args.current, encoding="utf-8") as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+
+    regressions = find_regressions(baseline, current, args.max_regression, args.noise_floor_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
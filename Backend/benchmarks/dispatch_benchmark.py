@@ -0,0 +1,103 @@
+"""
+Per-request dispatch overhead: resolving a controller from the injector on
+every request (how the routes used to reach their handlers) against the
+mediator's precompiled pipelines.
+
+    python -m benchmarks dispatch --iterations 20000
+
+Handlers are no-ops and the cafe listing is served from a warm cache, so
+only dispatch is measured. Needs DATABASE_URL for the warm-up query.
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict
+
+from injector import Injector, inject
+
+from application.handlers.command_handlers import CreateCafeCommandHandler, UpdateCafeCommandHandler, DeleteCafeCommandHandler, BulkCreateCafesCommandHandler, UploadLogoCommandHandler
+from application.handlers.query_handlers import GetCafesQueryHandler, SearchCafesQueryHandler
+from application.interfaces.version_repository import IVersionRepository
+from application.mediator import Mediator
+from application.queries.get_cafe_query import GetCafeQuery
+from application.services.cafe_list_cache import CafeListCache
+from benchmarks.stats import save_results, summarize
+from infrastructure.database.postgres import db_session
+from infrastructure.dependency.container import InfrastructureModule
+
+class LegacyCafeController:
+    """The controller as the routes resolved it per request before the mediator dispatched."""
+
+    @inject
+    def __init__(self, mediator: Mediator, create_cafe_handler: CreateCafeCommandHandler, update_cafe_handler: UpdateCafeCommandHandler, delete_cafe_handler: DeleteCafeCommandHandler, get_cafes_handler: GetCafesQueryHandler, version_repository: IVersionRepository, bulk_create_cafes_handler: BulkCreateCafesCommandHandler, search_cafes_handler: SearchCafesQueryHandler, upload_logo_handler: UploadLogoCommandHandler):
+        self.get_cafes_handler = get_cafes_handler
+
+class NoopQuery:
+    pass
+
+class NoopHandler:
+    def handle(self, query):
+        return None
+
+def measure(operation: Callable[[], object], iterations: int, warmup: int = 1000) -> Dict[str, float]:
+    for _ in range(warmup):
+        operation()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+def run(iterations: int) -> Dict[str, Dict[str, float]]:
+    app_injector = Injector([InfrastructureModule()])
+    mediator = app_injector.get(Mediator)
+    cafe_cache = app_injector.get(CafeListCache)
+    noop, request, query = NoopHandler(), NoopQuery(), GetCafeQuery()
+    # Same behaviors as the application's pipelines; only timing applies to NoopQuery.
+    noop_mediator = Mediator({NoopQuery: noop}, mediator.behaviors)
+    bare_mediator = Mediator({NoopQuery: noop})
+
+    mediator.send(query)
+    db_session.commit()
+
+    def injector_lookup():
+        app_injector.get(LegacyCafeController)
+        return noop.handle(request)
+
+    def legacy_cached_listing():
+        # The old handler checked CafeListCache itself.
+        app_injector.get(LegacyCafeController)
+        return cafe_cache.get_or_load(query, lambda: None)
+
+    try:
+        return {
+            "noop direct call": measure(lambda: noop.handle(request), iterations),
+            "noop injector lookup (before)": measure(injector_lookup, iterations),
+            "noop mediator, no behaviors": measure(lambda: bare_mediator.send(request), iterations),
+            "noop mediator pipeline (after)": measure(lambda: noop_mediator.send(request), iterations),
+            "cached cafe list (before)": measure(legacy_cached_listing, iterations),
+            "cached cafe list (after)": measure(lambda: mediator.send(query), iterations),
+        }
+    finally:
+        db_session.remove()
+
+def print_results(results: Dict[str, Dict[str, float]]):
+    print(f"{'name':<36} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    for name, summary in results.items():
+        print(f"{name:<36} {summary['mean_ms'] * 1000:>9.2f} {summary['p50_ms'] * 1000:>9.2f} {summary['p99_ms'] * 1000:>9.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", help="Write results as JSON (see benchmarks.compare)")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations)
+    print_results(results)
+    if args.output:
+        save_results(args.output, "dispatch", results, {"iterations": args.iterations})
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
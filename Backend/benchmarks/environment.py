@@ -0,0 +1,35 @@
+import os
+from typing import Optional
+
+EMBEDDED_DATABASE = "cafe_bench"
+
+def prepare_database(embedded_dir: Optional[str] = None, migrate: bool = True):
+    """
+    Points the app at the benchmark database and brings its schema up to
+    date. Call before importing anything from api/ or infrastructure/, which
+    read DATABASE_URL at import time.
+
+    With embedded_dir, an embedded Postgres (the optional 'pgserver' package)
+    is started there instead of using DATABASE_URL, so the suite runs without
+    Docker. That build has no pg_trgm, so its schema stops before the trigram
+    migration and search falls back to the memory backend.
+    """
+    if embedded_dir:
+        try:
+            import pgserver
+        except ImportError:
+            raise SystemExit("--embedded needs the optional 'pgserver' package (pip install pgserver).")
+        server = pgserver.get_server(embedded_dir, cleanup_mode=None)
+        exists = server.psql(f"SELECT 1 FROM pg_database WHERE datname = '{EMBEDDED_DATABASE}';")
+        if "1 row" not in exists:
+            server.psql(f"CREATE DATABASE {EMBEDDED_DATABASE};")
+        os.environ["DATABASE_URL"] = server.get_uri(EMBEDDED_DATABASE).replace("postgresql://", "postgresql+psycopg2://", 1)
+        os.environ.setdefault("SEARCH_BACKEND", "memory")
+
+    if not os.getenv("DATABASE_URL"):
+        raise SystemExit("Set DATABASE_URL (e.g. the docker-compose Postgres) or pass --embedded DIR.")
+
+    if migrate:
+        from infrastructure.database.postgres import migrate_database
+        from infrastructure.database.migrations.versions.v0005_search_trigram_indexes import VERSION as TRIGRAM_MIGRATION
+        migrate_database(TRIGRAM_MIGRATION - 1 if embedded_dir else None)
@@ -0,0 +1,222 @@
+import http.client
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from benchmarks.repository_benchmark import new_cafe, new_employee
+from benchmarks.stats import summarize
+
+# Smallest valid PNG, for the logo upload route.
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+Response = Tuple[int, dict, bytes]
+
+class Client:
+    """One keep-alive HTTP connection per worker thread."""
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[dict] = None) -> Response:
+        for attempt in range(2):
+            try:
+                self.connection.request(method, path, body=body, headers=headers or {})
+                response = self.connection.getresponse()
+                return response.status, dict(response.getheaders()), response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server closed an idle keep-alive connection; retry once on a fresh one.
+                self.connection.close()
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                if attempt:
+                    raise
+
+    def json(self, method: str, path: str, payload) -> Response:
+        return self.request(method, path, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+
+def multipart(field: str, filename: str, content: bytes, content_type: str) -> Tuple[bytes, dict]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+class Fixtures:
+    """Ids shared by the scenarios; create routes feed the update and delete routes."""
+    def __init__(self, client: Client):
+        status, _, body = client.request("GET", "/cafes?limit=100&fields=id,name,location")
+        cafes = json.loads(body)["items"]
+        status, _, body = client.request("GET", "/employees?limit=100&fields=id")
+        employees = json.loads(body)["items"]
+        if not cafes or not employees:
+            raise SystemExit("The database has no cafes or employees; seed it first (python -m benchmarks seed).")
+        self.cafe_ids = [cafe["id"] for cafe in cafes]
+        self.cafe_names = [cafe["name"] for cafe in cafes]
+        self.locations = sorted({cafe["location"] for cafe in cafes})
+        self.employee_ids = [employee["id"] for employee in employees]
+        self.created_cafes: List[str] = []
+        self.created_employees: List[str] = []
+        self.lock = threading.Lock()
+        _, headers, _ = client.request("GET", "/cafes")
+        self.cafes_etag = headers.get("ETag", "")
+
+    def push(self, items: List[str], value: str):
+        with self.lock:
+            items.append(value)
+
+    def pop(self, items: List[str]) -> Optional[str]:
+        with self.lock:
+            return items.pop() if items else None
+
+Scenario = Callable[[Client, Fixtures, random.Random], int]
+
+def create_cafe(client, fixtures, rng):
+    status, _, body = client.json("POST", "/cafes", new_cafe(rng))
+    if status == 201:
+        fixtures.push(fixtures.created_cafes, json.loads(body)["id"])
+    return status
+
+def update_cafe(client, fixtures, rng):
+    cafe = new_cafe(rng)
+    return client.json("PUT", f"/cafes/{rng.choice(fixtures.cafe_ids)}", {"description": cafe["description"], "location": cafe["location"]})[0]
+
+def delete_cafe(client, fixtures, rng):
+    cafe_id = fixtures.pop(fixtures.created_cafes)
+    return client.request("DELETE", f"/cafes/{cafe_id}")[0] if cafe_id else 0
+
+def create_employee(client, fixtures, rng):
+    status, _, body = client.json("POST", "/employees", {**new_employee(rng), "assigned_cafe_id": rng.choice(fixtures.cafe_ids)})
+    if status == 201:
+        fixtures.push(fixtures.created_employees, json.loads(body)["id"])
+    return status
+
+def update_employee(client, fixtures, rng):
+    return client.json("PUT", f"/employees/{rng.choice(fixtures.employee_ids)}", {"assigned_cafe_id": rng.choice(fixtures.cafe_ids)})[0]
+
+def delete_employee(client, fixtures, rng):
+    employee_id = fixtures.pop(fixtures.created_employees)
+    return client.request("DELETE", f"/employees/{employee_id}")[0] if employee_id else 0
+
+def bulk_cafes(client, fixtures, rng):
+    status, _, body = client.json("POST", "/cafes/bulk", [new_cafe(rng) for _ in range(50)])
+    for created in json.loads(body).get("created", []) if status in (201, 207) else []:
+        fixtures.push(fixtures.created_cafes, created["id"] if isinstance(created, dict) else created)
+    return status
+
+def bulk_employees(client, fixtures, rng):
+    status, _, body = client.json("POST", "/employees/bulk", [{**new_employee(rng), "assigned_cafe_id": rng.choice(fixtures.cafe_ids)} for _ in range(50)])
+    for created in json.loads(body).get("created", []) if status in (201, 207) else []:
+        fixtures.push(fixtures.created_employees, created["id"] if isinstance(created, dict) else created)
+    return status
+
+def upload_logo(client, fixtures, rng):
+    body, headers = multipart("file", "logo.png", PNG_1X1, "image/png")
+    status, _, response = client.request("POST", f"/cafes/upload-logo/{rng.choice(fixtures.cafe_ids)}", body, headers)
+    return status
+
+def get(path_for: Callable[[Fixtures, random.Random], str], headers: Callable[[Fixtures], dict] = lambda fixtures: {}) -> Scenario:
+    return lambda client, fixtures, rng: client.request("GET", path_for(fixtures, rng), headers=headers(fixtures))[0]
+
+# Every route in cafe_routes.py and employee_routes.py, plus the list variants worth tracking separately.
+SCENARIOS: Dict[str, Scenario] = {
+    "GET /cafes": get(lambda f, r: "/cafes"),
+    "GET /cafes?location=": get(lambda f, r: f"/cafes?location={quote(r.choice(f.locations))}"),
+    "GET /cafes?limit=50": get(lambda f, r: "/cafes?limit=50"),
+    "GET /cafes (If-None-Match)": get(lambda f, r: "/cafes", lambda f: {"If-None-Match": f.cafes_etag}),
+    "GET /cafes ndjson": get(lambda f, r: "/cafes", lambda f: {"Accept": "application/x-ndjson"}),
+    "GET /cafes/search": get(lambda f, r: f"/cafes/search?q={quote(r.choice(f.cafe_names)[:3])}"),
+    "GET /cafes/export": get(lambda f, r: f"/cafes/export?location={quote(r.choice(f.locations))}"),
+    "POST /cafes": create_cafe,
+    "PUT /cafes/<id>": update_cafe,
+    "DELETE /cafes/<id>": delete_cafe,
+    "POST /cafes/bulk x50": bulk_cafes,
+    "POST /cafes/upload-logo/<id>": upload_logo,
+    "GET /employees": get(lambda f, r: "/employees"),
+    "GET /employees?cafe=": get(lambda f, r: f"/employees?cafe={quote(r.choice(f.cafe_names))}"),
+    "GET /employees?limit=50": get(lambda f, r: "/employees?limit=50"),
+    "GET /employees/search": get(lambda f, r: f"/employees/search?q={quote(r.choice('abcdefghijklmnoprstvwyz') + r.choice('aeiou'))}"),
+    "GET /employees/export": get(lambda f, r: f"/employees/export?cafe={quote(r.choice(f.cafe_names))}"),
+    "POST /employees": create_employee,
+    "PUT /employees/<id>": update_employee,
+    "DELETE /employees/<id>": delete_employee,
+    "POST /employees/bulk x50": bulk_employees,
+    "GET /metrics": get(lambda f, r: "/metrics"),
+}
+
+def run_scenario(base_url: str, scenario: Scenario, fixtures: Fixtures, requests: int, concurrency: int) -> Dict[str, float]:
+    samples: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker(worker_id: int):
+        client = Client(base_url)
+        rng = random.Random(worker_id)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                status = scenario(client, fixtures, rng)
+            except Exception:
+                status = 0
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if 200 <= status < 400:
+                    samples.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started, errors[0])
+
+def serve_in_process() -> Tuple[str, Callable[[], None]]:
+    """Starts the app on a free local port with a threaded werkzeug server; returns its URL and a stop function."""
+    from werkzeug.serving import make_server
+    from api.app import create_app
+
+    # Per-request access log lines would dominate both the output and the timings.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(init_db=False), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+def run(base_url: Optional[str] = None, requests: int = 200, concurrency: int = 8, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    stop = None
+    if not base_url:
+        base_url, stop = serve_in_process()
+        print(f"Serving the app in-process at {base_url}")
+    try:
+        fixtures = Fixtures(Client(base_url))
+        results = {}
+        for name, scenario in SCENARIOS.items():
+            if only and not any(fragment in name for fragment in only):
+                continue
+            results[name] = run_scenario(base_url, scenario, fixtures, requests, concurrency)
+        # Remove whatever the create routes added that the delete routes did not get to.
+        cleanup = Client(base_url)
+        for cafe_id in fixtures.created_cafes:
+            cleanup.request("DELETE", f"/cafes/{cafe_id}")
+        for employee_id in fixtures.created_employees:
+            cleanup.request("DELETE", f"/employees/{employee_id}")
+        return results
+    finally:
+        if stop:
+            stop()
@@ -0,0 +1,114 @@
+import asyncio
+import random
+import time
+from typing import Callable, Dict
+
+from benchmarks.seed import fake_name, LOCATIONS, WORDS
+from benchmarks.stats import summarize
+from infrastructure.database.async_postgres import AsyncSessionLocal, async_engine
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+
+def new_cafe(rng: random.Random) -> dict:
+    return {"name": fake_name(rng), "description": " ".join(rng.sample(WORDS, 3)), "location": rng.choice(LOCATIONS)}
+
+def new_employee(rng: random.Random) -> dict:
+    name = fake_name(rng)
+    return {"name": name, "email_address": f"{name.lower()}{rng.randrange(10 ** 6)}@example.com", "phone_number": f"9{rng.randrange(10 ** 7):07d}", "gender": rng.choice(["Male", "Female"])}
+
+def repository_cases(session, rng: random.Random, iterations: int) -> Dict[str, Callable[[], object]]:
+    """One callable per repository method (and notable argument combinations), each performing a single call."""
+    cafes = PostgresCafeRepository(session=session)
+    employees = PostgresEmployeeRepository(session=session)
+
+    cafe_rows = cafes.get_all_cafes(limit=200)
+    employee_rows = employees.get_all_employees(limit=500)
+    if not cafe_rows or not employee_rows:
+        raise SystemExit("The database has no cafes or employees; seed it first (python -m benchmarks seed).")
+    cafe_ids = [row['id'] for row in cafe_rows]
+    cafe_names = [row['name'] for row in cafe_rows]
+    employee_ids = [row['id'] for row in employee_rows]
+
+    # Rows for the destructive cases are created up front so only the measured call is timed.
+    deletable_cafes = iter(cafes.add_cafes([new_cafe(rng) for _ in range(iterations)]))
+    numbers = iter(employees.allocate_employee_numbers(iterations * 3))
+    next_id = lambda: f"UI{next(numbers):07d}"
+    deletable_employees = iter(employees.add_employees([(next_id(), new_employee(rng), None) for _ in range(iterations)]))
+
+    return {
+        "cafe.get_all_cafes": lambda: cafes.get_all_cafes(),
+        "cafe.get_all_cafes location": lambda: cafes.get_all_cafes(location=rng.choice(LOCATIONS)),
+        "cafe.get_all_cafes page": lambda: cafes.get_all_cafes(limit=51),
+        "cafe.iter_all_cafes": lambda: sum(1 for _ in cafes.iter_all_cafes()),
+        "cafe.get_cafe_by_id": lambda: cafes.get_cafe_by_id(rng.choice(cafe_ids)),
+        "cafe.get_existing_cafe_ids x50": lambda: cafes.get_existing_cafe_ids(rng.sample(cafe_ids, min(50, len(cafe_ids)))),
+        "cafe.add_cafe": lambda: cafes.add_cafe(new_cafe(rng)),
+        "cafe.add_cafes x100": lambda: cafes.add_cafes([new_cafe(rng) for _ in range(100)]),
+        "cafe.update_cafe": lambda: cafes.update_cafe(rng.choice(cafe_ids), {"description": " ".join(rng.sample(WORDS, 3))}),
+        "cafe.delete_cafe": lambda: cafes.delete_cafe(next(deletable_cafes)),
+        "employee.get_all_employees": lambda: employees.get_all_employees(),
+        "employee.get_all_employees cafe": lambda: employees.get_all_employees(cafe_name=rng.choice(cafe_names)),
+        "employee.get_all_employees page": lambda: employees.get_all_employees(limit=51),
+        "employee.iter_all_employees": lambda: sum(1 for _ in employees.iter_all_employees()),
+        "employee.get_employee_by_id": lambda: employees.get_employee_by_id(rng.choice(employee_ids)),
+        "employee.add_employee": lambda: employees.add_employee(next_id(), new_employee(rng), rng.choice(cafe_ids)),
+        "employee.add_employees x100": lambda: employees.add_employees([(f"UI{number:07d}", new_employee(rng), rng.choice(cafe_ids)) for number in employees.allocate_employee_numbers(100)]),
+        "employee.update_employee": lambda: employees.update_employee(rng.choice(employee_ids), {"name": fake_name(rng)}, rng.choice(cafe_ids)),
+        "employee.delete_employee": lambda: employees.delete_employee(next(deletable_employees)),
+        "employee.is_assigned_to_cafe": lambda: employees.is_assigned_to_cafe(rng.choice(employee_ids)),
+        "employee.get_last_employee_id": lambda: employees.get_last_employee_id(),
+        "employee.allocate_employee_numbers": lambda: employees.allocate_employee_numbers(1),
+    }
+
+def async_cases() -> Dict[str, Callable[[], object]]:
+    cafes = PostgresCafeRepository(session=None, async_session_factory=AsyncSessionLocal)
+    employees = PostgresEmployeeRepository(session=None, async_session_factory=AsyncSessionLocal)
+    return {
+        "cafe.get_all_cafes_async page": lambda: cafes.get_all_cafes_async(limit=51),
+        "employee.get_all_employees_async page": lambda: employees.get_all_employees_async(limit=51),
+    }
+
+def time_calls(call: Callable[[], object], iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        call()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - call_started) * 1000)
+    return summarize(samples, time.perf_counter() - started)
+
+async def time_async_calls(call: Callable[[], object], iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        await call()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - call_started) * 1000)
+    return summarize(samples, time.perf_counter() - started)
+
+def run(iterations: int = 50, warmup: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Times every repository method in one transaction that is rolled back at
+    the end, so write benchmarks leave the database as they found it.
+    """
+    rng = random.Random(1)
+    results = {}
+    session = SessionLocal()
+    try:
+        for name, call in repository_cases(session, rng, iterations + warmup).items():
+            results[name] = time_calls(call, iterations, warmup)
+    finally:
+        session.rollback()
+        session.close()
+
+    async def run_async():
+        for name, call in async_cases().items():
+            results[name] = await time_async_calls(call, iterations, warmup)
+        await async_engine.dispose()
+    asyncio.run(run_async())
+    return results
@@ -0,0 +1,87 @@
+"""
+Type-ahead search latency, per backend and resource.
+
+    python -m benchmarks.search_benchmark --seed-employees 20000 --seed-cafes 500 --p95-ms 50
+
+Run against a scratch database (DATABASE_URL); seeding inserts rows. Exits
+non-zero when any p95 is above the target.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.seed import SYLLABLES, WORDS, seed
+from benchmarks.stats import print_table, save_results, summarize
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_search import PostgresSearchRepository
+from infrastructure.search.memory_search import MemorySearchRepository, load_rows_from_database
+
+def type_ahead_terms(rng: random.Random, count: int, vocabulary: List[str]) -> List[str]:
+    """Prefixes of 1 to 4 characters, like a user typing into a search box."""
+    terms = []
+    for _ in range(count):
+        word = rng.choice(vocabulary) + rng.choice(vocabulary)
+        terms.append(word[:rng.randint(1, 4)])
+    return terms
+
+def measure(search: Callable[[str], object], terms: List[str], warmup: int = 10) -> Dict[str, float]:
+    for term in terms[:warmup]:
+        search(term)
+    samples = []
+    for term in terms:
+        started = time.perf_counter()
+        search(term)
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-employees", type=int, default=0)
+    parser.add_argument("--seed-cafes", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--p95-ms", type=float, default=50.0, help="p95 latency target in milliseconds")
+    # Without pg_trgm (SEARCH_BACKEND=memory, e.g. the embedded Postgres) only the memory backend can run.
+    parser.add_argument("--backend", choices=["postgres", "memory", "both"], default="memory" if os.getenv("SEARCH_BACKEND") == "memory" else "both")
+    parser.add_argument("--output", help="Write results as JSON (see benchmarks.compare)")
+    args = parser.parse_args(argv)
+
+    if args.seed_employees or args.seed_cafes:
+        started = time.perf_counter()
+        seed(cafes=args.seed_cafes, employees=args.seed_employees)
+        print(f"Seeded {args.seed_cafes} cafes and {args.seed_employees} employees in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(7)
+    employee_terms = type_ahead_terms(rng, args.queries, SYLLABLES)
+    cafe_terms = type_ahead_terms(rng, args.queries, WORDS + SYLLABLES)
+
+    session = SessionLocal()
+    try:
+        backends = {}
+        if args.backend in ("postgres", "both"):
+            backends["postgres"] = PostgresSearchRepository(session=session)
+        if args.backend in ("memory", "both"):
+            backends["memory"] = MemorySearchRepository(load_rows=load_rows_from_database)
+
+        results = {}
+        for name, repository in backends.items():
+            results[f"{name} employees"] = measure(lambda term: repository.search_employees(term, args.limit + 1), employee_terms)
+            results[f"{name} cafes"] = measure(lambda term: repository.search_cafes(term, args.limit + 1), cafe_terms)
+    finally:
+        session.rollback()
+        session.close()
+
+    print_table(results)
+    if args.output:
+        save_results(args.output, "search", results, {"queries": args.queries, "limit": args.limit})
+
+    over = [name for name, summary in results.items() if summary["p95_ms"] > args.p95_ms]
+    for name in over:
+        print(f"{name}: p95 {results[name]['p95_ms']:.2f}ms is over the {args.p95_ms:.0f}ms target")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
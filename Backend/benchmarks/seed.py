@@ -0,0 +1,63 @@
+import random
+from typing import List
+from uuid import UUID
+
+from application.services.employee_id_generator import EmployeeIDGenerator
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+from infrastructure.database.repositories.postgres_version import PostgresVersionRepository
+from application.interfaces.version_repository import CAFES_RESOURCE, EMPLOYEES_RESOURCE
+
+SYLLABLES = ["al", "an", "be", "ca", "da", "el", "fa", "ga", "ha", "is", "jo", "ka", "li", "ma", "ne", "or", "pa", "ri", "sa", "ta", "ul", "va", "wi", "ya", "zo"]
+LOCATIONS = ["Tampines", "Upper Thomson", "Serangoon", "Bedok", "Jurong East", "Orchard", "Bishan", "Punggol", "Clementi", "Woodlands"]
+WORDS = ["coffee", "brunch", "waffles", "artisan", "bakery", "espresso", "matcha", "pastries", "cozy", "rooftop", "vegan", "noodles", "desserts", "tea"]
+BATCH_SIZE = 5000
+
+def fake_name(rng: random.Random, min_length: int = 6, max_length: int = 10) -> str:
+    name = ""
+    while len(name) < min_length:
+        name += rng.choice(SYLLABLES)
+    return name[:max_length].capitalize()
+
+def seed(cafes: int, employees: int, random_seed: int = 42) -> List[UUID]:
+    """
+    Inserts synthetic cafes and employees (most of them assigned) through the
+    bulk repository paths. Meant for a scratch database; returns the cafe ids.
+    """
+    rng = random.Random(random_seed)
+    session = SessionLocal()
+    try:
+        cafe_repository = PostgresCafeRepository(session=session)
+        employee_repository = PostgresEmployeeRepository(session=session)
+        id_generator = EmployeeIDGenerator(employee_repository)
+
+        cafe_ids: List[UUID] = []
+        for start in range(0, cafes, BATCH_SIZE):
+            rows = [{
+                "name": fake_name(rng),
+                "description": " ".join(rng.sample(WORDS, 4)).capitalize(),
+                "location": rng.choice(LOCATIONS),
+            } for _ in range(min(BATCH_SIZE, cafes - start))]
+            cafe_ids.extend(cafe_repository.add_cafes(rows))
+            session.commit()
+
+        for start in range(0, employees, BATCH_SIZE):
+            count = min(BATCH_SIZE, employees - start)
+            rows = []
+            for employee_id in id_generator.generate_employee_ids(count):
+                name = fake_name(rng)
+                rows.append((employee_id, {
+                    "name": name,
+                    "email_address": f"{name.lower()}.{employee_id.lower()}@example.com",
+                    "phone_number": f"{rng.choice('89')}{rng.randrange(10 ** 7):07d}",
+                    "gender": rng.choice(["Male", "Female"]),
+                }, rng.choice(cafe_ids) if cafe_ids and rng.random() < 0.9 else None))
+            employee_repository.add_employees(rows)
+            session.commit()
+
+        PostgresVersionRepository(session=session).bump(CAFES_RESOURCE, EMPLOYEES_RESOURCE)
+        session.commit()
+        return cafe_ids
+    finally:
+        session.close()
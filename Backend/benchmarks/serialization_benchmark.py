@@ -0,0 +1,94 @@
+"""
+Serialization and compression cost of a large employee list, as GET /employees returns it.
+
+    python -m benchmarks.serialization_benchmark --employees 10000 --iterations 20
+
+Needs no database: the rows are synthetic but shaped like the repository
+output (UUID cafe ids included). Compares every available JSON encoder and
+content encoding, reporting time per response and bytes on the wire.
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from flask import Flask
+
+from api.compression import compress, supported_encodings
+from api.json_provider import COMPACT_SEPARATORS, FastJSONProvider
+from benchmarks.stats import save_results, summarize
+
+SYLLABLES = ["al", "an", "be", "ca", "da", "el", "fa", "ga", "ha", "is", "jo", "ka", "li", "ma", "ne", "or", "pa", "ri", "sa", "ta"]
+
+def employee_rows(count: int, cafes: int = 500, random_seed: int = 42) -> List[dict]:
+    rng = random.Random(random_seed)
+    cafe_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(cafes)]
+    cafe_names = {cafe_id: ''.join(rng.choice(SYLLABLES) for _ in range(4)).capitalize() for cafe_id in cafe_ids}
+    rows = []
+    for number in range(count):
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(4)).capitalize()
+        cafe_id = rng.choice(cafe_ids) if rng.random() < 0.9 else None
+        rows.append({
+            'id': f'UI{number:07X}',
+            'name': name,
+            'email_address': f'{name.lower()}.{number}@example.com',
+            'phone_number': f"{rng.choice('89')}{rng.randrange(10 ** 7):07d}",
+            'gender': rng.choice(['Male', 'Female']),
+            'days_worked': rng.randrange(2000) if cafe_id else 0,
+            'cafe_id': cafe_id,
+            'cafe_name': cafe_names.get(cafe_id),
+        })
+    return rows
+
+def measure(operation: Callable[[], bytes], iterations: int, warmup: int = 2) -> Dict[str, float]:
+    for _ in range(warmup):
+        operation()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        size = len(operation())
+        samples.append((time.perf_counter() - started) * 1000)
+    return {**summarize(samples), 'bytes': size}
+
+def run(employees: int, iterations: int) -> Dict[str, Dict[str, float]]:
+    rows = employee_rows(employees)
+    app = Flask(__name__)
+    providers = [FastJSONProvider(app, encoder='stdlib')]
+    fast = FastJSONProvider(app)
+    if fast.orjson:
+        providers.append(fast)
+    else:
+        print("orjson is not installed; only the stdlib encoder is measured")
+
+    results = {}
+    for provider in providers:
+        results[f'dumps {provider.name}'] = measure(lambda: provider.dumps_bytes(rows, separators=COMPACT_SEPARATORS), iterations)
+
+    # Compression works on the bytes the fastest encoder produced.
+    body = providers[-1].dumps_bytes(rows, separators=COMPACT_SEPARATORS)
+    for encoding in supported_encodings():
+        results[f'compress {encoding}'] = measure(lambda: compress(body, encoding), iterations)
+    return results
+
+def print_results(results: Dict[str, Dict[str, float]], uncompressed: int):
+    print(f"{'name':<20} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>11} {'ratio':>7}")
+    for name, summary in results.items():
+        print(f"{name:<20} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['bytes']:>11} {summary['bytes'] / uncompressed:>7.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Write results as JSON (see benchmarks.compare)")
+    args = parser.parse_args(argv)
+
+    results = run(args.employees, args.iterations)
+    print_results(results, next(iter(results.values()))['bytes'])
+    if args.output:
+        save_results(args.output, "serialization", results, {"employees": args.employees, "iterations": args.iterations})
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
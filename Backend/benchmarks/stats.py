@@ -0,0 +1,38 @@
+import json
+import statistics
+from typing import Dict, List, Optional
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def summarize(samples_ms: List[float], elapsed_s: Optional[float] = None, errors: int = 0) -> Dict[str, float]:
+    """Latency percentiles in milliseconds, plus throughput when the wall-clock time is known."""
+    if not samples_ms:
+        return {"count": 0, "errors": errors}
+    summary = {
+        "count": len(samples_ms),
+        "errors": errors,
+        "mean_ms": statistics.fmean(samples_ms),
+        "p50_ms": statistics.median(samples_ms),
+        "p95_ms": percentile(samples_ms, 0.95),
+        "p99_ms": percentile(samples_ms, 0.99),
+        "max_ms": max(samples_ms),
+    }
+    if elapsed_s:
+        summary["throughput_rps"] = len(samples_ms) / elapsed_s
+    return summary
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    print(f"{'name':<40} {'count':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>9}")
+    for name, summary in results.items():
+        if not summary.get("count"):
+            print(f"{name:<40} {0:>7} {summary.get('errors', 0):>5}")
+            continue
+        rps = f"{summary['throughput_rps']:>9.1f}" if "throughput_rps" in summary else f"{'-':>9}"
+        print(f"{name:<40} {summary['count']:>7} {summary['errors']:>5} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f} {rps}")
+
+def save_results(path: str, kind: str, results: Dict[str, Dict[str, float]], meta: Dict):
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump({"kind": kind, "meta": meta, "results": results}, output, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
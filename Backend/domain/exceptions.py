@@ -7,4 +7,19 @@ class DomainException(Exception):
 
 class IntegrityConflictException(DomainException):
     """Exception raised when a unique constraint or integrity check fails."""
-    pass
\ No newline at end of file
+    pass
+
+class LogoTooLargeException(DomainException):
+    """Exception raised when an uploaded logo exceeds the configured size cap."""
+    pass
+
+class UnsupportedLogoException(DomainException):
+    """Exception raised when an upload is not one of the accepted image formats."""
+    pass
+
+class BatchAbortedException(DomainException):
+    """Exception raised when an all-or-nothing batch fails; carries the per-operation results to report after the rollback."""
+    def __init__(self, message: str, summary: dict, status: int):
+        super().__init__(message)
+        self.summary = summary
+        self.status = status
@@ -0,0 +1,49 @@
+import multiprocessing
+
+from infrastructure.settings import env_bool, env_int, env_str
+
+wsgi_app = env_str("GUNICORN_APP", "wsgi:app")
+bind = env_str("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Multi-process, multi-threaded serving. Each worker owns its own connection
+# pool, so workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must fit in Postgres'
+# max_connections.
+workers = env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+worker_class = env_str("GUNICORN_WORKER_CLASS", "gthread")
+threads = env_int("GUNICORN_THREADS", 4)
+
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 0)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 0)
+
+preload_app = env_bool("GUNICORN_PRELOAD", False)
+reload = env_bool("GUNICORN_RELOAD", False)
+accesslog = env_str("GUNICORN_ACCESS_LOG", "-")
+errorlog = env_str("GUNICORN_ERROR_LOG", "-")
+
+def on_starting(server):
+    # Run schema setup exactly once, in the master, before any worker exists.
+    from api.app import initialize_database
+    from infrastructure.database.postgres import engine
+
+    initialize_database()
+    engine.dispose()
+
+def post_fork(server, worker):
+    # Never share pooled connections inherited from the master across processes.
+    from infrastructure.database.postgres import engine
+    from infrastructure.observability.startup import STARTUP
+
+    engine.dispose(close=False)
+    STARTUP.reset()
+
+def post_worker_init(worker):
+    # With preload_app the app (and its warm pool) was created in the master;
+    # open this worker's own connections before it accepts requests.
+    from api.app import warm_up
+    from infrastructure.observability.startup import STARTUP
+
+    if not STARTUP.ready:
+        warm_up()
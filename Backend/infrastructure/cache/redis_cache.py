@@ -0,0 +1,76 @@
+import pickle
+import threading
+from typing import Any, Optional
+
+from application.interfaces.cache import ICache
+
+class RedisCache(ICache):
+    """
+    Shared cache backend so every worker sees the same entries and
+    invalidation counters. Redis errors degrade to cache misses.
+    """
+
+    def __init__(self, url: str, default_ttl: float = 30, prefix: str = "cafe-api:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package to be installed.")
+
+        self._errors = (redis.RedisError,)
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            payload = self.client.get(self.prefix + key)
+        except self._errors:
+            self._count('errors')
+            payload = None
+
+        if payload is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return pickle.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ttl = ttl if ttl is not None else self.default_ttl
+        try:
+            self.client.set(self.prefix + key, payload, px=int(ttl * 1000))
+        except self._errors:
+            self._count('errors')
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except self._errors:
+            self._count('errors')
+
+    def get_counter(self, key: str) -> int:
+        try:
+            return int(self.client.get(self.prefix + key) or 0)
+        except self._errors:
+            self._count('errors')
+            return 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "redis",
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
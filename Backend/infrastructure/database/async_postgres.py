@@ -0,0 +1,44 @@
+import os
+from functools import lru_cache
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from infrastructure.database.postgres import DATABASE_URL, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_TIMEOUT, REPLICA_CONNECT_TIMEOUT, REPLICA_DATABASE_URL, replica_monitor
+from infrastructure.observability.sql import instrument_engine
+from infrastructure.settings import env_int
+
+# Defaults to DATABASE_URL with the asyncpg driver swapped in.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or (make_url(REPLICA_DATABASE_URL).set(drivername="postgresql+asyncpg") if REPLICA_DATABASE_URL else None)
+
+# Async reads hold a connection only while a query runs, so a larger pool lets a
+# single event loop keep many slow reads in flight.
+ASYNC_DB_POOL_SIZE = env_int("ASYNC_DB_POOL_SIZE", 20)
+ASYNC_DB_MAX_OVERFLOW = env_int("ASYNC_DB_MAX_OVERFLOW", 30)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=ASYNC_DB_POOL_SIZE,
+    max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+instrument_engine(async_engine.sync_engine, label='async')
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@lru_cache(maxsize=None)
+def async_replica_sessionmaker() -> async_sessionmaker:
+    """Sessions on the replica for async reads, created on the first replica read."""
+    replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={'timeout': REPLICA_CONNECT_TIMEOUT},
+    )
+    instrument_engine(replica_engine.sync_engine, label='async_replica')
+    replica_monitor.watch(replica_engine.sync_engine)
+    return async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
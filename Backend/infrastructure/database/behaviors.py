@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy.exc import OperationalError
+
+from application.mediator import AsyncHandler, Handler, PipelineBehavior
+from infrastructure.database.routing import ReplicaMonitor, async_read_snapshot, current_snapshot, is_pinned_to_primary, read_snapshot, reading_from_replica
+from infrastructure.observability.metrics import DB_READ_ROUTING
+
+# Raised by a hot standby when replaying WAL had to cancel a conflicting read.
+RECOVERY_CONFLICT = '40001'
+
+class ReplicaReadBehavior(PipelineBehavior):
+    """
+    Lets the handlers of request_types read from the replica while it is
+    healthy and the client is not pinned to the primary. A read that fails
+    because the replica went away, or was cancelled by WAL replay, is run
+    again on the primary.
+    """
+
+    def __init__(self, session, monitor: ReplicaMonitor, request_types: Iterable[type]):
+        self.session = session
+        self.monitor = monitor
+        self.request_types = set(request_types)
+
+    def applies_to(self, request_type: type) -> bool:
+        return request_type in self.request_types
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        # Inside SnapshotReads the whole block has been routed already.
+        if current_snapshot() is not None:
+            return next_handler(request)
+        return self.route(request, lambda: next_handler(request))
+
+    async def handle_async(self, request: Any, next_handler: AsyncHandler) -> Any:
+        if current_snapshot() is not None:
+            return await next_handler(request)
+        return await self.route_async(request, lambda: next_handler(request))
+
+    def route(self, request: Any, read: Callable[[], Any]) -> Any:
+        """Runs read() on the replica when it may serve request, and again on the primary if the replica fails it."""
+        if self._stay_on_primary(request):
+            return read()
+        try:
+            with reading_from_replica():
+                return read()
+        except OperationalError as e:
+            if not self._replica_failed(e):
+                raise
+            self.session.rollback()
+        self._count(request, 'fallback')
+        return read()
+
+    async def route_async(self, request: Any, read: Callable[[], Awaitable[Any]]) -> Any:
+        if self.monitor.due() and not is_pinned_to_primary():
+            # The lag check is a blocking round trip; keep it off the event loop.
+            await asyncio.to_thread(self.monitor.refresh)
+        if self._stay_on_primary(request):
+            return await read()
+        try:
+            with reading_from_replica():
+                return await read()
+        except OperationalError as e:
+            if not self._replica_failed(e):
+                raise
+        except OSError as e:
+            # asyncpg lets a refused connection through unwrapped.
+            self.monitor.mark_down(e)
+        self._count(request, 'fallback')
+        return await read()
+
+    def _stay_on_primary(self, request: Any) -> bool:
+        if type(request) not in self.request_types:
+            return True
+        if is_pinned_to_primary():
+            self._count(request, 'pinned')
+            return True
+        if not self.monitor.available():
+            self._count(request, 'unavailable')
+            return True
+        self._count(request, 'replica')
+        return False
+
+    def _replica_failed(self, error: OperationalError) -> bool:
+        # handle_error has already marked the replica down for lost or refused connections.
+        return not self.monitor.healthy or getattr(error.orig, 'pgcode', None) == RECOVERY_CONFLICT
+
+    @staticmethod
+    def _count(request: Any, target: str) -> None:
+        DB_READ_ROUTING.inc(request=type(request).__name__, target=target)
+
+class SnapshotReads:
+    """
+    Runs a listing route's table_version lookup and the listing itself in one
+    snapshot, so the ETag always describes the body it is sent with. With a
+    replica, the whole block reads from it when the query's handler may (see
+    ReplicaReadBehavior), and falls back to the primary as a whole.
+    """
+
+    def __init__(self, session=None, async_session_factory: Optional[Callable[[], Any]] = None, replica_reads: Optional[ReplicaReadBehavior] = None):
+        # Without a session (the memory repositories) the reads simply run.
+        self.session = session
+        self.async_session_factory = async_session_factory
+        self.replica_reads = replica_reads
+
+    def run(self, request: Any, read: Callable[[], Any]) -> Any:
+        if self.session is None:
+            return read()
+
+        def read_in_snapshot():
+            with read_snapshot(self.session):
+                return read()
+        if self.replica_reads is None:
+            return read_in_snapshot()
+        return self.replica_reads.route(request, read_in_snapshot)
+
+    async def run_async(self, request: Any, read: Callable[[], Awaitable[Any]]) -> Any:
+        if self.async_session_factory is None:
+            return await read()
+
+        async def read_in_snapshot():
+            async with async_read_snapshot(self.async_session_factory):
+                return await read()
+        if self.replica_reads is None:
+            return await read_in_snapshot()
+        return await self.replica_reads.route_async(request, read_in_snapshot)
@@ -0,0 +1,54 @@
+import sys
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+
+def list_query_checks(session) -> List[Tuple[str, object, List[str]]]:
+    """(description, statement, indexes the plan is expected to use) for the filtered list queries."""
+    cafes = PostgresCafeRepository(session=session)
+    employees = PostgresEmployeeRepository(session=session)
+    return [
+        ("GET /cafes", cafes._all_cafes_statement(limit=50), ["ix_cafe_employee_count"]),
+        ("GET /cafes?location=", cafes._all_cafes_statement(location="Tampines", limit=50), ["ix_cafe_location"]),
+        ("GET /employees?cafe=", employees._all_employees_statement(cafe_name="Lola's", limit=50), ["ix_cafe_name", "ix_employee_cafe_cafe_id"]),
+    ]
+
+def explain(session, statement) -> dict:
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+
+def plan_indexes(plan: dict) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from plan_indexes(child)
+
+def run_checks(simulate_large_tables: bool = True) -> bool:
+    """
+    EXPLAINs each list query and reports whether the expected indexes are used.
+    On small tables Postgres rightly prefers sequential scans, so by default
+    they are disabled for the check to show the plan large tables would get.
+    """
+    ok = True
+    session = SessionLocal()
+    try:
+        if simulate_large_tables:
+            session.execute(text("SET LOCAL enable_seqscan = off"))
+        for description, statement, expected in list_query_checks(session):
+            used = set(plan_indexes(explain(session, statement)))
+            missing = [index for index in expected if index not in used]
+            ok = ok and not missing
+            status = "OK" if not missing else f"MISSING {', '.join(missing)}"
+            print(f"{description:<24} uses {', '.join(sorted(used)) or 'no index'}: {status}")
+    finally:
+        session.rollback()
+        session.close()
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks(simulate_large_tables="--actual" not in sys.argv) else 1)
@@ -0,0 +1 @@
+from infrastructure.database.migrations.runner import applied_versions, load_migrations, run_migrations
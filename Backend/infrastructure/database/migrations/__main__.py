@@ -0,0 +1,26 @@
+import argparse
+
+from infrastructure.database.postgres import engine
+from infrastructure.database.migrations.runner import applied_versions, load_migrations, run_migrations
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m infrastructure.database.migrations", description="Apply or inspect schema migrations.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade = subparsers.add_parser("upgrade", help="Apply pending migrations")
+    upgrade.add_argument("--target", type=int, help="Stop after this version")
+    subparsers.add_parser("status", help="List migrations and whether they are applied")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = run_migrations(engine, target=args.target)
+        print(f"Applied {len(applied)} migration(s).")
+        return
+
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    for migration in load_migrations():
+        state = "applied" if migration.VERSION in done else "pending"
+        print(f"{migration.VERSION:04d} {migration.NAME:<40} {state}")
+
+if __name__ == "__main__":
+    main()
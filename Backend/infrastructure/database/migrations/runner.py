@@ -0,0 +1,62 @@
+import importlib
+import pkgutil
+from types import ModuleType
+from typing import List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from infrastructure.database.migrations import versions
+
+# Arbitrary application-wide key for pg_advisory_xact_lock so that only one
+# process at a time migrates when several workers or containers boot together.
+MIGRATION_LOCK_ID = 7245190021
+
+CREATE_MIGRATIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+def load_migrations() -> List[ModuleType]:
+    """
+    Every module in migrations/versions defines VERSION, NAME and
+    upgrade(connection). They are applied in VERSION order.
+    """
+    migrations = [
+        importlib.import_module(f"{versions.__name__}.{module.name}")
+        for module in pkgutil.iter_modules(versions.__path__)
+    ]
+    migrations.sort(key=lambda migration: migration.VERSION)
+
+    seen = set()
+    for migration in migrations:
+        if migration.VERSION in seen:
+            raise RuntimeError(f"Duplicate migration version {migration.VERSION} ({migration.NAME}).")
+        seen.add(migration.VERSION)
+    return migrations
+
+def applied_versions(connection: Connection) -> Set[int]:
+    connection.execute(text(CREATE_MIGRATIONS_TABLE_SQL))
+    return set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+def run_migrations(engine: Engine, target: Optional[int] = None) -> List[int]:
+    """Applies pending migrations up to target (all by default) in a single transaction. Returns the versions applied."""
+    applied = []
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+        done = applied_versions(connection)
+
+        for migration in load_migrations():
+            if migration.VERSION in done or (target is not None and migration.VERSION > target):
+                continue
+            print(f"Applying migration {migration.VERSION:04d} {migration.NAME}")
+            migration.upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": migration.VERSION, "name": migration.NAME},
+            )
+            applied.append(migration.VERSION)
+    return applied
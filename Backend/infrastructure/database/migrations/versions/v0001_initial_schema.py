@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+VERSION = 1
+NAME = "initial_schema"
+
+# Matches the tables Database/main.sql has always created, so databases
+# initialized by the Docker init script take this as a no-op.
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS cafe (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        name VARCHAR(255) NOT NULL,
+        description VARCHAR(255) NOT NULL,
+        logo TEXT,
+        location VARCHAR(255) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS employee (
+        id VARCHAR(9) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        email_address VARCHAR(255) NOT NULL,
+        phone_number VARCHAR(8) NOT NULL,
+        gender VARCHAR(10) NOT NULL CHECK (gender IN ('Male', 'Female'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS employee_cafe (
+        employee_id VARCHAR(9) NOT NULL,
+        cafe_id UUID NOT NULL,
+        start_date DATE NOT NULL,
+        PRIMARY KEY (employee_id, cafe_id),
+        UNIQUE (employee_id),
+        FOREIGN KEY (employee_id) REFERENCES employee (id) ON DELETE CASCADE,
+        FOREIGN KEY (cafe_id) REFERENCES cafe (id) ON DELETE CASCADE
+    )
+    """,
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,30 @@
+from sqlalchemy import text
+
+VERSION = 2
+NAME = "employee_id_sequence_and_table_version"
+
+STATEMENTS = [
+    "CREATE SEQUENCE IF NOT EXISTS employee_id_seq START WITH 1 MINVALUE 1",
+    # Move the sequence past any employees that already exist. Never moves it backwards.
+    """
+    SELECT setval('employee_id_seq', seeded.target)
+    FROM (
+        SELECT GREATEST(
+            (SELECT COALESCE(MAX(CAST(SUBSTRING(id FROM 3) AS INTEGER)), 0) FROM employee),
+            (SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM employee_id_seq)
+        ) AS target
+    ) AS seeded
+    WHERE seeded.target > 0
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS table_version (
+        name VARCHAR(64) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
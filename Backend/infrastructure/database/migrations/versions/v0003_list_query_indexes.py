@@ -0,0 +1,18 @@
+from sqlalchemy import text
+
+VERSION = 3
+NAME = "list_query_indexes"
+
+# cafe.location and cafe.name back the location / cafe filters of the list
+# endpoints, employee_cafe.cafe_id the per-cafe headcount and join, and
+# employee_cafe.start_date lookups by tenure.
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_cafe_location ON cafe (location)",
+    "CREATE INDEX IF NOT EXISTS ix_cafe_name ON cafe (name)",
+    "CREATE INDEX IF NOT EXISTS ix_employee_cafe_cafe_id ON employee_cafe (cafe_id)",
+    "CREATE INDEX IF NOT EXISTS ix_employee_cafe_start_date ON employee_cafe (start_date)",
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
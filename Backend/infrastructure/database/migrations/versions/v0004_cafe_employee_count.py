@@ -0,0 +1,80 @@
+from sqlalchemy import text
+
+VERSION = 4
+NAME = "cafe_employee_count"
+
+# Recomputes every cafe's headcount from employee_cafe, touching only rows that drifted.
+# Frozen with this migration; python -m infrastructure.database.reconcile has its own.
+RECONCILE_EMPLOYEE_COUNT_SQL = """
+UPDATE cafe
+SET employee_count = counts.employees
+FROM (
+    SELECT cafe.id, count(employee_cafe.employee_id) AS employees
+    FROM cafe
+    LEFT JOIN employee_cafe ON employee_cafe.cafe_id = cafe.id
+    GROUP BY cafe.id
+) AS counts
+WHERE cafe.id = counts.id AND cafe.employee_count <> counts.employees
+"""
+
+# Statement-level triggers with transition tables, so a bulk import of
+# thousands of assignments costs one UPDATE per affected cafe, not per row.
+HEADCOUNT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION employee_cafe_headcount() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE cafe SET employee_count = cafe.employee_count + delta.employees
+        FROM (SELECT cafe_id, count(*) AS employees FROM new_rows GROUP BY cafe_id) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE cafe SET employee_count = cafe.employee_count - delta.employees
+        FROM (SELECT cafe_id, count(*) AS employees FROM old_rows GROUP BY cafe_id) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    ELSE
+        UPDATE cafe SET employee_count = cafe.employee_count + delta.employees
+        FROM (
+            SELECT cafe_id, sum(change) AS employees
+            FROM (
+                SELECT cafe_id, 1 AS change FROM new_rows
+                UNION ALL
+                SELECT cafe_id, -1 AS change FROM old_rows
+            ) AS changes
+            GROUP BY cafe_id
+            HAVING sum(change) <> 0
+        ) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+STATEMENTS = [
+    "ALTER TABLE cafe ADD COLUMN IF NOT EXISTS employee_count INTEGER NOT NULL DEFAULT 0",
+    HEADCOUNT_FUNCTION_SQL,
+    "DROP TRIGGER IF EXISTS employee_cafe_headcount_insert ON employee_cafe",
+    "DROP TRIGGER IF EXISTS employee_cafe_headcount_delete ON employee_cafe",
+    "DROP TRIGGER IF EXISTS employee_cafe_headcount_update ON employee_cafe",
+    """
+    CREATE TRIGGER employee_cafe_headcount_insert AFTER INSERT ON employee_cafe
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount()
+    """,
+    """
+    CREATE TRIGGER employee_cafe_headcount_delete AFTER DELETE ON employee_cafe
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount()
+    """,
+    """
+    CREATE TRIGGER employee_cafe_headcount_update AFTER UPDATE ON employee_cafe
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount()
+    """,
+    RECONCILE_EMPLOYEE_COUNT_SQL,
+    # Serves the GET /cafes sort (employees DESC, id DESC) and its keyset cursor.
+    "CREATE INDEX IF NOT EXISTS ix_cafe_employee_count ON cafe (employee_count DESC, id DESC)",
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
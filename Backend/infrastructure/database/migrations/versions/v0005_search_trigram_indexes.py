@@ -0,0 +1,19 @@
+from sqlalchemy import text
+
+VERSION = 5
+NAME = "search_trigram_indexes"
+
+# Trigram GIN indexes serve the substring (ILIKE '%term%') matches of the
+# search endpoints; similarity() from the same extension ranks the results.
+STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_employee_name_trgm ON employee USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_employee_email_address_trgm ON employee USING gin (email_address gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_employee_phone_number_trgm ON employee USING gin (phone_number gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_cafe_name_trgm ON cafe USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_cafe_description_trgm ON cafe USING gin (description gin_trgm_ops)",
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,41 @@
+from sqlalchemy import text
+
+VERSION = 6
+NAME = "employee_cafe_unique_employee"
+
+# Databases created by the old create_all() only have UNIQUE (employee_id, cafe_id),
+# which v0001's CREATE TABLE IF NOT EXISTS left alone. The assignment upsert in
+# update_employee needs ON CONFLICT (employee_id), so each employee keeps one
+# assignment: the most recent (ties broken by cafe id). The headcount triggers
+# from 0004 take the removed rows off their cafes.
+STATEMENTS = [
+    """
+    DELETE FROM employee_cafe AS duplicate
+    USING employee_cafe AS kept
+    WHERE duplicate.employee_id = kept.employee_id
+      AND (duplicate.start_date, duplicate.cafe_id) < (kept.start_date, kept.cafe_id)
+    """,
+    # Databases initialized from main.sql already have the constraint (under this default name).
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1
+            FROM pg_index
+            JOIN pg_attribute ON pg_attribute.attrelid = pg_index.indrelid AND pg_attribute.attnum = pg_index.indkey[0]
+            WHERE pg_index.indrelid = 'employee_cafe'::regclass
+              AND pg_index.indisunique
+              AND pg_index.indnkeyatts = 1
+              AND pg_index.indpred IS NULL
+              AND pg_attribute.attname = 'employee_id'
+        ) THEN
+            ALTER TABLE employee_cafe ADD CONSTRAINT employee_cafe_employee_id_key UNIQUE (employee_id);
+        END IF;
+    END
+    $$
+    """,
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,53 @@
+import threading
+import time
+from sqlalchemy.pool import QueuePool
+
+class PoolStats:
+    def __init__(self, warn_after_ms: float = 0):
+        self._lock = threading.Lock()
+        self.warn_after_ms = warn_after_ms
+        self.checkouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    def record_wait(self, wait_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.last_wait_ms = wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+
+        if self.warn_after_ms and wait_ms > self.warn_after_ms:
+            print(f"Slow connection pool checkout: waited {wait_ms:.1f}ms for a connection")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            average = self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "total_wait_ms": round(self.total_wait_ms, 3),
+                "avg_wait_ms": round(average, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "last_wait_ms": round(self.last_wait_ms, 3),
+            }
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats.warn_after_ms = self.stats.warn_after_ms
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait((time.perf_counter() - started) * 1000)
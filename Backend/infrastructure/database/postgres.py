@@ -1,19 +1,92 @@
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import Callable, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from sqlalchemy.exc import OperationalError
 
-from infrastructure.database.sql_models import Base
+from infrastructure.database.migrations import run_migrations
+from infrastructure.database.pool import TimedQueuePool
+from infrastructure.database.routing import ReplicaMonitor, RoutingSession
+from infrastructure.observability.sql import instrument_engine
+from infrastructure.settings import env_bool, env_float, env_int
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# A streaming replica of DATABASE_URL; when set, query handlers read from it (see ReplicaReadBehavior).
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
 
-def create_db_and_tables():
-    Base.metadata.create_all(bind=engine)
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = env_float("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_WAIT_WARN_MS = env_float("DB_POOL_WAIT_WARN_MS", 100)
+# Connections each worker opens before serving its first request.
+DB_POOL_MIN_SIZE = env_int("DB_POOL_MIN_SIZE", min(2, DB_POOL_SIZE))
+DB_STARTUP_TIMEOUT = env_float("DB_STARTUP_TIMEOUT", 60)
+DB_STARTUP_MAX_DELAY = env_float("DB_STARTUP_MAX_DELAY", 5)
+# Seconds; a replica that does not answer quickly is skipped rather than waited for.
+REPLICA_CONNECT_TIMEOUT = env_int("REPLICA_CONNECT_TIMEOUT", 2)
+
+def create_pooled_engine(url, label: str, **kwargs) -> Engine:
+    pooled_engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        **kwargs,
+    )
+    pooled_engine.pool.stats.warn_after_ms = DB_POOL_WAIT_WARN_MS
+    instrument_engine(pooled_engine, label=label)
+    return pooled_engine
+
+engine = create_pooled_engine(DATABASE_URL, label='sync')
+
+replica_engine: Optional[Engine] = None
+replica_monitor: Optional[ReplicaMonitor] = None
+if REPLICA_DATABASE_URL:
+    connect_args = {'connect_timeout': REPLICA_CONNECT_TIMEOUT} if make_url(REPLICA_DATABASE_URL).get_driver_name() == 'psycopg2' else {}
+    replica_engine = create_pooled_engine(REPLICA_DATABASE_URL, label='replica', connect_args=connect_args)
+    replica_monitor = ReplicaMonitor(replica_engine)
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replica=replica_engine, replica_monitor=replica_monitor)
+
+# One session per thread, i.e. per in-flight request. The Flask app commits or
+# rolls it back after the request and removes it on teardown.
+db_session = scoped_session(SessionLocal)
+
+def run_after_commit(callback: Callable[[], None]):
+    """Runs callback once the current request's transaction commits; it is dropped on rollback."""
+    session = db_session()
+    if not session.in_transaction():
+        return callback()
+    session.info.setdefault('after_commit', []).append(callback)
+
+@event.listens_for(SessionLocal, 'after_commit')
+def _run_after_commit_callbacks(session):
+    for callback in session.info.pop('after_commit', []):
+        callback()
+
+@event.listens_for(SessionLocal, 'after_rollback')
+def _discard_after_commit_callbacks(session):
+    session.info.pop('after_commit', None)
+
+def migrate_database(target: Optional[int] = None):
+    """Brings the schema up to date with the versioned migrations (up to target, if given). Safe to run from several processes at once."""
+    run_migrations(engine, target)
+
+def has_extension(name: str) -> bool:
+    """Whether the extension is installed in the application database."""
+    with engine.connect() as connection:
+        return bool(connection.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = %(name)s", {"name": name}).scalar())
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -22,16 +95,73 @@ def get_db() -> Session:
     finally:
         db.close()
 
-def wait_for_db(max_attempts=10, delay=3):
-    engine = create_engine(DATABASE_URL)
-    
-    for attempt in range(max_attempts):
+def pool_status() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        **pool.stats.snapshot(),
+    }
+
+def wait_for_db(timeout: float = DB_STARTUP_TIMEOUT, initial_delay: float = 0.1, max_delay: float = DB_STARTUP_MAX_DELAY) -> int:
+    """
+    Connects through the application engine until the database answers,
+    backing off exponentially with full jitter so restarting workers do not
+    retry in lockstep. Returns the number of attempts; raises once timeout
+    seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        attempt += 1
         try:
             with engine.connect():
-                print("Database is ready! Continuing application startup.")
-                return
+                print(f"Database is ready after {attempt} attempt(s).")
+                return attempt
         except OperationalError as e:
-            print(f"Database not ready yet (Attempt {attempt+1}/{max_attempts}). Retrying in {delay}s...")
+            delay = random.uniform(0, min(max_delay, initial_delay * 2 ** (attempt - 1)))
+            if time.monotonic() + delay > deadline:
+                raise RuntimeError(f"Database not reachable after {attempt} attempts in {timeout:.0f}s: {e}") from e
+            print(f"Database not ready yet (attempt {attempt}). Retrying in {delay:.2f}s...")
             time.sleep(delay)
-    
-    raise Exception("Failed to connect to the database after multiple attempts.")
\ No newline at end of file
+
+def prewarm_pool(size: int = DB_POOL_MIN_SIZE, target: Optional[Engine] = None) -> int:
+    """
+    Opens size connections of target (the primary by default) in parallel and
+    returns them to the pool, so the first requests do not pay for connection
+    setup. Returns how many opened.
+    """
+    target = target or engine
+    size = min(size, DB_POOL_SIZE)
+    if size <= 0:
+        return 0
+    with ThreadPoolExecutor(max_workers=size, thread_name_prefix='pool-prewarm') as executor:
+        futures = [executor.submit(target.connect) for _ in range(size)]
+    connections, errors = [], []
+    for future in futures:
+        try:
+            connections.append(future.result())
+        except OperationalError as e:
+            errors.append(e)
+    for connection in connections:
+        connection.close()
+    if errors:
+        print(f"Pool prewarm opened {len(connections)}/{size} connections: {errors[0]}")
+    return len(connections)
+
+def replica_status() -> Optional[dict]:
+    """The replica's health and lag (checked again when due), or None without a replica."""
+    if replica_monitor is None:
+        return None
+    replica_monitor.available()
+    return {**replica_monitor.status(), 'checked_out': replica_engine.pool.checkedout()}
+
+def check_database() -> float:
+    """Round trip of a trivial query in milliseconds; raises when the database cannot be reached."""
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+    return (time.perf_counter() - started) * 1000
@@ -0,0 +1,18 @@
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+
+def reconcile_employee_counts() -> int:
+    """Rebuilds the trigger-maintained cafe.employee_count column, e.g. after triggers were disabled for a manual load."""
+    session = SessionLocal()
+    try:
+        fixed = PostgresCafeRepository(session=session).reconcile_employee_counts()
+        session.commit()
+        return fixed
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    print(f"Reconciled employee_count on {reconcile_employee_counts()} cafe(s).")
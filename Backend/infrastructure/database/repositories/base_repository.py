@@ -1,6 +1,56 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from abc import ABC
 
+from domain.exceptions import DomainException
+from infrastructure.database.routing import current_snapshot
+from infrastructure.settings import env_int
+
+# Rows fetched per round-trip from the server-side cursor when streaming.
+STREAM_BATCH_SIZE = env_int("DB_STREAM_BATCH_SIZE", 1000)
+
+def select_columns(columns: Dict[str, object], fields: Optional[List[str]], sort_keys: Sequence[str]) -> list:
+    """Columns for a projected list query. Sort keys are always selected so callers can build the next cursor."""
+    if not fields:
+        return list(columns.values())
+    wanted = set(fields) | set(sort_keys)
+    return [column for name, column in columns.items() if name in wanted]
+
+FOREIGN_KEY_VIOLATION = '23503'
+
+@contextmanager
+def foreign_key_violation_as(message: str):
+    """Lets a write rely on its foreign key instead of a lookup beforehand, reporting a violation as DomainException."""
+    try:
+        yield
+    except IntegrityError as e:
+        if getattr(e.orig, 'pgcode', None) == FOREIGN_KEY_VIOLATION:
+            raise DomainException(message) from e
+        raise
+
 class BaseRepository(ABC):
-    def __init__(self, session: Session):
-        self.session = session
\ No newline at end of file
+    def __init__(self, session: Session, async_session_factory: Optional[async_sessionmaker] = None):
+        self.session = session
+        self.async_session_factory = async_session_factory
+
+    def _stream(self, stmt, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[dict]:
+        result = self.session.execute(stmt.execution_options(yield_per=batch_size))
+        try:
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            result.close()
+
+    async def _fetch_all_async(self, stmt) -> list:
+        if self.async_session_factory is None:
+            raise RuntimeError(f"{self.__class__.__name__} was created without an async session factory.")
+        snapshot = current_snapshot()
+        if isinstance(snapshot, AsyncSession):
+            result = await snapshot.execute(stmt)
+            return [dict(row) for row in result.mappings().all()]
+        async with self.async_session_factory() as session:
+            result = await session.execute(stmt)
+            return [dict(row) for row in result.mappings().all()]
\ No newline at end of file
@@ -0,0 +1,80 @@
+import heapq
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+from application.interfaces.cafe_repository import ICafeRepository
+from application.queries.get_cafe_query import CAFE_SORT_KEYS
+from infrastructure.database.repositories.memory_store import MemoryStore, select_fields
+
+CAFE_COLUMNS = ('name', 'description', 'logo', 'location')
+
+class MemoryCafeRepository(ICafeRepository):
+    """ICafeRepository over a MemoryStore, ordered and filtered exactly like PostgresCafeRepository."""
+
+    def __init__(self, store: MemoryStore, session: Optional[Session] = None):
+        self.store = store
+        self.session = session
+
+    def _all_cafes(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        with self.store.lock:
+            cafe_ids = self.store.cafe_ids_by_location.get(location, ()) if location else self.store.cafes.keys()
+            # (employees DESC, id DESC), the order of ix_cafe_employee_count.
+            keys = [(self.store.headcount(cafe_id), cafe_id) for cafe_id in cafe_ids]
+            if after:
+                after = tuple(after)
+                keys = [key for key in keys if key < after]
+            keys = heapq.nlargest(limit, keys) if limit else sorted(keys, reverse=True)
+            rows = [{**self.store.cafes[cafe_id], 'employees': employees} for employees, cafe_id in keys]
+        return [select_fields(row, fields, CAFE_SORT_KEYS) for row in rows]
+
+    def get_all_cafes(self, location = None, limit = None, after = None, fields = None) -> List[dict]:
+        return self._all_cafes(location, limit, after, fields)
+
+    def iter_all_cafes(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        return iter(self._all_cafes(location, limit, after, fields))
+
+    async def get_all_cafes_async(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        return self._all_cafes(location, limit, after, fields)
+
+    def get_cafe_by_id(self, cafe_id: UUID) -> dict:
+        with self.store.lock:
+            cafe = self.store.cafes.get(cafe_id)
+            return {**cafe, 'employee_count': self.store.headcount(cafe_id)} if cafe else None
+
+    def add_cafe(self, cafe_data: dict) -> UUID:
+        cafe = {'id': cafe_data.get('id') or uuid4(), 'logo': None, **cafe_data}
+        with self.store.write(self.session) as undo:
+            self.store.set_cafe(cafe['id'], cafe, undo)
+        return cafe['id']
+
+    def add_cafes(self, cafes_data: List[dict]) -> List[UUID]:
+        cafes = [{'id': uuid4(), 'logo': None, **cafe_data} for cafe_data in cafes_data]
+        with self.store.write(self.session) as undo:
+            for cafe in cafes:
+                self.store.set_cafe(cafe['id'], cafe, undo)
+        return [cafe['id'] for cafe in cafes]
+
+    def get_existing_cafe_ids(self, cafe_ids: Iterable[UUID]) -> Set[UUID]:
+        with self.store.lock:
+            return {cafe_id for cafe_id in cafe_ids if cafe_id in self.store.cafes}
+
+    def update_cafe(self, cafe_id: UUID, cafe_data: dict) -> dict:
+        with self.store.write(self.session) as undo:
+            cafe = self.store.cafes.get(cafe_id)
+            if cafe is None:
+                raise NoResultFound(f"Cafe with id {cafe_id} not found.")
+            updated = {**cafe, **{name: value for name, value in cafe_data.items() if name in CAFE_COLUMNS}}
+            self.store.set_cafe(cafe_id, updated, undo)
+            return {"previous_location": cafe['location'], "location": updated['location']}
+
+    def delete_cafe(self, cafe_id: UUID) -> dict:
+        with self.store.write(self.session) as undo:
+            cafe = self.store.cafes.get(cafe_id)
+            if cafe is None:
+                raise NoResultFound(f"Cafe with id {cafe_id} not found.")
+            # employee_cafe rows go with the cafe (ON DELETE CASCADE); the employees stay, unassigned.
+            for employee_id in list(self.store.employee_ids_by_cafe.get(cafe_id, ())):
+                self.store.set_assignment(employee_id, None, undo)
+            self.store.set_cafe(cafe_id, None, undo)
+            return {"location": cafe['location']}
@@ -0,0 +1,143 @@
+import heapq
+from datetime import date, datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.orm import Session
+from application.interfaces.employee_repository import IEmployeeRepository
+from application.queries.get_employees_query import EMPLOYEE_SORT_KEYS
+from domain.exceptions import DomainException
+from infrastructure.database.repositories.memory_store import MemoryStore, select_fields
+
+EMPLOYEE_COLUMNS = ('name', 'email_address', 'phone_number', 'gender')
+
+def employee_number(employee_id: str) -> int:
+    return int(employee_id[2:])
+
+def rank(start_date: Optional[date]) -> float:
+    # Descending rank for PostgresEmployeeRepository's start_date ASC NULLS LAST.
+    return -start_date.toordinal() if start_date else float('-inf')
+
+class MemoryEmployeeRepository(IEmployeeRepository):
+    """IEmployeeRepository over a MemoryStore, ordered and filtered exactly like PostgresEmployeeRepository."""
+
+    def __init__(self, store: MemoryStore, session: Optional[Session] = None):
+        self.store = store
+        self.session = session
+
+    def _start_date(self, employee_id: str) -> Optional[date]:
+        assignment = self.store.assignments.get(employee_id)
+        return assignment[1] if assignment else None
+
+    def _row(self, employee: dict, today: date, with_start_date: bool) -> dict:
+        assignment = self.store.assignments.get(employee['id'])
+        cafe_id, start_date = assignment if assignment else (None, None)
+        row = {
+            **employee,
+            'days_worked': (today - start_date).days if start_date else 0,
+            'cafe_id': cafe_id,
+            'cafe_name': self.store.cafes[cafe_id]['name'] if cafe_id else None,
+        }
+        if with_start_date:
+            row['start_date'] = start_date
+        return row
+
+    def _all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        today = datetime.now(timezone.utc).date()
+        with self.store.lock:
+            if cafe_name:
+                employee_ids = [employee_id for cafe_id in self.store.cafe_ids_by_name.get(cafe_name, ()) for employee_id in self.store.employee_ids_by_cafe.get(cafe_id, ())]
+            else:
+                employee_ids = self.store.employees.keys()
+            # Rank bare (start_date, id) keys and build rows only for the page returned.
+            keys = [(rank(self._start_date(employee_id)), employee_id) for employee_id in employee_ids]
+            if after:
+                after = (rank(after[0]), after[1])
+                keys = [key for key in keys if key < after]
+            keys = heapq.nlargest(limit, keys) if limit else sorted(keys, reverse=True)
+            rows = [self._row(self.store.employees[employee_id], today, bool(limit)) for _, employee_id in keys]
+        return [select_fields(row, fields, EMPLOYEE_SORT_KEYS) for row in rows]
+
+    def get_all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        return self._all_employees(cafe_name, limit, after, fields)
+
+    def iter_all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        return iter(self._all_employees(cafe_name, limit, after, fields))
+
+    async def get_all_employees_async(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        return self._all_employees(cafe_name, limit, after, fields)
+
+    def get_employee_by_id(self, employee_id: str) -> Optional[dict]:
+        with self.store.lock:
+            employee = self.store.employees.get(employee_id)
+            return dict(employee) if employee else None
+
+    def _check_cafe(self, cafe_id: Optional[UUID]) -> None:
+        if cafe_id and cafe_id not in self.store.cafes:
+            raise DomainException(f"Assigned Cafe ID {cafe_id} does not exist")
+
+    def _insert(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID], undo) -> None:
+        if employee_id in self.store.employees:
+            raise IntegrityError("INSERT INTO employee", {"id": employee_id}, ValueError(f"Key (id)=({employee_id}) already exists."))
+        self.store.set_employee(employee_id, {'id': employee_id, **{name: employee_data[name] for name in EMPLOYEE_COLUMNS}}, undo)
+        if cafe_id:
+            self.store.set_assignment(employee_id, (cafe_id, datetime.now(timezone.utc).date()), undo)
+
+    def add_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
+        with self.store.write(self.session) as undo:
+            self._check_cafe(cafe_id)
+            self._insert(employee_id, employee_data, cafe_id, undo)
+            return {"id": employee_id, "cafe_location": self.store.cafes[cafe_id]['location'] if cafe_id else None}
+
+    def add_employees(self, employees: List[Tuple[str, dict, Optional[UUID]]]) -> List[str]:
+        with self.store.write(self.session) as undo:
+            for employee_id, employee_data, cafe_id in employees:
+                if cafe_id and cafe_id not in self.store.cafes:
+                    raise IntegrityError("INSERT INTO employee_cafe", {"cafe_id": cafe_id}, ValueError(f"Key (cafe_id)=({cafe_id}) is not present in table \"cafe\"."))
+                self._insert(employee_id, employee_data, cafe_id, undo)
+        return [employee_id for employee_id, _, _ in employees]
+
+    def update_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
+        with self.store.write(self.session) as undo:
+            self._check_cafe(cafe_id)
+            employee = self.store.employees.get(employee_id)
+            if employee is None:
+                raise NoResultFound(f"Employee with ID {employee_id} not found")
+            previous = self.store.assignments.get(employee_id)
+            previous_cafe_id = previous[0] if previous else None
+
+            if employee_data:
+                self.store.set_employee(employee_id, {**employee, **{name: value for name, value in employee_data.items() if name in EMPLOYEE_COLUMNS}}, undo)
+            # The start date only resets when the cafe actually changes.
+            if cafe_id != previous_cafe_id:
+                self.store.set_assignment(employee_id, (cafe_id, datetime.now(timezone.utc).date()) if cafe_id else None, undo)
+            return {
+                "reassigned": cafe_id != previous_cafe_id,
+                "previous_location": self._location(previous_cafe_id),
+                "cafe_location": self._location(cafe_id),
+            }
+
+    def _location(self, cafe_id: Optional[UUID]) -> Optional[str]:
+        return self.store.cafes[cafe_id]['location'] if cafe_id else None
+
+    def delete_employee(self, employee_id: str) -> dict:
+        with self.store.write(self.session) as undo:
+            if employee_id not in self.store.employees:
+                raise NoResultFound(f"Employee with id {employee_id} not found.")
+            assignment = self.store.assignments.get(employee_id)
+            self.store.set_assignment(employee_id, None, undo)
+            self.store.set_employee(employee_id, None, undo)
+            return {"cafe_location": self._location(assignment[0] if assignment else None)}
+
+    def is_assigned_to_cafe(self, employee_id: str) -> bool:
+        return employee_id in self.store.assignments
+
+    def get_last_employee_id(self) -> Optional[int]:
+        with self.store.lock:
+            return max(map(employee_number, self.store.employees), default=0)
+
+    def allocate_employee_numbers(self, count: int = 1) -> List[int]:
+        with self.store.lock:
+            first = self.store.last_employee_number + 1
+            self.store.last_employee_number += count
+        return list(range(first, first + count))
@@ -0,0 +1,183 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+Undo = List[Callable[[], None]]
+
+def select_fields(row: dict, fields: Optional[List[str]], sort_keys: Sequence[str]) -> dict:
+    """The in-memory counterpart of select_columns: sort keys are always kept so callers can build the next cursor."""
+    if not fields:
+        return row
+    wanted = set(fields) | set(sort_keys)
+    return {name: value for name, value in row.items() if name in wanted}
+
+class MemoryStore:
+    """
+    Tables for the in-memory repositories, with hash indexes on cafe id, name
+    and location and on employee id and cafe. A cafe's headcount is the size
+    of its employee set, so it is maintained by every assignment change.
+
+    Writes made through a session join its transaction: committing keeps
+    them, while a rollback (or closing the session without committing) undoes
+    them, savepoints included. Concurrent transactions see each other's
+    uncommitted writes; there is no isolation beyond single statements.
+    """
+
+    def __init__(self):
+        self.cafes: Dict[UUID, dict] = {}
+        self.cafe_ids_by_name: Dict[str, Set[UUID]] = defaultdict(set)
+        self.cafe_ids_by_location: Dict[str, Set[UUID]] = defaultdict(set)
+        self.employees: Dict[str, dict] = {}
+        # employee id -> (cafe id, start date); one cafe per employee, as in employee_cafe.
+        self.assignments: Dict[str, Tuple[UUID, date]] = {}
+        self.employee_ids_by_cafe: Dict[UUID, Set[str]] = defaultdict(set)
+        self.versions: Dict[str, Tuple[int, datetime]] = {}
+        # Like a Postgres sequence, allocations are never rolled back.
+        self.last_employee_number = 0
+        self.lock = threading.RLock()
+
+        self._journal: Dict[object, Undo] = {}
+        self._committed: Set[object] = set()
+
+    def headcount(self, cafe_id: UUID) -> int:
+        employee_ids = self.employee_ids_by_cafe.get(cafe_id)
+        return len(employee_ids) if employee_ids else 0
+
+    @contextmanager
+    def write(self, session: Optional[Session] = None) -> Iterator[Undo]:
+        """
+        Holds the store lock for one repository write. The block records how to
+        reverse each change in the yielded list (the set_* methods do this);
+        if it raises, its changes are reversed at once, so every write is all
+        or nothing.
+        """
+        with self.lock:
+            undo: Undo = []
+            try:
+                yield undo
+            except BaseException:
+                self._reverse(undo)
+                raise
+            if undo and session is not None:
+                self._join(session, undo)
+
+    def set_cafe(self, cafe_id: UUID, row: Optional[dict], undo: Undo) -> None:
+        self._change(self._apply_cafe, cafe_id, row, undo)
+
+    def set_employee(self, employee_id: str, row: Optional[dict], undo: Undo) -> None:
+        self._change(self._apply_employee, employee_id, row, undo)
+
+    def set_assignment(self, employee_id: str, assignment: Optional[Tuple[UUID, date]], undo: Undo) -> None:
+        self._change(self._apply_assignment, employee_id, assignment, undo)
+
+    def set_version(self, name: str, version: Tuple[int, datetime], undo: Undo) -> None:
+        self._change(self._apply_version, name, version, undo)
+
+    def _change(self, apply: Callable, key, value, undo: Undo) -> None:
+        previous = apply(key, value)
+        undo.append(lambda: apply(key, previous))
+
+    def _apply_cafe(self, cafe_id: UUID, row: Optional[dict]) -> Optional[dict]:
+        previous = self.cafes.pop(cafe_id, None)
+        if previous is not None:
+            self._discard(self.cafe_ids_by_name, previous['name'], cafe_id)
+            self._discard(self.cafe_ids_by_location, previous['location'], cafe_id)
+        if row is not None:
+            self.cafes[cafe_id] = row
+            self.cafe_ids_by_name[row['name']].add(cafe_id)
+            self.cafe_ids_by_location[row['location']].add(cafe_id)
+        return previous
+
+    def _apply_employee(self, employee_id: str, row: Optional[dict]) -> Optional[dict]:
+        previous = self.employees.pop(employee_id, None)
+        if row is not None:
+            self.employees[employee_id] = row
+        return previous
+
+    def _apply_assignment(self, employee_id: str, assignment: Optional[Tuple[UUID, date]]) -> Optional[Tuple[UUID, date]]:
+        previous = self.assignments.pop(employee_id, None)
+        if previous is not None:
+            self._discard(self.employee_ids_by_cafe, previous[0], employee_id)
+        if assignment is not None:
+            self.assignments[employee_id] = assignment
+            self.employee_ids_by_cafe[assignment[0]].add(employee_id)
+        return previous
+
+    def _apply_version(self, name: str, version: Optional[Tuple[int, datetime]]) -> Optional[Tuple[int, datetime]]:
+        previous = self.versions.pop(name, None)
+        if version is not None:
+            self.versions[name] = version
+        return previous
+
+    @staticmethod
+    def _discard(index: Dict, key, value) -> None:
+        members = index.get(key)
+        if members is not None:
+            members.discard(value)
+            if not members:
+                del index[key]
+
+    @staticmethod
+    def _reverse(undo: Undo) -> None:
+        for action in reversed(undo):
+            action()
+
+    def _join(self, session: Session, undo: Undo) -> None:
+        # Repositories hold the scoped_session proxy; the journal is keyed by the real session's transaction.
+        if hasattr(session, 'registry'):
+            session = session()
+        # Listen on the session itself, not the Session class, so the listeners go away with it.
+        if not event.contains(session, 'after_transaction_end', self._after_transaction_end):
+            event.listen(session, 'after_commit', self._after_commit)
+            event.listen(session, 'after_transaction_end', self._after_transaction_end)
+        transaction = session.get_nested_transaction() or session.get_transaction() or session.begin()
+        self._journal.setdefault(transaction, []).extend(undo)
+
+    def _after_commit(self, session: Session) -> None:
+        transaction = session.get_nested_transaction() or session.get_transaction()
+        if transaction in self._journal:
+            self._committed.add(transaction)
+
+    def _after_transaction_end(self, session: Session, transaction) -> None:
+        if transaction not in self._journal:
+            return
+        with self.lock:
+            undo = self._journal.pop(transaction)
+            if transaction in self._committed:
+                self._committed.discard(transaction)
+                # A released savepoint's changes now belong to the enclosing transaction.
+                if transaction.parent is not None:
+                    self._journal.setdefault(transaction.parent, []).extend(undo)
+            else:
+                self._reverse(undo)
+
+def load_from_database(store: MemoryStore) -> MemoryStore:
+    """Copies the cafe, employee and assignment tables into store, e.g. to profile handlers on realistic data without database time."""
+    from sqlalchemy import select
+    from infrastructure.database.postgres import SessionLocal
+    from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+    from infrastructure.database.sql_models import CafeModel, EmployeeCafeModel, EmployeeModel, TableVersionModel
+
+    session = SessionLocal()
+    undo: Undo = []
+    try:
+        with store.lock:
+            for row in session.execute(select(CafeModel.id, CafeModel.name, CafeModel.description, CafeModel.logo, CafeModel.location)).mappings():
+                store.set_cafe(row['id'], dict(row), undo)
+            for row in session.execute(select(EmployeeModel.id, EmployeeModel.name, EmployeeModel.email_address, EmployeeModel.phone_number, EmployeeModel.gender)).mappings():
+                store.set_employee(row['id'], dict(row), undo)
+            for employee_id, cafe_id, start_date in session.execute(select(EmployeeCafeModel.employee_id, EmployeeCafeModel.cafe_id, EmployeeCafeModel.start_date)):
+                store.set_assignment(employee_id, (cafe_id, start_date), undo)
+            for name, version, updated_at in session.execute(select(TableVersionModel.name, TableVersionModel.version, TableVersionModel.updated_at)):
+                store.set_version(name, (version, updated_at), undo)
+            store.last_employee_number = max(store.last_employee_number, PostgresEmployeeRepository(session=session).get_last_employee_id())
+    finally:
+        session.close()
+    print(f"Loaded {len(store.cafes)} cafes and {len(store.employees)} employees into the memory store.")
+    return store
@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from application.interfaces.version_repository import IVersionRepository
+from infrastructure.database.repositories.memory_store import MemoryStore
+from infrastructure.database.repositories.postgres_version import NEVER_MODIFIED
+
+class MemoryVersionRepository(IVersionRepository):
+    def __init__(self, store: MemoryStore, session: Optional[Session] = None):
+        self.store = store
+        self.session = session
+
+    def get_version(self, resource: str) -> Tuple[int, datetime]:
+        return self.store.versions.get(resource, (0, NEVER_MODIFIED))
+
+    async def get_version_async(self, resource: str) -> Tuple[int, datetime]:
+        return self.get_version(resource)
+
+    def bump(self, *resources: str) -> None:
+        now = datetime.now(timezone.utc)
+        with self.store.write(self.session) as undo:
+            for name in sorted(set(resources)):
+                version, _ = self.get_version(name)
+                self.store.set_version(name, (version + 1, now), undo)
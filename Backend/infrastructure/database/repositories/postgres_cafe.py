@@ -1,42 +1,53 @@
-from typing import List, Optional
-from uuid import UUID
-from sqlalchemy import func, select, delete, update
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import func, select, delete, update, insert, text, tuple_
 from sqlalchemy.exc import NoResultFound, IntegrityError
+from sqlalchemy.orm import aliased
 from application.interfaces.cafe_repository import ICafeRepository
-from infrastructure.database.repositories.base_repository import BaseRepository
+from application.queries.get_cafe_query import CAFE_SORT_KEYS
+from infrastructure.database.repositories.base_repository import BaseRepository, select_columns
 from infrastructure.database.sql_models import CafeModel, EmployeeCafeModel
 
 class PostgresCafeRepository(BaseRepository, ICafeRepository):
-    def get_all_cafes(self, location = None) -> List[dict]:
-        employee_count = (
-            select (
-                EmployeeCafeModel.cafe_id, 
-                func.count(EmployeeCafeModel.employee_id).label('employee_count')
-            )
-            .group_by(EmployeeCafeModel.cafe_id)
-            .subquery()
-        )
+    def _all_cafes_statement(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None):
+        columns = {
+            'id': CafeModel.id,
+            'name': CafeModel.name,
+            'description': CafeModel.description,
+            'logo': CafeModel.logo,
+            'location': CafeModel.location,
+            'employees': CafeModel.employee_count.label('employees'),
+        }
+        # employee_count is maintained by triggers and indexed as (employee_count DESC, id DESC),
+        # so this is an index scan however many employees there are.
         stm = select(
-            CafeModel.id,
-            CafeModel.name,
-            CafeModel.description,
-            CafeModel.logo,
-            CafeModel.location,
-            func.coalesce(employee_count.c.employee_count, 0).label('employees')
-        ).outerjoin(
-            employee_count,
-            CafeModel.id == employee_count.c.cafe_id
+            *select_columns(columns, fields, CAFE_SORT_KEYS)
         ).order_by(
-            func.coalesce(employee_count.c.employee_count, 0).desc()
+            CafeModel.employee_count.desc(),
+            CafeModel.id.desc()
         )
 
         if location:
             stm = stm.where(CafeModel.location == location)
+        if after:
+            stm = stm.where(tuple_(CafeModel.employee_count, CafeModel.id) < tuple_(*after))
+        if limit:
+            stm = stm.limit(limit)
+
+        return stm
 
+    def get_all_cafes(self, location = None, limit = None, after = None, fields = None) -> List[dict]:
+        stm = self._all_cafes_statement(location, limit, after, fields)
         result = self.session.execute(stm).mappings().all()
 
         return [dict(row) for row in result]
 
+    def iter_all_cafes(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        return self._stream(self._all_cafes_statement(location, limit, after, fields))
+
+    async def get_all_cafes_async(self, location: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[int, UUID]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        return await self._fetch_all_async(self._all_cafes_statement(location, limit, after, fields))
+
     def get_cafe_by_id(self, cafe_id: UUID) -> dict:
         stmt = select(CafeModel).where(CafeModel.id == cafe_id)
         try:
@@ -54,21 +65,54 @@ class PostgresCafeRepository(BaseRepository, ICafeRepository):
         self.session.flush()
         return new_cafe.id
     
-    def update_cafe(self, cafe_id: UUID, cafe_data: dict):
+    def add_cafes(self, cafes_data: List[dict]) -> List[UUID]:
+        rows = [{"id": uuid4(), "logo": None, **cafe_data} for cafe_data in cafes_data]
+        self.session.execute(insert(CafeModel), rows)
+        return [row["id"] for row in rows]
+
+    def get_existing_cafe_ids(self, cafe_ids: Iterable[UUID]) -> Set[UUID]:
+        stmt = select(CafeModel.id).where(CafeModel.id.in_(list(cafe_ids)))
+        return set(self.session.scalars(stmt))
+    
+    def update_cafe(self, cafe_id: UUID, cafe_data: dict) -> dict:
+        # A subquery in RETURNING sees the row as it was before the update.
+        before = aliased(CafeModel)
+        previous_location = select(before.location).where(before.id == cafe_id).scalar_subquery()
         try:
-            stmt = update(CafeModel).where(CafeModel.id == cafe_id).values(**cafe_data)
-            result = self.session.execute(stmt)
-            if result.rowcount == 0:
+            stmt = update(CafeModel).where(CafeModel.id == cafe_id).values(**cafe_data).returning(previous_location, CafeModel.location)
+            row = self.session.execute(stmt).one_or_none()
+            if row is None:
                 raise NoResultFound(f"Cafe with id {cafe_id} not found.")
+            return {"previous_location": row[0], "location": row.location}
         except IntegrityError as e:
             raise ValueError(f"Integrity error occurred: {str(e)}")
         except Exception as e:
             raise
     
-    def delete_cafe(self, cafe_id: UUID) -> None:
-        stmt = delete(CafeModel).where(CafeModel.id == cafe_id)
-        result = self.session.execute(stmt)
-        if result.rowcount == 0:
+    def reconcile_employee_counts(self) -> int:
+        """Rebuilds cafe.employee_count from employee_cafe. Returns the number of cafes that had drifted."""
+        # SHARE mode lets reads continue but holds assignment writes until the recount commits.
+        self.session.execute(text("LOCK TABLE employee_cafe IN SHARE MODE"))
+        # The same recount migration 0004 ran when it added the column, touching only cafes that drifted.
+        counted = aliased(CafeModel)
+        counts = (
+            select(counted.id, func.count(EmployeeCafeModel.employee_id).label('employees'))
+            .outerjoin(EmployeeCafeModel, EmployeeCafeModel.cafe_id == counted.id)
+            .group_by(counted.id)
+            .subquery('counts')
+        )
+        stmt = (
+            update(CafeModel)
+            .where(CafeModel.id == counts.c.id, CafeModel.employee_count != counts.c.employees)
+            .values(employee_count=counts.c.employees)
+        )
+        return self.session.execute(stmt).rowcount
+
+    def delete_cafe(self, cafe_id: UUID) -> dict:
+        stmt = delete(CafeModel).where(CafeModel.id == cafe_id).returning(CafeModel.location)
+        location = self.session.execute(stmt).scalar_one_or_none()
+        if location is None:
             raise NoResultFound(f"Cafe with id {cafe_id} not found.")
+        return {"location": location}
         
     
\ No newline at end of file
@@ -1,25 +1,35 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from uuid import UUID
-from datetime import date, datetime
-from sqlalchemy import func, select, delete, update, Date, Integer
+from datetime import date, datetime, timezone
+from sqlalchemy import func, select, delete, update, insert, literal, null, and_, or_, Date, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import NoResultFound, IntegrityError
 from application.interfaces.employee_repository import IEmployeeRepository
-from infrastructure.database.repositories.base_repository import BaseRepository
-from infrastructure.database.sql_models import EmployeeModel, EmployeeCafeModel, CafeModel
+from application.queries.get_employees_query import EMPLOYEE_SORT_KEYS
+from infrastructure.database.repositories.base_repository import BaseRepository, foreign_key_violation_as, select_columns
+from infrastructure.database.sql_models import EmployeeModel, EmployeeCafeModel, CafeModel, employee_id_sequence
 
 class PostgresEmployeeRepository(BaseRepository, IEmployeeRepository):
-    def get_all_employees(self, cafe_name: Optional[str] = None) -> List[dict]:
-        days_worked = func.current_date() - func.cast(EmployeeCafeModel.start_date, Date)
+    def _all_employees_statement(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None):
+        # Start dates are UTC dates, so today is too (not the session's current_date).
+        today = func.cast(func.timezone('UTC', func.now()), Date)
+        days_worked = func.coalesce(today - EmployeeCafeModel.start_date, 0)
+        columns = {
+            'id': EmployeeModel.id,
+            'name': EmployeeModel.name,
+            'email_address': EmployeeModel.email_address,
+            'phone_number': EmployeeModel.phone_number,
+            'gender': EmployeeModel.gender,
+            'days_worked': days_worked.label('days_worked'),
+            'cafe_id': EmployeeCafeModel.cafe_id,
+            'cafe_name': CafeModel.name.label('cafe_name'),
+        }
+        if limit:
+            # Keyset pages carry start_date for the next cursor; the query handler projects it away.
+            columns['start_date'] = EmployeeCafeModel.start_date
 
         stmt = select(
-            EmployeeModel.id,
-            EmployeeModel.name,
-            EmployeeModel.email_address,
-            EmployeeModel.phone_number,
-            EmployeeModel.gender,
-            func.coalesce(days_worked, 0).label('days_worked'),
-            EmployeeCafeModel.cafe_id,
-            CafeModel.name.label('cafe_name'),
+            *select_columns(columns, fields, EMPLOYEE_SORT_KEYS)
             ).outerjoin(
                 EmployeeCafeModel, 
                 EmployeeModel.id == EmployeeCafeModel.employee_id
@@ -27,15 +37,39 @@ class PostgresEmployeeRepository(BaseRepository, IEmployeeRepository):
                     CafeModel, 
                     EmployeeCafeModel.cafe_id == CafeModel.id
                     ).order_by(
-                        func.coalesce(days_worked, 0).desc()
+                        # Longest serving first, like days_worked descending, but on a column that does not change overnight.
+                        EmployeeCafeModel.start_date.asc().nulls_last(),
+                        EmployeeModel.id.desc()
                         )
     
         if cafe_name:
             stmt = stmt.where(CafeModel.name == cafe_name)
+        if after:
+            after_start_date, after_id = after
+            if after_start_date is None:
+                stmt = stmt.where(EmployeeCafeModel.start_date.is_(None), EmployeeModel.id < after_id)
+            else:
+                stmt = stmt.where(or_(
+                    EmployeeCafeModel.start_date > after_start_date,
+                    and_(EmployeeCafeModel.start_date == after_start_date, EmployeeModel.id < after_id),
+                    EmployeeCafeModel.start_date.is_(None)
+                    ))
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return stmt
 
+    def get_all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        stmt = self._all_employees_statement(cafe_name, limit, after, fields)
         results = self.session.execute(stmt).mappings().all()
         return [dict(result) for result in results]
 
+    def iter_all_employees(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> Iterator[dict]:
+        return self._stream(self._all_employees_statement(cafe_name, limit, after, fields))
+
+    async def get_all_employees_async(self, cafe_name: Optional[str] = None, limit: Optional[int] = None, after: Optional[Tuple[Optional[date], str]] = None, fields: Optional[List[str]] = None) -> List[dict]:
+        return await self._fetch_all_async(self._all_employees_statement(cafe_name, limit, after, fields))
+
     def get_employee_by_id(self, employee_id: str) -> Optional[dict]:
         stmt = select(EmployeeModel).where(EmployeeModel.id == employee_id)
         try:
@@ -47,52 +81,109 @@ class PostgresEmployeeRepository(BaseRepository, IEmployeeRepository):
         except Exception:
             return None
         
-    def add_employee(self, employee_id: str, employee_data: dict, cafe_id: UUID) -> dict:
-        new_employee = EmployeeModel(id = employee_id, **employee_data)
-        self.session.add(new_employee)
-        if cafe_id:
-            assignment = EmployeeCafeModel(
-                employee_id = new_employee.id,
-                cafe_id = cafe_id,
-                start_date = date.today()
+    def add_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
+        """
+        Inserts the employee and their assignment in one statement. Returns the
+        new id and the assigned cafe's location (None when unassigned).
+        An unknown cafe_id fails the foreign key and raises DomainException.
+        """
+        new_employee = (
+            insert(EmployeeModel)
+            .values(id = employee_id, **employee_data)
+            .returning(EmployeeModel.id)
+            .cte('new_employee')
+        )
+        if not cafe_id:
+            stmt = select(new_employee.c.id, null().label('location'))
+        else:
+            assignment = (
+                insert(EmployeeCafeModel)
+                .from_select(
+                    ['employee_id', 'cafe_id', 'start_date'],
+                    select(new_employee.c.id, literal(cafe_id, CafeModel.id.type), literal(datetime.now(timezone.utc).date(), Date()))
+                )
+                .returning(EmployeeCafeModel.employee_id, EmployeeCafeModel.cafe_id)
+                .cte('assignment')
             )
-            self.session.add(assignment)
-        self.session.flush()
-        return new_employee.id
+            stmt = select(assignment.c.employee_id.label('id'), CafeModel.location).join(CafeModel, CafeModel.id == assignment.c.cafe_id)
+
+        with foreign_key_violation_as(f"Assigned Cafe ID {cafe_id} does not exist"):
+            row = self.session.execute(stmt).one()
+        return {"id": row.id, "cafe_location": row.location}
+    
+    def add_employees(self, employees: List[Tuple[str, dict, Optional[UUID]]]) -> List[str]:
+        # Multi-row INSERTs (batched by SQLAlchemy's insertmanyvalues) instead of one flush per employee.
+        self.session.execute(insert(EmployeeModel), [{"id": employee_id, **employee_data} for employee_id, employee_data, _ in employees])
+        assignments = [
+            {"employee_id": employee_id, "cafe_id": cafe_id, "start_date": datetime.now(timezone.utc).date()}
+            for employee_id, _, cafe_id in employees if cafe_id
+        ]
+        if assignments:
+            self.session.execute(insert(EmployeeCafeModel), assignments)
+        return [employee_id for employee_id, _, _ in employees]
     
-    def update_employee(self, employee_id, employee_data, cafe_id: Optional[UUID]):
-        stmt = update(EmployeeModel).where(EmployeeModel.id == employee_id).values(**employee_data)
-        result = self.session.execute(stmt)
+    def update_employee(self, employee_id: str, employee_data: dict, cafe_id: Optional[UUID]) -> dict:
+        """
+        Updates the employee and moves, keeps or removes their assignment in one
+        statement. The start date only resets when the cafe actually changes.
+        Returns whether the cafe changed and the previous and new cafe locations;
+        raises NoResultFound for an unknown employee and DomainException for an
+        unknown cafe_id.
+        """
+        if employee_data:
+            target = update(EmployeeModel).where(EmployeeModel.id == employee_id).values(**employee_data).returning(EmployeeModel.id).cte('target')
+        else:
+            target = select(EmployeeModel.id).where(EmployeeModel.id == employee_id).cte('target')
+        # Every part of the statement sees the same snapshot, so this is the assignment before the change.
+        previous_location = (
+            select(CafeModel.location)
+            .join(EmployeeCafeModel, EmployeeCafeModel.cafe_id == CafeModel.id)
+            .where(EmployeeCafeModel.employee_id == employee_id)
+            .scalar_subquery()
+        )
+        cafe_location = select(CafeModel.location).where(CafeModel.id == cafe_id).scalar_subquery() if cafe_id else null()
 
-        if result.rowcount == 0:
-            raise NoResultFound(f"Employee with ID {employee_id} not found")
+        if cafe_id:
+            upsert = pg_insert(EmployeeCafeModel).from_select(
+                ['employee_id', 'cafe_id', 'start_date'],
+                select(target.c.id, literal(cafe_id, CafeModel.id.type), literal(datetime.now(timezone.utc).date(), Date()))
+            )
+            assignment = upsert.on_conflict_do_update(
+                index_elements = [EmployeeCafeModel.employee_id],
+                set_ = {'cafe_id': upsert.excluded.cafe_id, 'start_date': upsert.excluded.start_date},
+                where = EmployeeCafeModel.cafe_id.is_distinct_from(upsert.excluded.cafe_id)
+            )
+        else:
+            assignment = delete(EmployeeCafeModel).where(EmployeeCafeModel.employee_id.in_(select(target.c.id)))
+        assignment = assignment.returning(EmployeeCafeModel.employee_id).cte('assignment')
 
-        current_assignment_stmt = select(EmployeeCafeModel).where(EmployeeCafeModel.employee_id == employee_id)
-        current_assignment = self.session.scalar(current_assignment_stmt)
+        stmt = select(
+            select(func.count()).select_from(target).scalar_subquery().label('updated'),
+            select(func.count()).select_from(assignment).scalar_subquery().label('assigned'),
+            previous_location.label('previous_location'),
+            cafe_location.label('cafe_location'),
+        )
+        with foreign_key_violation_as(f"Assigned Cafe ID {cafe_id} does not exist"):
+            row = self.session.execute(stmt).one()
 
-        if cafe_id:
-            if current_assignment:
-                if current_assignment.cafe_id != cafe_id:
-                    current_assignment.start_date = date.today()
-                current_assignment.cafe_id = cafe_id
-                self.session.flush()
-            else:
-                assignment = EmployeeCafeModel(
-                    employee_id = employee_id,
-                    cafe_id = cafe_id,
-                    start_date = date.today()
-                )
-                self.session.add(assignment)
-                self.session.flush()
-        elif current_assignment:
-            self.session.delete(current_assignment)
-            self.session.flush()
+        if row.updated == 0:
+            raise NoResultFound(f"Employee with ID {employee_id} not found")
+        # The assignment CTE only returns a row when the cafe changed or the assignment was removed.
+        return {"reassigned": row.assigned > 0, "previous_location": row.previous_location, "cafe_location": row.cafe_location}
     
-    def delete_employee(self, employee_id: str):
-        stmt = delete(EmployeeModel).where(EmployeeModel.id == employee_id)
-        result = self.session.execute(stmt)
-        if result.rowcount == 0:
+    def delete_employee(self, employee_id: str) -> dict:
+        # Like every subquery in the statement, this one sees the assignment before the cascade removes it.
+        cafe_location = (
+            select(CafeModel.location)
+            .join(EmployeeCafeModel, EmployeeCafeModel.cafe_id == CafeModel.id)
+            .where(EmployeeCafeModel.employee_id == employee_id)
+            .scalar_subquery()
+        )
+        stmt = delete(EmployeeModel).where(EmployeeModel.id == employee_id).returning(EmployeeModel.id, cafe_location.label('cafe_location'))
+        row = self.session.execute(stmt).one_or_none()
+        if row is None:
             raise NoResultFound(f"Employee with id {employee_id} not found.")
+        return {"cafe_location": row.cafe_location}
         
     def is_assigned_to_cafe(self, employee_id: str) -> bool:
         stmt = select(EmployeeCafeModel).where(EmployeeCafeModel.employee_id == employee_id)
@@ -109,4 +200,10 @@ class PostgresEmployeeRepository(BaseRepository, IEmployeeRepository):
         if result is not None:
             return result
         else:
-            return 0
\ No newline at end of file
+            return 0
+
+    def allocate_employee_numbers(self, count: int = 1) -> List[int]:
+        if count == 1:
+            return [self.session.scalar(select(employee_id_sequence.next_value()))]
+        stmt = select(employee_id_sequence.next_value()).select_from(func.generate_series(1, count))
+        return list(self.session.scalars(stmt))
\ No newline at end of file
@@ -0,0 +1,53 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Float, case, cast, func, literal, or_, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from application.interfaces.search_repository import ISearchRepository
+from infrastructure.database.repositories.base_repository import BaseRepository
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+from infrastructure.database.sql_models import CafeModel, EmployeeModel
+
+def like_escape(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def search_score(columns: list, term: str):
+    """
+    Best trigram similarity across the columns, plus 1 when any column starts
+    with the term so prefix (type-ahead) matches always rank first.
+    """
+    prefix = like_escape(term) + '%'
+    similarity = func.greatest(*[func.similarity(column, term) for column in columns])
+    starts_with = case((or_(*[column.ilike(prefix, escape='\\') for column in columns]), 1.0), else_=0.0)
+    return cast(similarity, Float) + starts_with
+
+def search_filter(columns: list, term: str):
+    # Substring matches on each column are served by its trigram GIN index (migration 0005).
+    pattern = '%' + like_escape(term) + '%'
+    return or_(*[column.ilike(pattern, escape='\\') for column in columns])
+
+class PostgresSearchRepository(BaseRepository, ISearchRepository):
+    EMPLOYEE_COLUMNS = [EmployeeModel.name, EmployeeModel.email_address, EmployeeModel.phone_number]
+    CAFE_COLUMNS = [CafeModel.name, CafeModel.description]
+
+    def __init__(self, session: Session, async_session_factory: Optional[async_sessionmaker] = None):
+        super().__init__(session, async_session_factory)
+        self.employees = PostgresEmployeeRepository(session=session)
+        self.cafes = PostgresCafeRepository(session=session)
+
+    def search_employees(self, term: str, limit: int, after: Optional[Tuple[float, str]] = None) -> List[dict]:
+        score = search_score(self.EMPLOYEE_COLUMNS, term)
+        stmt = self.employees._all_employees_statement().order_by(None).add_columns(score.label('score'))
+        stmt = stmt.where(search_filter(self.EMPLOYEE_COLUMNS, term)).order_by(score.desc(), EmployeeModel.id.desc())
+        if after:
+            stmt = stmt.where(tuple_(score, EmployeeModel.id) < tuple_(literal(after[0], Float), after[1]))
+        return [dict(row) for row in self.session.execute(stmt.limit(limit)).mappings()]
+
+    def search_cafes(self, term: str, limit: int, after: Optional[Tuple[float, UUID]] = None) -> List[dict]:
+        score = search_score(self.CAFE_COLUMNS, term)
+        stmt = self.cafes._all_cafes_statement().order_by(None).add_columns(score.label('score'))
+        stmt = stmt.where(search_filter(self.CAFE_COLUMNS, term)).order_by(score.desc(), CafeModel.id.desc())
+        if after:
+            stmt = stmt.where(tuple_(score, CafeModel.id) < tuple_(literal(after[0], Float), after[1]))
+        return [dict(row) for row in self.session.execute(stmt.limit(limit)).mappings()]
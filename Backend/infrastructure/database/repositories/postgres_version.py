@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Tuple
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from application.interfaces.version_repository import IVersionRepository
+from infrastructure.database.repositories.base_repository import BaseRepository
+from infrastructure.database.sql_models import TableVersionModel
+
+NEVER_MODIFIED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class PostgresVersionRepository(BaseRepository, IVersionRepository):
+    def _version_statement(self, resource: str):
+        return select(TableVersionModel.version, TableVersionModel.updated_at).where(TableVersionModel.name == resource)
+
+    def get_version(self, resource: str) -> Tuple[int, datetime]:
+        row = self.session.execute(self._version_statement(resource)).first()
+        return (row.version, row.updated_at) if row else (0, NEVER_MODIFIED)
+
+    async def get_version_async(self, resource: str) -> Tuple[int, datetime]:
+        rows = await self._fetch_all_async(self._version_statement(resource))
+        return (rows[0]['version'], rows[0]['updated_at']) if rows else (0, NEVER_MODIFIED)
+
+    def bump(self, *resources: str) -> None:
+        # Sorted so concurrent writers always lock the counter rows in the same order.
+        names = sorted(set(resources))
+        stmt = insert(TableVersionModel).values([{"name": name, "version": 1} for name in names])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TableVersionModel.name],
+            set_={"version": TableVersionModel.version + 1, "updated_at": func.now()}
+        )
+        self.session.execute(stmt)
@@ -0,0 +1,63 @@
+import sys
+from typing import Callable, List, Tuple
+
+from sqlalchemy import select
+
+from application.commands.create_employee_command import CreateEmployeeCommand
+from application.commands.update_employee_command import UpdateEmployeeCommand
+from application.handlers.command_handlers import CreateEmployeeCommandHandler, UpdateEmployeeCommandHandler
+from application.services.employee_id_generator import EmployeeIDGenerator
+from infrastructure.database.postgres import SessionLocal, engine
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+from infrastructure.database.repositories.postgres_version import PostgresVersionRepository
+from infrastructure.database.sql_models import CafeModel
+from infrastructure.database.statement_counter import count_statements
+
+def write_path_checks(session) -> List[Tuple[str, Callable[[], object], int]]:
+    """(description, operation, statement budget) for the employee write handlers, version bump included."""
+    employees = PostgresEmployeeRepository(session=session)
+    cafes = PostgresCafeRepository(session=session)
+    versions = PostgresVersionRepository(session=session)
+    create = CreateEmployeeCommandHandler(employees, cafes, EmployeeIDGenerator(employees), version_repository=versions)
+    update = UpdateEmployeeCommandHandler(employees, cafes, version_repository=versions)
+
+    first_cafe, second_cafe = session.scalars(select(CafeModel.id).limit(2)).all()
+    created = {}
+
+    def create_employee():
+        created['id'] = create.handle(CreateEmployeeCommand(name="Roundtrip", email_address="roundtrip@example.com", phone_number="91234567", gender="Male", assigned_cafe_id=first_cafe))
+
+    def move_employee():
+        update.handle(UpdateEmployeeCommand(id=created['id'], name="Moved Trip", assigned_cafe_id=second_cafe))
+
+    def unassign_employee():
+        update.handle(UpdateEmployeeCommand(id=created['id']))
+
+    return [
+        ("create employee", create_employee, 3),
+        ("update and move employee", move_employee, 2),
+        ("update and unassign employee", unassign_employee, 2),
+    ]
+
+def run_checks() -> bool:
+    """Runs each write inside one transaction that is rolled back, counting the statements it sends."""
+    ok = True
+    session = SessionLocal()
+    try:
+        for description, operation, budget in write_path_checks(session):
+            with count_statements(engine) as counter:
+                operation()
+            within = counter.count <= budget
+            ok = ok and within
+            print(f"{description:<30} {counter.count} statement(s), budget {budget}: {'OK' if within else 'OVER'}")
+            if not within:
+                for statement in counter.statements:
+                    print(f"    {' '.join(statement.split())[:120]}")
+    finally:
+        session.rollback()
+        session.close()
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
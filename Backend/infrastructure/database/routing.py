@@ -0,0 +1,197 @@
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import Select, event, literal, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from infrastructure.settings import env_float
+
+# Reads are sent to the primary while the replica is further behind than this.
+REPLICA_MAX_LAG_SECONDS = env_float("REPLICA_MAX_LAG_SECONDS", 5)
+REPLICA_CHECK_SECONDS = env_float("REPLICA_CHECK_SECONDS", 1)
+# How long a replica that failed is left alone before it is tried again.
+REPLICA_RETRY_SECONDS = env_float("REPLICA_RETRY_SECONDS", 5)
+# How long a client reads from the primary after its own write.
+READ_YOUR_WRITES_SECONDS = env_float("READ_YOUR_WRITES_SECONDS", 5)
+
+# Zero while the replica has replayed everything it received, so an idle primary does not look like lag.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+WROTE = 'wrote'
+
+_read_from_replica: ContextVar[bool] = ContextVar('read_from_replica', default=False)
+_pinned_to_primary: ContextVar[bool] = ContextVar('pinned_to_primary', default=False)
+_snapshot: ContextVar[Optional[object]] = ContextVar('snapshot', default=None)
+
+@contextmanager
+def reading_from_replica() -> Iterator[None]:
+    """SELECTs run inside this block may go to the replica (see RoutingSession)."""
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+def routed_to_replica() -> bool:
+    return _read_from_replica.get()
+
+def current_snapshot() -> Optional[object]:
+    """The session (sync or async) of the enclosing read_snapshot()/async_read_snapshot() block, if any."""
+    return _snapshot.get()
+
+@contextmanager
+def read_snapshot(session: Session) -> Iterator[None]:
+    """
+    Runs the block's reads in one REPEATABLE READ transaction on whichever
+    database its SELECTs are routed to, so they all see the same snapshot.
+    The transaction is rolled back when the block ends.
+    """
+    if hasattr(session, 'registry'):
+        session = session()
+    began = not session.in_transaction()
+    if began:
+        session.connection(bind_arguments={'clause': select(literal(1))}, execution_options={'isolation_level': 'REPEATABLE READ'})
+    token = _snapshot.set(session)
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+        if began:
+            session.rollback()
+
+@asynccontextmanager
+async def async_read_snapshot(session_factory) -> AsyncIterator[None]:
+    """read_snapshot() for async reads: repositories share one session from session_factory for the block."""
+    async with session_factory() as session:
+        await session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+        token = _snapshot.set(session)
+        try:
+            yield
+        finally:
+            _snapshot.reset(token)
+
+def pin_to_primary(pinned: bool = True) -> None:
+    """Keeps every read of the current request on the primary, e.g. right after the client's own write."""
+    _pinned_to_primary.set(pinned)
+
+def is_pinned_to_primary() -> bool:
+    return _pinned_to_primary.get()
+
+class ReplicaMonitor:
+    """
+    Whether the replica may serve reads: reachable and at most max_lag seconds
+    behind. The lag is checked at most once per check_interval by whichever
+    request needs it first; a failed check or a lost connection takes the
+    replica out for retry_after seconds.
+    """
+
+    def __init__(self, engine: Engine, max_lag: float = REPLICA_MAX_LAG_SECONDS, check_interval: float = REPLICA_CHECK_SECONDS, retry_after: float = REPLICA_RETRY_SECONDS):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = 'not checked yet'
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.watch(engine)
+
+    def watch(self, engine: Engine) -> None:
+        """Marks the replica down when engine (the replica's, or an AsyncEngine's sync_engine) cannot connect or loses a connection."""
+        @event.listens_for(engine, 'handle_error')
+        def _replica_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(context.original_exception)
+
+    def due(self) -> bool:
+        return time.monotonic() >= self._next_check
+
+    def available(self) -> bool:
+        if self.due():
+            self.refresh()
+        return self.healthy
+
+    def refresh(self) -> None:
+        # Requests arriving while another one checks go with the last result.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if not self.due():
+                return
+            try:
+                with self.engine.connect() as connection:
+                    lag = float(connection.execute(text(REPLICA_LAG_SQL)).scalar() or 0)
+            except Exception as e:
+                self.mark_down(e)
+                return
+            self.lag_seconds = lag
+            if lag > self.max_lag:
+                self._set_health(False, f"replica is {lag:.1f}s behind")
+            else:
+                self._set_health(True, None)
+            self._next_check = time.monotonic() + self.check_interval
+        finally:
+            self._lock.release()
+
+    def mark_down(self, error: BaseException) -> None:
+        self._set_health(False, str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__)
+        self._next_check = time.monotonic() + self.retry_after
+
+    def _set_health(self, healthy: bool, error: Optional[str]) -> None:
+        if healthy != self.healthy:
+            print(f"Replica reads {'resumed' if healthy else 'suspended: ' + str(error)}")
+        self.healthy = healthy
+        self.error = error
+
+    def status(self) -> dict:
+        return {'healthy': self.healthy, 'lag_seconds': self.lag_seconds, 'error': self.error}
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs to the replica while they run under reading_from_replica()
+    and the replica is healthy. Everything else goes to the primary, and so
+    does every statement after the first write in a transaction, so a request
+    always reads what it has just written. Inside read_snapshot() the replica's
+    health was checked when the block started, and its reads stay together.
+    """
+
+    def __init__(self, replica: Optional[Engine] = None, replica_monitor: Optional[ReplicaMonitor] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replica = replica
+        self.replica_monitor = replica_monitor
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and _read_from_replica.get()
+            and isinstance(clause, Select)
+            and not self.info.get(WROTE)
+            and (_snapshot.get() is self or self.replica_monitor.available())
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _track_statement_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[WROTE] = True
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _track_flush_writes(session, flush_context):
+    session.info[WROTE] = True
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _reset_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(WROTE, None)
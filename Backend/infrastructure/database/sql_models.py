@@ -1,11 +1,15 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Date, DateTime, BigInteger, Integer, ForeignKey, Index, Sequence, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declarative_base
 
 
 Base = declarative_base()
 
+# Numeric part of employee ids (UIxxxxxxx), allocated with nextval so concurrent
+# creates never collide and no table scan is needed.
+employee_id_sequence = Sequence('employee_id_seq', start=1, minvalue=1, metadata=Base.metadata)
+
 class EmployeeModel(Base):
     __tablename__ = 'employee'
 
@@ -19,22 +23,42 @@ class EmployeeModel(Base):
 
 class CafeModel(Base):
     __tablename__ = 'cafe'
+    __table_args__ = (
+        Index('ix_cafe_location', 'location'),
+        Index('ix_cafe_name', 'name'),
+        Index('ix_cafe_employee_count', text('employee_count DESC'), text('id DESC')),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String(255), nullable=False)
     description = Column(String(255), nullable=False)
     logo = Column(String, nullable=True)
     location = Column(String(255), nullable=False)
+    # Maintained by triggers on employee_cafe (migration 0004); never written by the application.
+    employee_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
 
     assignments = relationship("EmployeeCafeModel", back_populates='cafe', cascade="all, delete-orphan")
 
 class EmployeeCafeModel(Base):
     __tablename__ = 'employee_cafe'
-    __table_args__ = (UniqueConstraint('employee_id', 'cafe_id', name='uix_employee_cafe'),)
+    __table_args__ = (
+        UniqueConstraint('employee_id', 'cafe_id', name='uix_employee_cafe'),
+        # One cafe per employee; the assignment upsert in update_employee conflicts on it (migration 0006).
+        UniqueConstraint('employee_id', name='employee_cafe_employee_id_key'),
+        Index('ix_employee_cafe_cafe_id', 'cafe_id'),
+        Index('ix_employee_cafe_start_date', 'start_date'),
+    )
 
     employee_id = Column(String(9), ForeignKey('employee.id', ondelete='CASCADE'), primary_key=True)
     cafe_id = Column(UUID(as_uuid=True), ForeignKey('cafe.id', ondelete='CASCADE'), primary_key=True)
     start_date = Column(Date, nullable=False)
 
     employee = relationship("EmployeeModel", back_populates='assignments')
-    cafe = relationship("CafeModel", back_populates='assignments')
\ No newline at end of file
+    cafe = relationship("CafeModel", back_populates='assignments')
+
+class TableVersionModel(Base):
+    __tablename__ = 'table_version'
+
+    name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
\ No newline at end of file
@@ -1,38 +1,164 @@
+from typing import Set
 from injector import Module, provider, singleton, Injector
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from application.interfaces.employee_repository import IEmployeeRepository
 from application.interfaces.cafe_repository import ICafeRepository
 from application.services.employee_id_generator import EmployeeIDGenerator
-from application.handlers.command_handlers import CreateCafeCommandHandler, UpdateCafeCommandHandler, DeleteCafeCommandHandler, CreateEmployeeCommandHandler, UpdateEmployeeCommandHandler, DeleteEmployeeCommandHandler
-from application.handlers.query_handlers import GetCafesQueryHandler, GetEmployeesQueryHandler
+from application.handlers.command_handlers import CreateCafeCommandHandler, UpdateCafeCommandHandler, DeleteCafeCommandHandler, UploadLogoCommandHandler, CreateEmployeeCommandHandler, UpdateEmployeeCommandHandler, DeleteEmployeeCommandHandler, BulkCreateCafesCommandHandler, BulkCreateEmployeesCommandHandler, BatchCommandHandler
+from application.handlers.query_handlers import GetCafesQueryHandler, GetEmployeesQueryHandler, SearchCafesQueryHandler, SearchEmployeesQueryHandler
 from application.mediator import Mediator
+from application.behaviors import CachingBehavior, TransactionBehavior, ValidationBehavior
+from application.handlers.registry import COMMAND_HANDLERS, QUERY_HANDLERS, REQUEST_VALIDATORS
+from application.commands.batch_command import BATCH_COMMANDS
+from application.queries.get_cafe_query import GetCafeQuery
+from application.interfaces.cache import ICache
+from application.interfaces.version_repository import IVersionRepository, EMPLOYEES_RESOURCE
+from application.interfaces.search_repository import ISearchRepository
+from application.interfaces.logo_store import ILogoStore
+from application.services.cafe_list_cache import CafeListCache
 
-from infrastructure.database.postgres import get_db
+from infrastructure.database.postgres import db_session, replica_monitor, run_after_commit
+from infrastructure.database.behaviors import ReplicaReadBehavior, SnapshotReads
+from infrastructure.database.routing import REPLICA_CHECK_SECONDS, REPLICA_MAX_LAG_SECONDS, routed_to_replica
 from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
 from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_version import PostgresVersionRepository
+from infrastructure.database.repositories.postgres_search import PostgresSearchRepository
+from infrastructure.database.repositories.memory_store import MemoryStore, load_from_database
+from infrastructure.database.repositories.memory_cafe import MemoryCafeRepository
+from infrastructure.database.repositories.memory_employee import MemoryEmployeeRepository
+from infrastructure.database.repositories.memory_version import MemoryVersionRepository
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.storage.backends import logo_backend_from_env
+from infrastructure.storage.logo_store import ContentAddressedLogoStore
+from infrastructure.observability.behaviors import TimingBehavior
+from infrastructure.observability.metrics import REPOSITORY_LATENCY
+from infrastructure.observability.slow_queries import SLOW_QUERY_LOG, SlowQueryLog
+from infrastructure.observability.timing import INSTRUMENTATION_ENABLED, instrument_methods
+from infrastructure.settings import env_float, env_int, env_str
 
-class InfrastructureModule(Module):
+CACHE_BACKEND = env_str("CACHE_BACKEND", "memory")
+CACHE_TTL_SECONDS = env_float("CACHE_TTL_SECONDS", 30)
+CACHE_MAX_ENTRIES = env_int("CACHE_MAX_ENTRIES", 1024)
+CACHE_MAX_BYTES = env_int("CACHE_MAX_BYTES", 16 * 1024 * 1024)
+REDIS_URL = env_str("REDIS_URL", "redis://localhost:6379/0")
+SEARCH_BACKEND = env_str("SEARCH_BACKEND", "postgres")
+# postgres, or memory for tests and profiling without a database (see MemoryStore).
+REPOSITORY_BACKEND = env_str("REPOSITORY_BACKEND", "postgres")
+# none, or database to start the memory store with a copy of the Postgres tables.
+MEMORY_REPOSITORY_LOAD = env_str("MEMORY_REPOSITORY_LOAD", "none")
+# Query handlers that read from REPLICA_DATABASE_URL: all, none, or handler class names.
+REPLICA_HANDLERS = env_str("REPLICA_HANDLERS", "all")
+
+def replica_request_types() -> Set[type]:
+    if REPLICA_HANDLERS == "all":
+        return set(QUERY_HANDLERS)
+    names = {name.strip() for name in REPLICA_HANDLERS.split(",")} - {"none", ""}
+    unknown = names - {handler_type.__name__ for handler_type in QUERY_HANDLERS.values()}
+    if unknown:
+        raise ValueError(f"REPLICA_HANDLERS names unknown query handlers: {', '.join(sorted(unknown))}")
+    return {request_type for request_type, handler_type in QUERY_HANDLERS.items() if handler_type.__name__ in names}
 
-    def configure(self, binder):
-        binder.bind(Injector, to=Injector)
+def timed_repository(repository):
+    if not INSTRUMENTATION_ENABLED:
+        return repository
+    return instrument_methods(repository, 'repository', lambda method, seconds: REPOSITORY_LATENCY.observe(seconds, method=method), track_origin=True)
+
+def lazy_async_session_factory():
+    # Imported on first use so WSGI workers, which never read asynchronously,
+    # skip loading asyncpg and creating its engine at startup.
+    from infrastructure.database.async_postgres import AsyncSessionLocal, async_replica_sessionmaker
+    if routed_to_replica():
+        return async_replica_sessionmaker()()
+    return AsyncSessionLocal()
+
+class InfrastructureModule(Module):
 
     @singleton
     @provider
     def provide_db_session(self) -> Session:
-        for session in get_db():
-            return session
+        return db_session
 
     @singleton
     @provider
-    def provide_employee_repository(self, db: Session) -> IEmployeeRepository:
-        return PostgresEmployeeRepository(session=db)
+    def provide_async_session_factory(self) -> async_sessionmaker:
+        return lazy_async_session_factory
 
     @singleton
     @provider
-    def provide_cafe_repository(self, db: Session) -> ICafeRepository:
-        return PostgresCafeRepository(session=db)
+    def provide_memory_store(self) -> MemoryStore:
+        store = MemoryStore()
+        if MEMORY_REPOSITORY_LOAD == "database":
+            load_from_database(store)
+        return store
+
+    @singleton
+    @provider
+    def provide_employee_repository(self, injector: Injector, db: Session, async_session_factory: async_sessionmaker) -> IEmployeeRepository:
+        if REPOSITORY_BACKEND == "memory":
+            return timed_repository(MemoryEmployeeRepository(store=injector.get(MemoryStore), session=db))
+        return timed_repository(PostgresEmployeeRepository(session=db, async_session_factory=async_session_factory))
+
+    @singleton
+    @provider
+    def provide_cafe_repository(self, injector: Injector, db: Session, async_session_factory: async_sessionmaker) -> ICafeRepository:
+        if REPOSITORY_BACKEND == "memory":
+            return timed_repository(MemoryCafeRepository(store=injector.get(MemoryStore), session=db))
+        return timed_repository(PostgresCafeRepository(session=db, async_session_factory=async_session_factory))
     
+    @singleton
+    @provider
+    def provide_version_repository(self, injector: Injector, db: Session, async_session_factory: async_sessionmaker) -> IVersionRepository:
+        if REPOSITORY_BACKEND == "memory":
+            return timed_repository(MemoryVersionRepository(store=injector.get(MemoryStore), session=db))
+        return timed_repository(PostgresVersionRepository(session=db, async_session_factory=async_session_factory))
+
+    @singleton
+    @provider
+    def provide_search_repository(self, injector: Injector, db: Session, async_session_factory: async_sessionmaker) -> ISearchRepository:
+        if REPOSITORY_BACKEND == "memory":
+            # The prefix index over the memory repositories, rebuilt when their versions change.
+            from infrastructure.search.memory_search import MemorySearchRepository
+            store = injector.get(MemoryStore)
+            cafes, employees, versions = MemoryCafeRepository(store), MemoryEmployeeRepository(store), MemoryVersionRepository(store)
+            load_rows = lambda resource: employees.get_all_employees() if resource == EMPLOYEES_RESOURCE else cafes.get_all_cafes()
+            return timed_repository(MemorySearchRepository(load_rows=load_rows, current_version=lambda resource: versions.get_version(resource)[0]))
+        if SEARCH_BACKEND == "memory":
+            from infrastructure.search.memory_search import MemorySearchRepository, load_rows_from_database, version_from_database
+            return timed_repository(MemorySearchRepository(load_rows=load_rows_from_database, current_version=version_from_database))
+        return timed_repository(PostgresSearchRepository(session=db, async_session_factory=async_session_factory))
+
+    @singleton
+    @provider
+    def provide_cache(self) -> ICache:
+        if CACHE_BACKEND == "redis":
+            from infrastructure.cache.redis_cache import RedisCache
+            return RedisCache(url=REDIS_URL, default_ttl=CACHE_TTL_SECONDS)
+        return MemoryCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, default_ttl=CACHE_TTL_SECONDS)
+
+    @singleton
+    @provider
+    def provide_cafe_list_cache(self, cache: ICache) -> CafeListCache:
+        # A listing read from the replica may be at most this far behind the write that invalidated it.
+        replica_lag = REPLICA_MAX_LAG_SECONDS + REPLICA_CHECK_SECONDS if replica_monitor is not None and GetCafeQuery in replica_request_types() else None
+        return CafeListCache(cache=cache, ttl=CACHE_TTL_SECONDS, after_commit=run_after_commit, replica_lag=replica_lag)
+
+    @singleton
+    @provider
+    def provide_snapshot_reads(self, db: Session, async_session_factory: async_sessionmaker) -> SnapshotReads:
+        if REPOSITORY_BACKEND == "memory":
+            return SnapshotReads()
+        replica_reads = ReplicaReadBehavior(db, replica_monitor, replica_request_types()) if replica_monitor is not None else None
+        return SnapshotReads(session=db, async_session_factory=async_session_factory, replica_reads=replica_reads)
+
+    @singleton
+    @provider
+    def provide_slow_query_log(self) -> SlowQueryLog:
+        # The engine hooks record into the module-level log, so the admin routes must read that one.
+        return SLOW_QUERY_LOG
+
     @singleton
     @provider
     def provide_id_generator_service(self, employee_repository: IEmployeeRepository) -> EmployeeIDGenerator:
@@ -40,18 +166,28 @@ class InfrastructureModule(Module):
     
     @singleton
     @provider
-    def provide_create_cafe_command_handler(self, cafe_repository: ICafeRepository) -> CreateCafeCommandHandler:
-        return CreateCafeCommandHandler(cafe_repository=cafe_repository)
+    def provide_create_cafe_command_handler(self, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> CreateCafeCommandHandler:
+        return CreateCafeCommandHandler(cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
     
     @singleton
     @provider
-    def provide_update_cafe_command_handler(self, cafe_repository: ICafeRepository) -> UpdateCafeCommandHandler:
-        return UpdateCafeCommandHandler(cafe_repository=cafe_repository)
+    def provide_update_cafe_command_handler(self, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> UpdateCafeCommandHandler:
+        return UpdateCafeCommandHandler(cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
     
     @singleton
     @provider
-    def provide_delete_cafe_command_handler(self, cafe_repository: ICafeRepository) -> DeleteCafeCommandHandler:
-        return DeleteCafeCommandHandler(cafe_repository=cafe_repository)
+    def provide_delete_cafe_command_handler(self, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> DeleteCafeCommandHandler:
+        return DeleteCafeCommandHandler(cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
+
+    @singleton
+    @provider
+    def provide_logo_store(self) -> ILogoStore:
+        return ContentAddressedLogoStore(backend=logo_backend_from_env())
+
+    @singleton
+    @provider
+    def provide_upload_logo_command_handler(self, logo_store: ILogoStore, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> UploadLogoCommandHandler:
+        return UploadLogoCommandHandler(logo_store=logo_store, cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
 
     @singleton
     @provider
@@ -65,20 +201,58 @@ class InfrastructureModule(Module):
     
     @singleton
     @provider
-    def provide_mediator(self, injector: Injector) -> Mediator:
-        return Mediator(injector=injector)
+    def provide_mediator(self, injector: Injector, db: Session, cafe_cache: CafeListCache) -> Mediator:
+        # Behaviors run in list order around each handler: timing outermost, the transaction innermost.
+        behaviors = [TimingBehavior()] if INSTRUMENTATION_ENABLED else []
+        behaviors.append(ValidationBehavior(REQUEST_VALIDATORS))
+        cache_policies = {GetCafeQuery: cafe_cache} if CACHE_BACKEND != "none" else {}
+        if cache_policies:
+            behaviors.append(CachingBehavior(cache_policies))
+        if replica_monitor is not None and REPOSITORY_BACKEND == "postgres":
+            behaviors.append(ReplicaReadBehavior(db, replica_monitor, replica_request_types()))
+        behaviors.append(TransactionBehavior(db, COMMAND_HANDLERS))
+
+        handlers = {request_type: injector.get(handler_type) for request_type, handler_type in {**COMMAND_HANDLERS, **QUERY_HANDLERS}.items()}
+        return Mediator(handlers, behaviors)
     
     @singleton
     @provider
-    def provide_create_employee_command_handler(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator) -> CreateEmployeeCommandHandler:
-        return CreateEmployeeCommandHandler(employee_repository=employee_repository, cafe_repository=cafe_repository, employee_id_generator=employee_id_generator)
+    def provide_create_employee_command_handler(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> CreateEmployeeCommandHandler:
+        return CreateEmployeeCommandHandler(employee_repository=employee_repository, cafe_repository=cafe_repository, employee_id_generator=employee_id_generator, cafe_cache=cafe_cache, version_repository=version_repository)
     
     @singleton
     @provider
-    def provide_update_employee_command_handler(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository) -> UpdateEmployeeCommandHandler:
-        return UpdateEmployeeCommandHandler(employee_repository=employee_repository, cafe_repository=cafe_repository)
+    def provide_update_employee_command_handler(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> UpdateEmployeeCommandHandler:
+        return UpdateEmployeeCommandHandler(employee_repository=employee_repository, cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
     
     @singleton
     @provider
-    def provide_delete_employee_command_handler(self, employee_repository: IEmployeeRepository) -> DeleteEmployeeCommandHandler:
-        return DeleteEmployeeCommandHandler(employee_repository=employee_repository)
\ No newline at end of file
+    def provide_delete_employee_command_handler(self, employee_repository: IEmployeeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> DeleteEmployeeCommandHandler:
+        return DeleteEmployeeCommandHandler(employee_repository=employee_repository, cafe_cache=cafe_cache, version_repository=version_repository)
+
+    @singleton
+    @provider
+    def provide_bulk_create_cafes_command_handler(self, cafe_repository: ICafeRepository, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> BulkCreateCafesCommandHandler:
+        return BulkCreateCafesCommandHandler(cafe_repository=cafe_repository, cafe_cache=cafe_cache, version_repository=version_repository)
+
+    @singleton
+    @provider
+    def provide_bulk_create_employees_command_handler(self, employee_repository: IEmployeeRepository, cafe_repository: ICafeRepository, employee_id_generator: EmployeeIDGenerator, cafe_cache: CafeListCache, version_repository: IVersionRepository) -> BulkCreateEmployeesCommandHandler:
+        return BulkCreateEmployeesCommandHandler(employee_repository=employee_repository, cafe_repository=cafe_repository, employee_id_generator=employee_id_generator, cafe_cache=cafe_cache, version_repository=version_repository)
+
+    @singleton
+    @provider
+    def provide_batch_command_handler(self, injector: Injector, cafe_repository: ICafeRepository, db: Session) -> BatchCommandHandler:
+        # The operations run on the plain handlers, inside the batch's own transaction.
+        handlers = {command_type: injector.get(COMMAND_HANDLERS[command_type]) for command_type in BATCH_COMMANDS.values()}
+        return BatchCommandHandler(handlers=handlers, cafe_repository=cafe_repository, savepoint=db.begin_nested)
+
+    @singleton
+    @provider
+    def provide_search_employees_query_handler(self, search_repository: ISearchRepository) -> SearchEmployeesQueryHandler:
+        return SearchEmployeesQueryHandler(search_repository=search_repository)
+
+    @singleton
+    @provider
+    def provide_search_cafes_query_handler(self, search_repository: ISearchRepository) -> SearchCafesQueryHandler:
+        return SearchCafesQueryHandler(search_repository=search_repository)
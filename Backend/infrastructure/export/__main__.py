@@ -0,0 +1,42 @@
+import argparse
+import sys
+import time
+
+from application.queries.get_cafe_query import GetCafeQuery
+from application.queries.get_employees_query import GetEmployeesQuery
+from infrastructure.export.exporter import EXPORT_FORMATS, iter_csv, write_parquet
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m infrastructure.export", description="Export cafes or employees to CSV or Parquet.")
+    parser.add_argument("resource", choices=["cafes", "employees"])
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--output", "-o", help="Output file (defaults to stdout for CSV)")
+    parser.add_argument("--location", help="Only cafes in this location")
+    parser.add_argument("--cafe", help="Only employees of this cafe")
+    parser.add_argument("--fields", help="Comma-separated list of columns")
+    args = parser.parse_args(argv)
+
+    if args.resource == "cafes":
+        query = GetCafeQuery(location=args.location, fields=args.fields)
+    else:
+        query = GetEmployeesQuery(cafe_name=args.cafe, fields=args.fields)
+
+    started = time.perf_counter()
+    if args.format == "parquet":
+        if not args.output:
+            parser.error("--output is required for parquet exports")
+        rows = write_parquet(query, args.output)
+        print(f"Exported {rows} {args.resource} to {args.output} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        return
+
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for chunk in iter_csv(query):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    print(f"Exported {args.resource} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import csv
+import io
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Tuple, Union
+
+from application.queries.get_cafe_query import GetCafeQuery, CAFE_FIELDS
+from application.queries.get_employees_query import GetEmployeesQuery, EMPLOYEE_FIELDS
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+from infrastructure.settings import env_int
+
+EXPORT_FORMATS = ('csv', 'parquet')
+EXPORT_ROW_GROUP_SIZE = env_int("EXPORT_ROW_GROUP_SIZE", 50000)
+CSV_CHUNK_SIZE = 64 * 1024
+
+ExportQuery = Union[GetCafeQuery, GetEmployeesQuery]
+
+@contextmanager
+def export_session():
+    """
+    A session of its own, outside the request-scoped one, reading a single
+    REPEATABLE READ snapshot so a long export sees one consistent state.
+    """
+    session = SessionLocal()
+    try:
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        yield session
+    finally:
+        session.close()
+
+def export_columns(query: ExportQuery) -> List[str]:
+    if query.fields:
+        return list(query.fields)
+    return list(CAFE_FIELDS if isinstance(query, GetCafeQuery) else EMPLOYEE_FIELDS)
+
+def iter_export_rows(query: ExportQuery) -> Iterator[Dict[str, Any]]:
+    with export_session() as session:
+        if isinstance(query, GetCafeQuery):
+            rows = PostgresCafeRepository(session=session).iter_all_cafes(location=query.location, fields=query.fields)
+        else:
+            rows = PostgresEmployeeRepository(session=session).iter_all_employees(cafe_name=query.cafe_name, fields=query.fields)
+        yield from rows
+
+def iter_csv(query: ExportQuery) -> Iterator[str]:
+    columns = export_columns(query)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+
+    for row in iter_export_rows(query):
+        writer.writerow(row)
+        if buffer.tell() >= CSV_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+def write_parquet(query: ExportQuery, sink: Union[str, IO[bytes]], row_group_size: int = EXPORT_ROW_GROUP_SIZE) -> int:
+    """Writes the export as Parquet one row group at a time, so memory stays bounded by row_group_size."""
+    pa, pq = _import_pyarrow()
+    columns = export_columns(query)
+    schema = pa.schema([(column, _arrow_type(pa, column)) for column in columns])
+
+    written = 0
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        batch = _empty_batch(columns)
+        for row in iter_export_rows(query):
+            for column in columns:
+                value = row[column]
+                batch[column].append(str(value) if column in ('id', 'cafe_id') and value is not None else value)
+            if len(batch[columns[0]]) >= row_group_size:
+                written += _flush(pa, writer, schema, batch)
+                batch = _empty_batch(columns)
+        written += _flush(pa, writer, schema, batch)
+    return written
+
+def _import_pyarrow() -> Tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet export requires the optional 'pyarrow' package.")
+    return pyarrow, pyarrow.parquet
+
+def _arrow_type(pa, column: str):
+    if column in ('employees', 'days_worked'):
+        return pa.int64()
+    return pa.string()
+
+def _empty_batch(columns: List[str]) -> Dict[str, list]:
+    return {column: [] for column in columns}
+
+def _flush(pa, writer, schema, batch: Dict[str, list]) -> int:
+    count = len(next(iter(batch.values())))
+    if count:
+        writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+    return count
@@ -0,0 +1,29 @@
+import time
+from typing import Any
+
+from application.mediator import AsyncHandler, Handler, PipelineBehavior
+from infrastructure.observability.metrics import HANDLER_LATENCY
+from infrastructure.observability.timing import current_timings
+
+class TimingBehavior(PipelineBehavior):
+    """Records each dispatched request as the handler stage and in the per-request-type histogram."""
+
+    def handle(self, request: Any, next_handler: Handler) -> Any:
+        started = time.perf_counter()
+        try:
+            return next_handler(request)
+        finally:
+            self._record(request, time.perf_counter() - started)
+
+    async def handle_async(self, request: Any, next_handler: AsyncHandler) -> Any:
+        started = time.perf_counter()
+        try:
+            return await next_handler(request)
+        finally:
+            self._record(request, time.perf_counter() - started)
+
+    def _record(self, request: Any, elapsed: float) -> None:
+        timings = current_timings()
+        if timings is not None:
+            timings.add('handler', elapsed)
+        HANDLER_LATENCY.observe(elapsed, request=type(request).__name__)
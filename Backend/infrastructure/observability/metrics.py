@@ -0,0 +1,146 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        with self._lock:
+            for key, state in self._values.items():
+                labels = dict(zip(self.labelnames, key))
+                for index, bound in enumerate(self.buckets):
+                    samples.append((f'{self.name}_bucket', {**labels, 'le': _format_value(float(bound))}, state[index]))
+                samples.append((f'{self.name}_bucket', {**labels, 'le': '+Inf'}, state[-1]))
+                samples.append((f'{self.name}_sum', labels, state[-2]))
+                samples.append((f'{self.name}_count', labels, state[-1]))
+        return samples
+
+class Gauge:
+    """A value read at scrape time from a callback."""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Iterable[Tuple[Dict[str, str], float]]], kind: str = 'gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.kind = kind
+
+    def samples(self) -> List[Sample]:
+        try:
+            return [(self.name, labels, value) for labels, value in self.read()]
+        except Exception as e:
+            print(f"Metric {self.name} unavailable: {e}")
+            return []
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Iterable[Tuple[Dict[str, str], float]]], kind: str = 'gauge') -> Gauge:
+        with self._lock:
+            self._metrics.pop(name, None)
+        return self.register(Gauge(name, documentation, read, kind))
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter('http_requests_total', 'HTTP requests by route, method and status.', ('method', 'route', 'status'))
+HTTP_ERRORS = REGISTRY.counter('http_request_errors_total', 'HTTP requests answered with a 5xx status.', ('method', 'route', 'status'))
+HTTP_LATENCY = REGISTRY.histogram('http_request_duration_seconds', 'Time from request start until the response is returned.', ('method', 'route'))
+HTTP_STAGE_LATENCY = REGISTRY.histogram('http_request_stage_seconds', 'Time spent per request in each stage (route, validate, handler, repository, db, serialize, compress).', ('route', 'stage'))
+HTTP_DB_STATEMENTS = REGISTRY.histogram('http_request_db_statements', 'SQL statements executed per request.', ('route',), buckets=COUNT_BUCKETS)
+HANDLER_LATENCY = REGISTRY.histogram('handler_duration_seconds', 'Command and query handling time through the mediator, pipeline behaviors included.', ('request',))
+REPOSITORY_LATENCY = REGISTRY.histogram('repository_call_duration_seconds', 'Repository method call time.', ('method',))
+DB_STATEMENT_LATENCY = REGISTRY.histogram('db_statement_duration_seconds', 'SQL statement execution time.', ('engine',))
+DB_READ_ROUTING = REGISTRY.counter('db_read_routing_total', 'Replica-eligible queries by where they read: replica, pinned (read-your-writes), unavailable (replica down or lagging) or fallback (replica failed mid-query).', ('request', 'target'))
@@ -0,0 +1,212 @@
+import hashlib
+import random
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Connection, Engine
+
+from infrastructure.observability.metrics import REGISTRY
+from infrastructure.observability.timing import current_origin
+from infrastructure.settings import env_float, env_int
+
+SLOW_QUERY_MS = env_float("SLOW_QUERY_MS", 200)
+SLOW_QUERY_EXPLAIN_SAMPLE = env_float("SLOW_QUERY_EXPLAIN_SAMPLE", 0.0)
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = env_int("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 5000)
+SLOW_QUERY_MAX_FINGERPRINTS = env_int("SLOW_QUERY_MAX_FINGERPRINTS", 500)
+
+# Execution option set on the connection running EXPLAIN so its own statements are not recorded.
+SKIP_OPTION = 'skip_slow_query_log'
+SORT_KEYS = ('total_ms', 'mean_ms', 'max_ms', 'calls', 'slow_calls')
+ORIGIN_MODULES = ('infrastructure.database.repositories.', 'infrastructure.search.', 'infrastructure.export.')
+
+SLOW_STATEMENTS = REGISTRY.counter('db_slow_statements_total', 'SQL statements slower than SLOW_QUERY_MS.', ('origin',))
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_REPEATED_LISTS = re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+')
+_WHITESPACE = re.compile(r'\s+')
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.I)
+_WRITES = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE)\b', re.I)
+# Reads that still change state when executed (allocate_employee_numbers burns sequence values), so they are not ANALYZEd.
+_SIDE_EFFECTS = re.compile(r'\b(nextval|setval|pg_advisory_\w*lock\w*|pg_try_advisory_\w*lock\w*|pg_notify|lo_\w+)\s*\(|\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b', re.I)
+
+@lru_cache(maxsize=2048)
+def normalize(statement: str) -> str:
+    """Statement text with literals and bind parameters replaced by ?, and IN/VALUES lists collapsed."""
+    normalized = _COMMENTS.sub(' ', statement)
+    normalized = _PLACEHOLDERS.sub('?', normalized)
+    normalized = _LISTS.sub('(?)', normalized)
+    normalized = _REPEATED_LISTS.sub('(?), ...', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode('utf-8')).hexdigest()[:12]
+
+def redact(parameters: Any, executemany: bool = False) -> Any:
+    """Replaces every parameter value with its type name."""
+    if executemany:
+        return f'<{len(parameters)} rows>'
+    if isinstance(parameters, dict):
+        return {key: f'<{type(value).__name__}>' for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [f'<{type(value).__name__}>' for value in parameters]
+    return None if parameters is None else '<redacted>'
+
+def caller_origin() -> Optional[str]:
+    """The nearest repository (or search/export) method on the stack, preferring public methods."""
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__', '').startswith(ORIGIN_MODULES):
+            instance = frame.f_locals.get('self')
+            owner = type(instance).__name__ if instance is not None else frame.f_globals['__name__'].rsplit('.', 1)[-1]
+            origin = f'{owner}.{frame.f_code.co_name}'
+            if not frame.f_code.co_name.startswith('_'):
+                return origin
+            fallback = fallback or origin
+        frame = frame.f_back
+    return fallback
+
+class _StatementStats:
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_calls = 0
+        self.origins: Dict[str, int] = {}
+        self.last_slow: Optional[dict] = None
+        self.plan: Optional[str] = None
+        self.plan_captured_at: Optional[str] = None
+
+    def snapshot(self, key: str) -> dict:
+        return {
+            "fingerprint": key,
+            "statement": self.statement,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "slow_calls": self.slow_calls,
+            "origins": dict(sorted(self.origins.items(), key=lambda item: -item[1])),
+            "last_slow": self.last_slow,
+            "plan": self.plan,
+            "plan_captured_at": self.plan_captured_at,
+        }
+
+class SlowQueryLog:
+    """
+    Aggregates every statement by fingerprint and logs the ones slower than
+    threshold_ms. A sample of slow SELECTs is re-run under EXPLAIN (ANALYZE,
+    BUFFERS) on a separate connection in the background; ones with side effects
+    are only planned, with plain EXPLAIN.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, explain_sample: float = SLOW_QUERY_EXPLAIN_SAMPLE, explain_timeout_ms: int = SLOW_QUERY_EXPLAIN_TIMEOUT_MS, max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS):
+        self.threshold_ms = threshold_ms
+        self.explain_sample = explain_sample
+        self.explain_timeout_ms = explain_timeout_ms
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+        self._explaining = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def observe(self, conn: Connection, statement: str, parameters: Any, executemany: bool, duration_ms: float) -> None:
+        key = fingerprint(statement)
+        slow = duration_ms >= self.threshold_ms
+        origin = current_origin() or (caller_origin() if slow else None)
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _StatementStats(normalize(statement))
+                if len(self._stats) > self.max_fingerprints:
+                    self._evict()
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if origin:
+                stats.origins[origin] = stats.origins.get(origin, 0) + 1
+            if slow:
+                stats.slow_calls += 1
+                stats.last_slow = {
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "duration_ms": round(duration_ms, 3),
+                    "origin": origin,
+                    "parameters": redact(parameters, executemany),
+                }
+
+        if not slow:
+            return
+        SLOW_STATEMENTS.inc(origin=origin or 'unknown')
+        print(f"Slow query {duration_ms:.1f} ms in {origin or 'unknown'} [{key}]: {stats.statement[:500]} parameters={stats.last_slow['parameters']}")
+        if self._should_explain(conn, statement, executemany, key):
+            self._explain_later(conn.engine, key, statement, parameters)
+
+    def top(self, limit: int = 20, sort: str = 'total_ms') -> List[dict]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        with self._lock:
+            snapshots = [stats.snapshot(key) for key, stats in self._stats.items()]
+        snapshots.sort(key=lambda item: item[sort], reverse=True)
+        return snapshots[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _evict(self) -> None:
+        # Drops the statement that has cost the least so far.
+        cheapest = min(self._stats, key=lambda key: self._stats[key].total_ms)
+        del self._stats[cheapest]
+
+    def _should_explain(self, conn: Connection, statement: str, executemany: bool, key: str) -> bool:
+        # ANALYZE executes the statement again, so only plain reads are explained.
+        if executemany or conn.dialect.is_async or self.explain_sample <= 0:
+            return False
+        if not _EXPLAINABLE.match(statement) or _WRITES.search(statement):
+            return False
+        with self._lock:
+            if key in self._explaining:
+                return False
+        return random.random() < self.explain_sample
+
+    def _explain_later(self, engine: Engine, key: str, statement: str, parameters: Any) -> None:
+        with self._lock:
+            if key in self._explaining:
+                return
+            self._explaining.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explain')
+        self._executor.submit(self._explain, engine, key, statement, parameters)
+
+    def _explain(self, engine: Engine, key: str, statement: str, parameters: Any) -> None:
+        try:
+            with engine.connect() as connection:
+                connection = connection.execution_options(**{SKIP_OPTION: True})
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                explain = "EXPLAIN" if _SIDE_EFFECTS.search(statement) else "EXPLAIN (ANALYZE, BUFFERS)"
+                rows = connection.exec_driver_sql(f"{explain} {statement}", parameters).all()
+                connection.rollback()
+            plan = '\n'.join(row[0] for row in rows)
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is not None:
+                    stats.plan = plan
+                    stats.plan_captured_at = datetime.now(timezone.utc).isoformat()
+            print(f"Plan for slow query [{key}]:\n{plan}")
+        except Exception as e:
+            print(f"Could not EXPLAIN slow query [{key}]: {e}")
+        finally:
+            with self._lock:
+                self._explaining.discard(key)
+
+SLOW_QUERY_LOG = SlowQueryLog()
@@ -0,0 +1,42 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from infrastructure.observability.metrics import DB_STATEMENT_LATENCY
+from infrastructure.observability.slow_queries import SLOW_QUERY_LOG, SKIP_OPTION
+from infrastructure.observability.timing import current_timings
+
+def instrument_engine(engine: Engine, label: str = 'sync') -> None:
+    """
+    Times every statement sent through engine. The duration is added to the
+    current request's db stage and to the db_statement_duration_seconds histogram,
+    and the statement is aggregated in the slow query log.
+    For an AsyncEngine pass its sync_engine.
+    """
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('statement_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = _finish(conn)
+        if elapsed is not None and (context is None or not context.execution_options.get(SKIP_OPTION, False)):
+            SLOW_QUERY_LOG.observe(conn, statement, parameters, executemany, elapsed * 1000)
+
+    @event.listens_for(engine, 'handle_error')
+    def _failed_statement(exception_context):
+        if exception_context.connection is not None:
+            _finish(exception_context.connection)
+
+    def _finish(conn):
+        started = conn.info.get('statement_started')
+        if not started:
+            return None
+        elapsed = time.perf_counter() - started.pop()
+        DB_STATEMENT_LATENCY.observe(elapsed, engine=label)
+        timings = current_timings()
+        if timings is not None:
+            timings.add_statement(elapsed)
+        return elapsed
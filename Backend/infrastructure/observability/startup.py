@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+def process_start_time() -> float:
+    """
+    When this process was created, as a Unix timestamp. For a gunicorn worker
+    that is the fork, so interpreter startup and imports count towards its
+    cold start. Falls back to now where /proc is unavailable.
+    """
+    try:
+        with open('/proc/self/stat') as stat_file:
+            # The command name may contain spaces; fields resume after its closing parenthesis.
+            fields = stat_file.read().rsplit(')', 1)[1].split()
+        # starttime counts clock ticks since boot, the clock CLOCK_BOOTTIME reads.
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        return time.time() - age
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+class StartupTimeline:
+    """
+    Durations of the startup phases of this process (imports, database wait,
+    migrations, app creation, pool prewarm), when it became ready, and when it
+    answered its first request, all relative to process creation.
+    """
+
+    def __init__(self):
+        self.started_at = process_start_time()
+        self.phases: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+        self.first_request_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def mark(self, name: str) -> None:
+        """Records a phase that ran from process creation until now, e.g. imports."""
+        self.phases.setdefault(name, time.time() - self.started_at)
+
+    def reset(self) -> None:
+        """Starts a new timeline, e.g. in a worker forked from a process that already started."""
+        self.__init__()
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def mark_ready(self) -> None:
+        if self.ready_at is None:
+            self.ready_at = time.time()
+            print(f"Ready {self.ready_at - self.started_at:.3f}s after process start ({self.describe()})")
+
+    def mark_first_request(self) -> None:
+        if self.first_request_at is not None:
+            return
+        with self._lock:
+            if self.first_request_at is None:
+                self.first_request_at = time.time()
+                print(f"First request served {self.first_request_at - self.started_at:.3f}s after process start")
+
+    def describe(self) -> str:
+        return ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+
+    def snapshot(self) -> dict:
+        def since_start(moment: Optional[float]) -> Optional[float]:
+            return None if moment is None else round(moment - self.started_at, 4)
+
+        return {
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - self.started_at, 3),
+            'phases_s': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'ready_after_s': since_start(self.ready_at),
+            'first_request_after_s': since_start(self.first_request_at),
+        }
+
+STARTUP = StartupTimeline()
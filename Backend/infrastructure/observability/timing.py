@@ -0,0 +1,132 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from infrastructure.settings import env_bool
+
+INSTRUMENTATION_ENABLED = env_bool("INSTRUMENTATION_ENABLED", True)
+SERVER_TIMING_ENABLED = env_bool("SERVER_TIMING_ENABLED", True)
+
+# Stages in the order they are reported in the Server-Timing header.
+STAGES = ('route', 'validate', 'handler', 'repository', 'db', 'serialize', 'compress')
+
+class RequestTimings:
+    """Accumulated time per stage for one request. Nested stages are counted in their parents too."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.statements = 0
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_statement(self, seconds: float) -> None:
+        self.statements += 1
+        self.add('db', seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        total = self.elapsed() if total is None else total
+        entries = [f'total;dur={total * 1000:.2f}']
+        for stage in STAGES:
+            if stage not in self.stages:
+                continue
+            entry = f'{stage};dur={self.stages[stage] * 1000:.2f}'
+            if stage == 'db':
+                noun = 'statement' if self.statements == 1 else 'statements'
+                entry += f';desc="{self.statements} {noun}"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+# The innermost instrumented repository method on the stack, for attributing SQL to its caller.
+_origin: ContextVar[Optional[str]] = ContextVar('statement_origin', default=None)
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+def end_request() -> None:
+    _current.set(None)
+
+def current_origin() -> Optional[str]:
+    return _origin.get()
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Adds the time spent in the block to stage on the current request, if there is one."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, time.perf_counter() - started)
+
+def timed(stage: str, on_duration: Optional[Callable[[float], None]] = None, origin: Optional[str] = None):
+    """
+    Decorator recording each call of a function, sync or async, as a span of
+    stage. With origin set, statements executed during the call are attributed to it.
+    """
+
+    def decorate(function):
+        def finish(started: float, token) -> None:
+            if token is not None:
+                _origin.reset(token)
+            elapsed = time.perf_counter() - started
+            timings = _current.get()
+            if timings is not None:
+                timings.add(stage, elapsed)
+            if on_duration:
+                on_duration(elapsed)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def timed_async(*args, **kwargs):
+                token = _origin.set(origin) if origin else None
+                started = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    finish(started, token)
+            return timed_async
+
+        @functools.wraps(function)
+        def timed_call(*args, **kwargs):
+            token = _origin.set(origin) if origin else None
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                finish(started, token)
+        return timed_call
+
+    return decorate
+
+def instrument_methods(instance: Any, stage: str, on_duration: Optional[Callable[[str, float], None]] = None, track_origin: bool = False) -> Any:
+    """
+    Wraps the public methods of instance so each call is timed as stage, and
+    with track_origin marks it as the origin of the statements it runs.
+    Methods returning generators are only timed until the generator is created.
+    """
+    name = type(instance).__name__
+    for attribute in dir(type(instance)):
+        if attribute.startswith('_') or not callable(getattr(type(instance), attribute, None)):
+            continue
+        method = getattr(instance, attribute)
+        observer = functools.partial(on_duration, f'{name}.{attribute}') if on_duration else None
+        origin = f'{name}.{attribute}' if track_origin else None
+        setattr(instance, attribute, timed(stage, observer, origin)(method))
+    return instance
@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from application.interfaces.search_repository import ISearchRepository
+from application.interfaces.version_repository import CAFES_RESOURCE, EMPLOYEES_RESOURCE
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.repositories.postgres_cafe import PostgresCafeRepository
+from infrastructure.database.repositories.postgres_employee import PostgresEmployeeRepository
+from infrastructure.database.repositories.postgres_version import PostgresVersionRepository
+from infrastructure.search.prefix_index import PrefixIndex
+
+SEARCH_FIELDS = {
+    EMPLOYEES_RESOURCE: ('name', 'email_address', 'phone_number'),
+    CAFES_RESOURCE: ('name', 'description'),
+}
+
+class _ResourceIndex:
+    def __init__(self, version: int, rows: List[dict], fields: Tuple[str, ...]):
+        self.version = version
+        self.rows = {row['id']: row for row in rows}
+        self.index = PrefixIndex().build((row['id'], [row.get(field) for field in fields]) for row in rows)
+
+class MemorySearchRepository(ISearchRepository):
+    """
+    Prefix-index fallback for ISearchRepository, for tests and databases
+    without pg_trgm. Rows come from load_rows(resource); the index for a
+    resource is rebuilt whenever current_version(resource) changes.
+    """
+    def __init__(self, load_rows: Callable[[str], List[dict]], current_version: Callable[[str], int] = lambda resource: 0):
+        self.load_rows = load_rows
+        self.current_version = current_version
+        self._indexes: Dict[str, _ResourceIndex] = {}
+        self._lock = threading.Lock()
+
+    def _index_for(self, resource: str) -> _ResourceIndex:
+        version = self.current_version(resource)
+        index = self._indexes.get(resource)
+        if index is None or index.version != version:
+            with self._lock:
+                index = self._indexes.get(resource)
+                if index is None or index.version != version:
+                    index = _ResourceIndex(version, self.load_rows(resource), SEARCH_FIELDS[resource])
+                    self._indexes[resource] = index
+        return index
+
+    def _search(self, resource: str, term: str, limit: int, after: Optional[Tuple[float, object]]) -> List[dict]:
+        index = self._index_for(resource)
+        ranked = sorted(((score, doc_id) for doc_id, score in index.index.search(term).items()), reverse=True)
+        if after:
+            ranked = [(score, doc_id) for score, doc_id in ranked if (score, doc_id) < tuple(after)]
+        return [{**index.rows[doc_id], 'score': score} for score, doc_id in ranked[:limit]]
+
+    def search_employees(self, term: str, limit: int, after: Optional[Tuple[float, str]] = None) -> List[dict]:
+        return self._search(EMPLOYEES_RESOURCE, term, limit, after)
+
+    def search_cafes(self, term: str, limit: int, after: Optional[Tuple[float, UUID]] = None) -> List[dict]:
+        return self._search(CAFES_RESOURCE, term, limit, after)
+
+def load_rows_from_database(resource: str) -> List[dict]:
+    session = SessionLocal()
+    try:
+        if resource == EMPLOYEES_RESOURCE:
+            return list(PostgresEmployeeRepository(session=session).iter_all_employees())
+        return list(PostgresCafeRepository(session=session).iter_all_cafes())
+    finally:
+        session.close()
+
+def version_from_database(resource: str) -> int:
+    session = SessionLocal()
+    try:
+        return PostgresVersionRepository(session=session).get_version(resource)[0]
+    finally:
+        session.close()
@@ -0,0 +1,60 @@
+import re
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def tokenize(value: str) -> Set[str]:
+    """Lowercased words of value, plus the whole value so 'alice@e' and '9123' match from the start."""
+    lowered = value.lower()
+    return set(TOKEN_PATTERN.findall(lowered)) | {lowered}
+
+class PrefixIndex:
+    """
+    In-memory prefix search over a few text fields per document: a sorted
+    token list (bisect finds every token starting with a term) plus postings.
+    Build once, then query; rebuild to pick up changes.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._tokens: List[str] = []
+
+    def build(self, documents: Iterable[Tuple[Hashable, Iterable[str]]]) -> "PrefixIndex":
+        postings: Dict[str, Set[Hashable]] = {}
+        for doc_id, values in documents:
+            for value in values:
+                if not value:
+                    continue
+                for token in tokenize(value):
+                    postings.setdefault(token, set()).add(doc_id)
+        self._postings = postings
+        self._tokens = sorted(postings)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _prefix_matches(self, term: str) -> Dict[Hashable, float]:
+        """Documents with a token starting with term, scored by how much of the token the term covers."""
+        matches: Dict[Hashable, float] = {}
+        position = bisect_left(self._tokens, term)
+        while position < len(self._tokens) and self._tokens[position].startswith(term):
+            token = self._tokens[position]
+            coverage = len(term) / len(token)
+            for doc_id in self._postings[token]:
+                if coverage > matches.get(doc_id, 0.0):
+                    matches[doc_id] = coverage
+            position += 1
+        return matches
+
+    def search(self, query: str) -> Dict[Hashable, float]:
+        """Documents matching every word of query as a prefix. Scores are in (0, 1], 1 being an exact token."""
+        terms = query.lower().split()
+        if not terms:
+            return {}
+
+        scores = self._prefix_matches(terms[0])
+        for term in terms[1:]:
+            matches = self._prefix_matches(term)
+            scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+        return {doc_id: score / len(terms) for doc_id, score in scores.items()}
@@ -0,0 +1,24 @@
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TRUTHY = ('1', 'true', 'yes', 'on')
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    return os.getenv(name, default)
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, '') else default
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in TRUTHY
@@ -0,0 +1,46 @@
+import argparse
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from infrastructure.database.postgres import SessionLocal
+from infrastructure.database.sql_models import CafeModel
+from infrastructure.storage.backends import logo_backend_from_env
+from infrastructure.storage.logo_store import ContentAddressedLogoStore, prune_unreferenced
+
+SHA256 = re.compile(r'[0-9a-f]{64}')
+
+def referenced_hashes() -> set:
+    with SessionLocal() as session:
+        logos = session.scalars(select(CafeModel.logo).where(CafeModel.logo.isnot(None)))
+        return {match.group(0) for logo in logos for match in [SHA256.search(logo)] if match}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m infrastructure.storage", description="Maintain stored cafe logos.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prune = commands.add_parser("prune", help="Delete uploaded logos no cafe points at")
+    prune.add_argument("--min-age-hours", type=float, default=24, help="Keep newer uploads; a cafe being created may not reference its logo yet")
+    prune.add_argument("--dry-run", action="store_true")
+
+    variants = commands.add_parser("variants", help="Generate missing resized variants for every stored logo (needs Pillow)")
+    args = parser.parse_args(argv)
+
+    backend = logo_backend_from_env()
+    if args.command == "prune":
+        older_than = datetime.now(timezone.utc) - timedelta(hours=args.min_age_hours)
+        removed = prune_unreferenced(backend, referenced_hashes(), older_than, dry_run=args.dry_run)
+        for key in removed:
+            print(key)
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {len(removed)} logo file(s).")
+    elif args.command == "variants":
+        try:
+            written = ContentAddressedLogoStore(backend).backfill_variants()
+        except ValueError as e:
+            sys.exit(str(e))
+        print(f"Wrote {len(written)} variant(s).")
+
+if __name__ == "__main__":
+    main()
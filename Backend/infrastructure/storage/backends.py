@@ -0,0 +1,197 @@
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from infrastructure.settings import env_str
+
+LOGO_BACKEND = env_str("LOGO_BACKEND", "local")
+LOGO_ROOT = env_str("LOGO_ROOT", "/usr/src/app/public/logos")
+LOGO_URL_PREFIX = env_str("LOGO_URL_PREFIX", "/logos")
+LOGO_BUCKET = env_str("LOGO_BUCKET", "cafe-logos")
+LOGO_S3_ENDPOINT_URL = env_str("LOGO_S3_ENDPOINT_URL")
+LOGO_OBJECT_STORE_ROOT = env_str("LOGO_OBJECT_STORE_ROOT", "/usr/src/app/public/object-store")
+# Public base URL of the bucket (or a CDN in front of it). Unset, objects are served through the API.
+LOGO_PUBLIC_BASE_URL = env_str("LOGO_PUBLIC_BASE_URL")
+
+# Stored objects are content addressed, so they never change once written.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+class LocalLogoBackend:
+    """Logos as files under root, served from LOGO_URL_PREFIX."""
+
+    def __init__(self, root: str = LOGO_ROOT, url_prefix: str = LOGO_URL_PREFIX):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip('/')
+        self.staging_dir = os.path.join(root, '.staging')
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.local_path(key))
+
+    def put_file(self, key: str, path: str, content_type: str) -> None:
+        """Moves the file at path into place; the rename is atomic, so readers never see a partial logo."""
+        destination = self.local_path(key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.staging_dir):
+            os.replace(path, destination)
+        else:
+            staged = self.staging_path()
+            shutil.copyfile(path, staged)
+            os.replace(staged, destination)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        staged = self.staging_path()
+        with open(staged, 'wb') as file:
+            file.write(data)
+        self.put_file(key, staged, content_type)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.local_path(key), 'rb')
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> Iterator[Tuple[str, datetime]]:
+        """Yields every stored key with its modification time, skipping the staging area."""
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith('.')]
+            for name in files:
+                path = os.path.join(directory, name)
+                modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+                yield os.path.relpath(path, self.root).replace(os.sep, '/'), modified
+
+    def url(self, key: str) -> str:
+        return f'{self.url_prefix}/{key}'
+
+    def local_path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid logo key {key}")
+        return path
+
+    def staging_path(self) -> str:
+        os.makedirs(self.staging_dir, exist_ok=True)
+        return os.path.join(self.staging_dir, f'{os.getpid()}-{os.urandom(8).hex()}')
+
+class ObjectStoreLogoBackend:
+    """
+    Logos in an S3-compatible bucket, through a boto3-style client
+    (put_object, head_object, get_object, delete_object, list_objects_v2).
+    """
+
+    def __init__(self, client, bucket: str = LOGO_BUCKET, public_base_url: Optional[str] = LOGO_PUBLIC_BASE_URL, url_prefix: str = LOGO_URL_PREFIX):
+        self.client = client
+        self.bucket = bucket
+        self.public_base_url = public_base_url.rstrip('/') if public_base_url else None
+        self.url_prefix = url_prefix.rstrip('/')
+        self.staging_dir = None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception as e:
+            if _is_not_found(e):
+                return False
+            raise
+
+    def put_file(self, key: str, path: str, content_type: str) -> None:
+        with open(path, 'rb') as file:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=file, ContentType=content_type, CacheControl=IMMUTABLE_CACHE_CONTROL)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=content_type, CacheControl=IMMUTABLE_CACHE_CONTROL)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key)
+            raise
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list(self) -> Iterator[Tuple[str, datetime]]:
+        token = None
+        while True:
+            page = self.client.list_objects_v2(Bucket=self.bucket, **({'ContinuationToken': token} if token else {}))
+            for item in page.get('Contents', []):
+                yield item['Key'], item['LastModified']
+            if not page.get('IsTruncated'):
+                return
+            token = page['NextContinuationToken']
+
+    def url(self, key: str) -> str:
+        if self.public_base_url:
+            return f'{self.public_base_url}/{key}'
+        return f'{self.url_prefix}/{key}'
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+class ObjectNotFound(Exception):
+    def __init__(self, key: str):
+        super().__init__(f"No such key: {key}")
+        # Shaped like botocore's ClientError so callers can treat both the same way.
+        self.response = {'Error': {'Code': 'NoSuchKey', 'Message': str(self)}}
+
+class LocalObjectStoreClient:
+    """
+    Stand-in for an S3 client that keeps each bucket in a directory. Implements
+    only the calls ObjectStoreLogoBackend makes; used for development and tests.
+    """
+
+    def __init__(self, root: str = LOGO_OBJECT_STORE_ROOT):
+        self.root = root
+        self._buckets = {}
+
+    def _backend(self, bucket: str) -> LocalLogoBackend:
+        if bucket not in self._buckets:
+            self._buckets[bucket] = LocalLogoBackend(os.path.join(self.root, bucket))
+        return self._buckets[bucket]
+
+    def put_object(self, Bucket: str, Key: str, Body, ContentType: str = 'application/octet-stream', **kwargs) -> dict:
+        data = Body if isinstance(Body, bytes) else Body.read()
+        self._backend(Bucket).put_bytes(Key, data, ContentType)
+        return {}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        backend = self._backend(Bucket)
+        if not backend.exists(Key):
+            raise ObjectNotFound(Key)
+        return {'ContentLength': os.path.getsize(backend.local_path(Key))}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        backend = self._backend(Bucket)
+        if not backend.exists(Key):
+            raise ObjectNotFound(Key)
+        return {'Body': backend.open(Key), 'ContentLength': os.path.getsize(backend.local_path(Key))}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        self._backend(Bucket).delete(Key)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, ContinuationToken: Optional[str] = None) -> dict:
+        contents = [{'Key': key, 'LastModified': modified} for key, modified in self._backend(Bucket).list()]
+        return {'Contents': contents, 'IsTruncated': False}
+
+def _is_not_found(error: Exception) -> bool:
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+    return code in ('404', 'NoSuchKey', 'NotFound')
+
+def logo_backend_from_env():
+    """Builds the backend selected by LOGO_BACKEND: local, s3 (needs boto3) or local-s3 (the stand-in client)."""
+    if LOGO_BACKEND == 's3':
+        try:
+            import boto3
+        except ImportError:
+            raise ValueError("LOGO_BACKEND=s3 needs the optional boto3 package")
+        return ObjectStoreLogoBackend(boto3.client('s3', endpoint_url=LOGO_S3_ENDPOINT_URL))
+    if LOGO_BACKEND == 'local-s3':
+        return ObjectStoreLogoBackend(LocalObjectStoreClient())
+    return LocalLogoBackend()
@@ -0,0 +1,65 @@
+import io
+from typing import BinaryIO, Optional
+
+# Pillow format names for the content types logos are stored in.
+PILLOW_FORMATS = {
+    'image/png': 'PNG',
+    'image/jpeg': 'JPEG',
+    'image/gif': 'GIF',
+    'image/webp': 'WEBP',
+    'image/avif': 'AVIF',
+}
+
+def _import_pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+def pillow_available() -> bool:
+    return _import_pillow() is not None
+
+def can_write(content_type: str) -> bool:
+    """Whether the installed Pillow can encode content_type (AVIF, for one, needs a plugin)."""
+    Image = _import_pillow()
+    if Image is None or content_type not in PILLOW_FORMATS:
+        return False
+    Image.init()
+    return PILLOW_FORMATS[content_type] in Image.SAVE
+
+def image_width(path: str) -> Optional[int]:
+    """Width in pixels read from the image header; None without Pillow or when it cannot be parsed."""
+    Image = _import_pillow()
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as image:
+            return image.width
+    except OSError:
+        return None
+
+def render_variant(source: BinaryIO, content_type: str, width: Optional[int] = None, output_type: Optional[str] = None) -> Optional[bytes]:
+    """
+    Returns the image scaled down to width and/or converted to output_type.
+    None when Pillow is not installed, or when the image is already no wider
+    than width (the full-size rendition serves that request).
+    """
+    Image = _import_pillow()
+    if Image is None:
+        return None
+    output_type = output_type or content_type
+
+    with Image.open(source) as image:
+        if width is not None and image.width <= width:
+            return None
+        result = image
+        if width is not None:
+            height = max(1, round(image.height * width / image.width))
+            result = image.resize((width, height), Image.LANCZOS)
+        output_format = PILLOW_FORMATS[output_type]
+        if output_format == 'JPEG' and result.mode not in ('RGB', 'L'):
+            result = result.convert('RGB')
+        buffer = io.BytesIO()
+        result.save(buffer, format=output_format, optimize=True)
+        return buffer.getvalue()
@@ -0,0 +1,273 @@
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from typing import BinaryIO, Callable, List, Optional, Set, Tuple
+
+from application.interfaces.logo_store import ILogoStore
+from domain.exceptions import LogoTooLargeException, UnsupportedLogoException
+from infrastructure.storage.images import can_write, image_width, pillow_available, render_variant
+from infrastructure.settings import env_int, env_str
+
+LOGO_MAX_BYTES = env_int("LOGO_MAX_BYTES", 2 * 1024 * 1024)
+LOGO_VARIANT_WIDTHS = [int(width) for width in env_str("LOGO_VARIANT_WIDTHS", "64,256").split(',') if width.strip()]
+# Formats every logo is also converted to, in order of preference when the client accepts several.
+LOGO_ALTERNATE_FORMATS = [extension.strip() for extension in env_str("LOGO_ALTERNATE_FORMATS", "webp").split(',') if extension.strip()]
+LOGO_CHUNK_SIZE = 64 * 1024
+KNOWN_KEYS_LIMIT = 10000
+MISSING_RECHECK_SECONDS = 30
+
+# (magic bytes, content type, extension). SVG is left out on purpose: it can carry script.
+SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png', 'png'),
+    (b'\xff\xd8\xff', 'image/jpeg', 'jpg'),
+    (b'GIF87a', 'image/gif', 'gif'),
+    (b'GIF89a', 'image/gif', 'gif'),
+)
+CONTENT_TYPES = {extension: content_type for _, content_type, extension in SIGNATURES}
+CONTENT_TYPES.update({'webp': 'image/webp', 'avif': 'image/avif'})
+CONTENT_ADDRESSED_KEY = re.compile(r'^[0-9a-f]{2}/([0-9a-f]{64})(-w\d+)?\.([a-z]+)$')
+
+def sniff_image(head: bytes) -> Tuple[str, str]:
+    """Content type and extension from the file's leading bytes; the client's filename and type are not trusted."""
+    for signature, content_type, extension in SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extension
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp', 'webp'
+    raise UnsupportedLogoException("Logo must be a PNG, JPEG, GIF or WebP image")
+
+def logo_key(sha256: str, extension: str, width: Optional[int] = None) -> str:
+    suffix = f'-w{width}' if width else ''
+    return f'{sha256[:2]}/{sha256}{suffix}.{extension}'
+
+class ContentAddressedLogoStore(ILogoStore):
+    """
+    Streams uploads to a staging file in chunks, enforcing max_bytes as it goes,
+    and stores them under their SHA-256 so identical logos are kept once.
+    Resized and converted copies are generated on a background thread when
+    Pillow is installed.
+    """
+
+    def __init__(self, backend, max_bytes: int = LOGO_MAX_BYTES, variant_widths: Optional[List[int]] = None, alternate_formats: Optional[List[str]] = None, chunk_size: int = LOGO_CHUNK_SIZE):
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.variant_widths = sorted(LOGO_VARIANT_WIDTHS if variant_widths is None else variant_widths)
+        self.alternate_formats = [extension for extension in (LOGO_ALTERNATE_FORMATS if alternate_formats is None else alternate_formats) if extension in CONTENT_TYPES]
+        self.chunk_size = chunk_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._generated = set()
+        self._known = set()
+        self._missing = {}
+
+    def store(self, stream: BinaryIO, declared_length: Optional[int] = None) -> dict:
+        if declared_length is not None and declared_length > self.max_bytes:
+            raise LogoTooLargeException(f"Logo is larger than {self.max_bytes} bytes")
+
+        staging_dir = self.backend.staging_dir
+        if staging_dir:
+            os.makedirs(staging_dir, exist_ok=True)
+        descriptor, path = tempfile.mkstemp(dir=staging_dir, prefix='upload-')
+        try:
+            with os.fdopen(descriptor, 'wb') as staged:
+                sha256, size, content_type, extension = self._copy(stream, staged)
+
+            width = image_width(path)
+            key = logo_key(sha256, extension)
+            deduplicated = self.backend.exists(key)
+            if not deduplicated:
+                self.backend.put_file(key, path, content_type)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+        self._generate_variants_later(sha256, extension, content_type)
+        return {
+            "key": key,
+            "url": self.backend.url(key),
+            "sha256": sha256,
+            "size": size,
+            "content_type": content_type,
+            "variants": self._variants(sha256, extension, width),
+            "deduplicated": deduplicated,
+        }
+
+    def _variants(self, sha256: str, extension: str, image_width: Optional[int]) -> List[dict]:
+        """The copies generate_variants writes for an original image_width pixels wide; renditions no narrower than it are skipped."""
+        if image_width is None:
+            return []
+        variants = []
+        for width, output in self.renditions(extension):
+            if (width is None or width < image_width) and can_write(CONTENT_TYPES[output]):
+                key = logo_key(sha256, output, width)
+                variants.append({
+                    "key": key,
+                    "url": self.backend.url(key),
+                    "width": width or image_width,
+                    "content_type": CONTENT_TYPES[output],
+                })
+        return variants
+
+    def _copy(self, stream: BinaryIO, staged: BinaryIO) -> Tuple[str, int, str, str]:
+        digest = hashlib.sha256()
+        size = 0
+        content_type = extension = None
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                break
+            if content_type is None:
+                content_type, extension = sniff_image(chunk)
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise LogoTooLargeException(f"Logo is larger than {self.max_bytes} bytes")
+            digest.update(chunk)
+            staged.write(chunk)
+        if size == 0:
+            raise UnsupportedLogoException("Logo file is empty")
+        return digest.hexdigest(), size, content_type, extension
+
+    def _generate_variants_later(self, sha256: str, extension: str, content_type: str) -> None:
+        if not self.renditions(extension) or not pillow_available():
+            return
+        with self._lock:
+            if sha256 in self._pending:
+                return
+            self._pending.add(sha256)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='logo-variants')
+        self._executor.submit(self.generate_variants, sha256, extension, content_type)
+
+    def renditions(self, extension: str) -> List[Tuple[Optional[int], str]]:
+        """(width, extension) of every derived copy of an original: each width in each format, plus the full-size alternates."""
+        formats = [extension] + [alternate for alternate in self.alternate_formats if alternate != extension]
+        return [(width, output) for width in [None, *self.variant_widths] for output in formats if width or output != extension]
+
+    def generate_variants(self, sha256: str, extension: str, content_type: str) -> List[str]:
+        """Writes the missing resized and converted copies of a stored logo and returns their keys."""
+        written = []
+        original = None
+        try:
+            for width, output in self.renditions(extension):
+                key = logo_key(sha256, output, width)
+                if self.backend.exists(key):
+                    continue
+                if original is None:
+                    with closing(self.backend.open(logo_key(sha256, extension))) as source:
+                        original = source.read()
+                try:
+                    data = render_variant(io.BytesIO(original), content_type, width, CONTENT_TYPES[output])
+                except (KeyError, OSError) as e:
+                    # e.g. a Pillow build without AVIF support.
+                    print(f"Skipping {key}: {e}")
+                    continue
+                if data is None:
+                    continue
+                self.backend.put_bytes(key, data, CONTENT_TYPES[output])
+                written.append(key)
+        except Exception as e:
+            print(f"Failed to generate logo variants for {sha256}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(sha256)
+                if len(self._generated) >= KNOWN_KEYS_LIMIT:
+                    self._generated.clear()
+                self._generated.add(sha256)
+                for key in written:
+                    self._known.add(key)
+                    self._missing.pop(key, None)
+        return written
+
+    def backfill_variants(self) -> List[str]:
+        """Generates missing variants for every stored original, e.g. after Pillow was installed or the widths changed."""
+        if not pillow_available():
+            raise ValueError("Generating logo variants needs Pillow (see requirements.txt)")
+        full_size = {}
+        for key, _ in list(self.backend.list()):
+            match = CONTENT_ADDRESSED_KEY.match(key)
+            if match and not match.group(2) and match.group(3) in CONTENT_TYPES:
+                full_size.setdefault(match.group(1), []).append(match.group(3))
+        written = []
+        for sha256, extensions in full_size.items():
+            # An upload's own format is the one that is not an alternate, unless it was uploaded in an alternate format.
+            originals = [extension for extension in extensions if extension not in self.alternate_formats] or extensions
+            written.extend(self.generate_variants(sha256, originals[0], CONTENT_TYPES[originals[0]]))
+        return written
+
+    def choose_rendition(self, key: str, width: Optional[int], accepts: Callable[[str], bool]) -> str:
+        """
+        The stored key that best serves a request for key: the narrowest variant
+        at least width wide, in the most preferred format the client accepts.
+        Falls back to key itself; keys that are not content addressed are returned unchanged.
+        When the best match is missing, e.g. for a logo stored before Pillow was
+        installed, its variants are generated in the background for later requests.
+        """
+        match = CONTENT_ADDRESSED_KEY.match(key)
+        if not match or match.group(2):
+            return key
+        sha256, extension = match.group(1), match.group(3)
+
+        widths = [None]
+        if width:
+            widths = [candidate for candidate in self.variant_widths if candidate >= width] + [None]
+        formats = [alternate for alternate in self.alternate_formats if alternate != extension and accepts(CONTENT_TYPES[alternate])] + [extension]
+        best = logo_key(sha256, formats[0], widths[0])
+        for candidate_width in widths:
+            for output in formats:
+                candidate = logo_key(sha256, output, candidate_width)
+                if candidate == key or self._exists(candidate):
+                    if candidate != best:
+                        self._generate_missing_later(key, sha256, extension)
+                    return candidate
+        return key
+
+    def _generate_missing_later(self, key: str, sha256: str, extension: str) -> None:
+        # Once per hash and process: a variant can also be missing because the
+        # original is narrower than the requested width.
+        if sha256 in self._generated or not self._exists(key):
+            return
+        self._generate_variants_later(sha256, extension, CONTENT_TYPES[extension])
+
+    def _exists(self, key: str) -> bool:
+        # Stored keys never change, so once found they are remembered. Misses are
+        # re-checked after MISSING_RECHECK_SECONDS, since variants appear when the
+        # background job finishes.
+        if key in self._known:
+            return True
+        checked = self._missing.get(key)
+        if checked is not None and time.monotonic() - checked < MISSING_RECHECK_SECONDS:
+            return False
+        exists = self.backend.exists(key)
+        with self._lock:
+            if len(self._known) + len(self._missing) >= KNOWN_KEYS_LIMIT:
+                self._known.clear()
+                self._missing.clear()
+            if exists:
+                self._known.add(key)
+                self._missing.pop(key, None)
+            else:
+                self._missing[key] = time.monotonic()
+        return exists
+
+def prune_unreferenced(backend, referenced_hashes: Set[str], older_than: datetime, dry_run: bool = False) -> List[str]:
+    """
+    Deletes content-addressed logos (and their variants) whose hash no cafe
+    references and that were written before older_than. Other files are left alone.
+    """
+    removed = []
+    for key, modified in list(backend.list()):
+        match = CONTENT_ADDRESSED_KEY.match(key)
+        if not match or match.group(1) in referenced_hashes or modified >= older_than:
+            continue
+        if not dry_run:
+            backend.delete(key)
+        removed.append(key)
+    return removed
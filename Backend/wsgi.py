@@ -0,0 +1,5 @@
+from api.app import create_app
+
+# Entry point for production servers, e.g. `gunicorn -c gunicorn.conf.py wsgi:app`.
+# Database initialization is done once by the gunicorn master in on_starting.
+app = create_app(init_db=False)
@@ -1,11 +1,13 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 CREATE TABLE IF NOT EXISTS cafe (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR(255) NOT NULL,
     description VARCHAR(255) NOT NULL,
     logo TEXT, 
-    location VARCHAR(255) NOT NULL
+    location VARCHAR(255) NOT NULL,
+    employee_count INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS employee (
@@ -16,6 +18,9 @@ CREATE TABLE IF NOT EXISTS employee (
     gender VARCHAR(10) NOT NULL CHECK (gender IN ('Male', 'Female'))
 );
 
+-- Numeric part of employee ids, allocated with nextval() by the API
+CREATE SEQUENCE IF NOT EXISTS employee_id_seq START WITH 1 MINVALUE 1;
+
 CREATE TABLE IF NOT EXISTS employee_cafe (
     employee_id VARCHAR(9) NOT NULL,
     cafe_id UUID NOT NULL,
@@ -26,6 +31,69 @@ CREATE TABLE IF NOT EXISTS employee_cafe (
     FOREIGN KEY (cafe_id) REFERENCES cafe (id) ON DELETE CASCADE
 );
 
+-- Per-resource change counters backing the ETag / Last-Modified headers of the list endpoints
+CREATE TABLE IF NOT EXISTS table_version (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Filter / join indexes for the list endpoints (migration 0003)
+CREATE INDEX IF NOT EXISTS ix_cafe_location ON cafe (location);
+CREATE INDEX IF NOT EXISTS ix_cafe_name ON cafe (name);
+CREATE INDEX IF NOT EXISTS ix_employee_cafe_cafe_id ON employee_cafe (cafe_id);
+CREATE INDEX IF NOT EXISTS ix_employee_cafe_start_date ON employee_cafe (start_date);
+
+-- Trigram indexes for the search endpoints (migration 0005)
+CREATE INDEX IF NOT EXISTS ix_employee_name_trgm ON employee USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_employee_email_address_trgm ON employee USING gin (email_address gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_employee_phone_number_trgm ON employee USING gin (phone_number gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_cafe_name_trgm ON cafe USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_cafe_description_trgm ON cafe USING gin (description gin_trgm_ops);
+
+-- cafe.employee_count is kept current by these triggers (migration 0004)
+CREATE INDEX IF NOT EXISTS ix_cafe_employee_count ON cafe (employee_count DESC, id DESC);
+
+CREATE OR REPLACE FUNCTION employee_cafe_headcount() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE cafe SET employee_count = cafe.employee_count + delta.employees
+        FROM (SELECT cafe_id, count(*) AS employees FROM new_rows GROUP BY cafe_id) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE cafe SET employee_count = cafe.employee_count - delta.employees
+        FROM (SELECT cafe_id, count(*) AS employees FROM old_rows GROUP BY cafe_id) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    ELSE
+        UPDATE cafe SET employee_count = cafe.employee_count + delta.employees
+        FROM (
+            SELECT cafe_id, sum(change) AS employees
+            FROM (
+                SELECT cafe_id, 1 AS change FROM new_rows
+                UNION ALL
+                SELECT cafe_id, -1 AS change FROM old_rows
+            ) AS changes
+            GROUP BY cafe_id
+            HAVING sum(change) <> 0
+        ) AS delta
+        WHERE cafe.id = delta.cafe_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER employee_cafe_headcount_insert AFTER INSERT ON employee_cafe
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount();
+
+CREATE TRIGGER employee_cafe_headcount_delete AFTER DELETE ON employee_cafe
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount();
+
+CREATE TRIGGER employee_cafe_headcount_update AFTER UPDATE ON employee_cafe
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION employee_cafe_headcount();
+
 
 
 
@@ -51,3 +119,9 @@ INSERT INTO employee_cafe (employee_id, cafe_id, start_date) VALUES
 ('UI0000005', '1c19d74e-2af5-48a1-8ee6-91203b1dc001', '2024-07-11'),
 ('UI0000006', '1c19d74e-2af5-48a1-8ee6-91203b1dc001', '2025-05-15');
 
+-- Move the id sequence past the seeded employees
+SELECT setval('employee_id_seq', (SELECT COALESCE(MAX(CAST(SUBSTRING(id FROM 3) AS INTEGER)), 1) FROM employee));
+
+INSERT INTO table_version (name, version) VALUES
+('cafes', 1),
+('employees', 1);